@@ -2,9 +2,26 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import hashlib
+import json
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.analysis_client import AnalysisClient, AnalysisServiceError
+from utils.analysis_pipeline import analyze_profile
+from utils.fund_universe import fund_universe_cache, get_fund_analyzer
+
+# Real scheme master (Parquet/Arrow file or partition directory); synthetic data when unset
+FUND_UNIVERSE_PATH = os.environ.get('FUND_UNIVERSE_PATH')
+
+# Headless analysis service (service.py); the pipeline runs in-process when unset
+ANALYSIS_SERVICE_URL = os.environ.get('ANALYSIS_SERVICE_URL')
+analysis_client = AnalysisClient(ANALYSIS_SERVICE_URL) if ANALYSIS_SERVICE_URL else None
+
+# Analyses kept per browser session (least recently used ones are dropped)
+SESSION_CACHE_SIZE = 8
+
 # Try to import Plotly with error handling
 try:
     import plotly.graph_objects as go
@@ -60,103 +77,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class MutualFundAnalyzer:
-    def __init__(self):
-        self.fund_data = self.generate_mutual_fund_data()
-    
-    def generate_mutual_fund_data(self):
-        """Comprehensive mutual fund database with historical returns"""
-        categories = {
-            'Large Cap': 12,
-            'Mid Cap': 15, 
-            'Small Cap': 18,
-            'Flexi Cap': 14,
-            'ELSS': 16,
-            'Sectoral': 20,
-            'Hybrid': 11,
-            'Debt': 8,
-            'Index': 13
-        }
-        
-        funds = []
-        for category, base_return in categories.items():
-            for i in range(3):
-                fund_name = f"{category} Fund {i+1}"
-                
-                returns_6m = base_return * 0.5 + np.random.normal(0, 2)
-                returns_1y = base_return + np.random.normal(0, 3)
-                returns_3y = base_return + np.random.normal(0, 2)
-                returns_5y = base_return + np.random.normal(0, 1.5)
-                
-                risk_level = self.get_risk_level(category)
-                
-                funds.append({
-                    'Fund Name': fund_name,
-                    'Category': category,
-                    '6M Return': max(5, returns_6m),
-                    '1Y Return': max(8, returns_1y),
-                    '3Y CAGR': max(10, returns_3y),
-                    '5Y CAGR': max(12, returns_5y),
-                    'Risk Level': risk_level,
-                    'Expense Ratio': round(0.5 + np.random.random() * 1.5, 2),
-                    'Minimum SIP': 500,
-                    'Fund Size (Cr)': np.random.randint(100, 5000)
-                })
-        
-        return pd.DataFrame(funds)
-    
-    def get_risk_level(self, category):
-        risk_map = {
-            'Large Cap': 'Moderate',
-            'Mid Cap': 'High', 
-            'Small Cap': 'Very High',
-            'Flexi Cap': 'Moderately High',
-            'ELSS': 'High',
-            'Sectoral': 'Very High',
-            'Hybrid': 'Moderate',
-            'Debt': 'Low',
-            'Index': 'Moderate'
-        }
-        return risk_map.get(category, 'Moderate')
-    
-    def recommend_funds(self, savings_rate, investment_horizon, risk_appetite):
-        df = self.fund_data.copy()
-        
-        risk_filters = {
-            'Conservative': ['Low', 'Moderate'],
-            'Moderate': ['Low', 'Moderate', 'Moderately High'],
-            'Aggressive': ['Low', 'Moderate', 'Moderately High', 'High', 'Very High']
-        }
-        
-        filtered_funds = df[df['Risk Level'].isin(risk_filters.get(risk_appetite, ['Moderate']))]
-        
-        return_columns = {
-            '6 months': '6M Return',
-            '1 year': '1Y Return', 
-            '3 years': '3Y CAGR',
-            '5 years': '5Y CAGR'
-        }
-        
-        return_col = return_columns.get(investment_horizon, '3Y CAGR')
-        
-        filtered_funds['Score'] = (
-            filtered_funds[return_col] * 0.6 +
-            (100 - filtered_funds['Expense Ratio'] * 10) * 0.2 +
-            (filtered_funds['5Y CAGR'] if return_col != '5Y CAGR' else 0) * 0.2
-        )
-        
-        recommendations = filtered_funds.nlargest(5, 'Score')
-        return recommendations
-    
-    def get_category_performance(self):
-        return self.fund_data.groupby('Category').agg({
-            '6M Return': 'mean',
-            '1Y Return': 'mean',
-            '3Y CAGR': 'mean', 
-            '5Y CAGR': 'mean',
-            'Risk Level': 'first'
-        }).round(2).reset_index()
-
 def create_simple_gauge(value, title, max_value=100):
     """Create a simple gauge using Streamlit components"""
     progress = value / max_value
@@ -173,13 +93,13 @@ def display_mutual_funds_with_fallback(metrics):
     
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Recommended Risk Appetite", mf_data['risk_appetite'])
+        st.metric("Recommended Risk Appetite", mf_data.risk_appetite)
     with col2:
         st.metric("Based on Savings Rate", f"{metrics['basic']['savings_rate']:.1f}%")
     
     # Category Performance
     st.subheader("🏆 Category-wise Performance")
-    category_df = pd.DataFrame(mf_data['category_performance'])
+    category_df = mf_data.category_performance
     
     if PLOTLY_AVAILABLE:
         fig = px.bar(category_df, x='Category', y=['6M Return', '1Y Return', '3Y CAGR', '5Y CAGR'],
@@ -189,19 +109,23 @@ def display_mutual_funds_with_fallback(metrics):
         # Fallback: Show data table
         st.dataframe(category_df, use_container_width=True)
     
+    if not mf_data.category_bands.empty:
+        with st.expander("📏 Return Spread within Categories (25th / 50th / 75th percentile)"):
+            st.dataframe(mf_data.category_bands.round(2), use_container_width=True)
+    
     # Time-based Recommendations
     st.subheader("🎯 Personalized Fund Recommendations")
     
     horizons = ['6 months', '1 year', '3 years', '5 years']
     selected_horizon = st.selectbox("Select Investment Horizon", horizons)
     
-    if selected_horizon in mf_data['recommendations']:
-        recommendations = mf_data['recommendations'][selected_horizon]
+    if selected_horizon in mf_data.horizons:
+        recommendations = mf_data.recommendations(selected_horizon)
         
-        if recommendations:
+        if not recommendations.empty:
             st.write(f"**Top 5 Funds for {selected_horizon} horizon:**")
             
-            for i, fund in enumerate(recommendations, 1):
+            for i, (_, fund) in enumerate(recommendations.iterrows(), 1):
                 with st.container():
                     col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
                     
@@ -230,23 +154,40 @@ def display_mutual_funds_with_fallback(metrics):
     
     # Fund Explorer
     st.subheader("🔍 Mutual Fund Explorer")
-    all_funds_df = pd.DataFrame(mf_data['all_funds'])
+    fund_index = mf_data.fund_index
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        selected_category = st.selectbox("Filter by Category", ['All'] + list(all_funds_df['Category'].unique()))
+        selected_category = st.selectbox("Filter by Category", ['All'] + fund_index.values('Category'))
     with col2:
-        selected_risk = st.selectbox("Filter by Risk", ['All'] + list(all_funds_df['Risk Level'].unique()))
+        selected_risk = st.selectbox("Filter by Risk", ['All'] + fund_index.values('Risk Level'))
+    with col3:
+        sort_column = st.selectbox("Sort by", ['3Y CAGR', '1Y Return', '5Y CAGR', '6M Return', 'Expense Ratio'])
     
-    filtered_funds = all_funds_df.copy()
+    filters = {}
     if selected_category != 'All':
-        filtered_funds = filtered_funds[filtered_funds['Category'] == selected_category]
+        filters['Category'] = selected_category
     if selected_risk != 'All':
-        filtered_funds = filtered_funds[filtered_funds['Risk Level'] == selected_risk]
+        filters['Risk Level'] = selected_risk
+    
+    # Only the current page of rows is sent to the browser
+    page_size = 50
+    total = fund_index.count(filters)
+    page_count = max(1, -(-total // page_size))
+    page = st.number_input(f"Page (of {page_count})", 1, page_count, 1) if page_count > 1 else 1
+    filtered_funds, _ = fund_index.query(
+        filters,
+        sort_by=sort_column,
+        ascending=sort_column == 'Expense Ratio',
+        offset=(page - 1) * page_size,
+        limit=page_size,
+        columns=['Fund Name', 'Category', '1Y Return', '3Y CAGR', '5Y CAGR', 'Risk Level', 'Expense Ratio']
+    )
     
     if not filtered_funds.empty:
+        st.caption(f"Showing {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(filtered_funds)} of {total:,} funds")
         st.dataframe(
-            filtered_funds[['Fund Name', 'Category', '1Y Return', '3Y CAGR', '5Y CAGR', 'Risk Level', 'Expense Ratio']],
+            filtered_funds,
             use_container_width=True,
             height=300
         )
@@ -292,49 +233,21 @@ def main():
         'retirement_savings': retirement_savings
     }
     
-    if st.button("🚀 Run Complete Financial Analysis", use_container_width=True):
-        # Initialize analyzer
-        analyzer = MutualFundAnalyzer()
-        
-        # Calculate basic metrics
-        income = user_data['monthly_income']
-        total_expenses = sum(user_data['expenses'].values())
-        savings = income - total_expenses
-        savings_rate = (savings / income) * 100
-        
-        # Get mutual fund recommendations
-        if savings_rate >= 30:
-            risk_appetite = 'Aggressive'
-        elif savings_rate >= 15:
-            risk_appetite = 'Moderate'
-        else:
-            risk_appetite = 'Conservative'
-        
-        horizons = ['6 months', '1 year', '3 years', '5 years']
-        recommendations = {}
-        
-        for horizon in horizons:
-            recs = analyzer.recommend_funds(savings_rate, horizon, risk_appetite)
-            recommendations[horizon] = recs.to_dict('records')
-        
-        category_performance = analyzer.get_category_performance()
-        
-        metrics = {
-            'basic': {
-                'income': income,
-                'expenses': total_expenses,
-                'savings': savings,
-                'savings_rate': savings_rate,
-                'investment_amount': income * (user_data['investment_percentage'] / 100)
-            },
-            'mutual_funds': {
-                'risk_appetite': risk_appetite,
-                'recommendations': recommendations,
-                'category_performance': category_performance.to_dict('records'),
-                'all_funds': analyzer.fund_data.to_dict('records')
-            }
-        }
-        
+    # Analysis service client, or the shared fund universe built once per process
+    backend = analysis_client or get_fund_analyzer(path=FUND_UNIVERSE_PATH)
+    run_clicked = st.button("🚀 Run Complete Financial Analysis", use_container_width=True)
+    
+    # Results survive reruns from the result widgets (horizon, category and risk filters)
+    try:
+        metrics = get_session_metrics(user_data, backend, compute=run_clicked)
+    except AnalysisServiceError as error:
+        st.error(f"❌ Analysis service error: {error}")
+        metrics = None
+    
+    with st.sidebar:
+        display_cache_stats()
+    
+    if metrics is not None:
         # Display results in tabs
         tab1, tab2 = st.tabs(["📈 Financial Overview", "📊 Mutual Funds"])
         
@@ -344,6 +257,55 @@ def main():
         with tab2:
             display_mutual_funds_with_fallback(metrics)
 
+def compute_metrics(user_data, backend):
+    """Run the analysis pipeline in-process, or through the analysis service"""
+    if isinstance(backend, AnalysisClient):
+        return backend.analyze(user_data)
+    return analyze_profile(user_data, backend)
+
+def user_data_key(user_data):
+    """Stable hash of the financial profile"""
+    return hashlib.sha256(json.dumps(user_data, sort_keys=True).encode()).hexdigest()
+
+def get_session_metrics(user_data, backend, compute=False):
+    """
+    Metrics for this profile from session state, or None if it has not been analyzed
+
+    compute=True (the run button) analyzes a profile on a miss. Entries remember the
+    backend (analyzer or service client) they were built from, so a reloaded fund
+    universe is recomputed.
+    """
+    cache = st.session_state.setdefault('metrics_cache', {})
+    stats = st.session_state.setdefault('metrics_cache_stats', {'hits': 0, 'misses': 0})
+    key = user_data_key(user_data)
+    
+    entry = cache.pop(key, None)
+    if entry is not None and entry['backend'] is backend:
+        stats['hits'] += 1
+    elif compute:
+        stats['misses'] += 1
+        entry = {'backend': backend, 'metrics': compute_metrics(user_data, backend)}
+    else:
+        return None
+    
+    # Re-insert as most recently used and drop the oldest entries beyond the limit
+    cache[key] = entry
+    while len(cache) > SESSION_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    return entry['metrics']
+
+def display_cache_stats():
+    with st.expander("🛠️ Cache Stats"):
+        session_stats = st.session_state.get('metrics_cache_stats', {'hits': 0, 'misses': 0})
+        universe_stats = fund_universe_cache.stats()
+        
+        st.write("**Session analyses**")
+        st.write(f"Hits: {session_stats['hits']} | Misses: {session_stats['misses']} | "
+                 f"Entries: {len(st.session_state.get('metrics_cache', {}))}/{SESSION_CACHE_SIZE}")
+        st.write("**Fund universe (process-wide)**")
+        st.write(f"Hits: {universe_stats['hits']} | Misses: {universe_stats['misses']} | "
+                 f"Hit rate: {universe_stats['hit_rate']:.0%} | Entries: {universe_stats['entries']}")
+
 def display_financial_overview(metrics, user_data):
     st.markdown('<div class="feature-card">', unsafe_allow_html=True)
     st.header("📈 Financial Overview")
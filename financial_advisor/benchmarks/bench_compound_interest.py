@@ -0,0 +1,41 @@
+"""
+Benchmark: scalar compound_interest loop vs compound_interest_batch
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_compound_interest [accounts]
+"""
+import sys
+import time
+
+import numpy as np
+
+from utils.financial_calculators import FinancialCalculators
+
+
+def main(accounts=200_000):
+    rng = np.random.default_rng(42)
+    principal = rng.uniform(0, 1_000_000, accounts)
+    annual_rate = rng.choice([0.0, 6.5, 8.0, 12.0], accounts)
+    years = rng.integers(1, 40, accounts)
+    monthly_contribution = rng.choice([0.0, 2_000.0, 10_000.0], accounts)
+    
+    start = time.perf_counter()
+    loop_values = np.array([
+        FinancialCalculators.compound_interest(p, r, y, c)['future_value']
+        for p, r, y, c in zip(principal, annual_rate, years, monthly_contribution)
+    ])
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = FinancialCalculators.compound_interest_batch(principal, annual_rate, years, monthly_contribution)
+    batch_time = time.perf_counter() - start
+    
+    assert np.allclose(loop_values, batch['future_value'], rtol=1e-12, atol=0)
+    print(f"accounts:       {accounts:,}")
+    print(f"scalar loop:    {loop_time:.3f}s")
+    print(f"batched arrays: {batch_time:.4f}s")
+    print(f"speedup:        {loop_time / batch_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
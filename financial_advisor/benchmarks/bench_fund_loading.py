@@ -0,0 +1,72 @@
+"""
+Benchmark: fund universe startup time and RSS for CSV vs Parquet/Arrow loading
+
+Writes a synthetic scheme master (with extra NAV-derived columns the app never
+reads) in each format, then loads it in a fresh process per format so that
+the resident set size is measured cleanly.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_fund_loading [schemes]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from utils.fund_store import FundUniverseLoader
+from utils.mutual_funds import MutualFundAnalyzer
+
+
+def resident_mb():
+    """Current resident set size in MB (Linux)"""
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def load_in_child(path, queue):
+    before = resident_mb()
+    start = time.perf_counter()
+    frame = FundUniverseLoader.load(path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, resident_mb() - before, frame.memory_usage(deep=True).sum() / 2**20))
+
+
+def main(schemes=40_000):
+    rng = np.random.default_rng(0)
+    universe = MutualFundAnalyzer(seed=0, funds_per_category=-(-schemes // 9)).fund_data
+    for i in range(40):
+        universe[f'NAV Stat {i}'] = rng.normal(size=len(universe))
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            'csv': os.path.join(directory, 'funds.csv'),
+            'parquet': os.path.join(directory, 'funds.parquet'),
+            'arrow': os.path.join(directory, 'funds.arrow'),
+            'partitioned': os.path.join(directory, 'partitions')
+        }
+        universe.to_csv(paths['csv'], index=False)
+        FundUniverseLoader.save(universe, paths['parquet'])
+        FundUniverseLoader.save(universe, paths['arrow'])
+        FundUniverseLoader.save(universe, paths['partitioned'], partition_by=['Category'])
+
+        print(f"schemes: {len(universe):,}, columns on disk: {universe.shape[1]}, "
+              f"projected: {len(FundUniverseLoader.FUND_COLUMNS)}")
+        print(f"{'format':<12} {'load (ms)':>10} {'RSS delta (MB)':>15} {'frame (MB)':>11}")
+        for name, path in paths.items():
+            queue = context.Queue()
+            process = context.Process(target=load_in_child, args=(path, queue))
+            process.start()
+            elapsed, rss, frame_size = queue.get()
+            process.join()
+            print(f"{name:<12} {elapsed * 1000:>10.1f} {rss:>15.1f} {frame_size:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
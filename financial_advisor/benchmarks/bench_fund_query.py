@@ -0,0 +1,70 @@
+"""
+Benchmark: fund explorer query latency, indexed pages vs copied boolean-mask filtering
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_fund_query [schemes]
+"""
+import sys
+import time
+
+import numpy as np
+
+from utils.mutual_funds import MutualFundAnalyzer
+
+EXPLORER_COLUMNS = ['Fund Name', 'Category', '1Y Return', '3Y CAGR', '5Y CAGR', 'Risk Level', 'Expense Ratio']
+
+QUERIES = {
+    'all, sorted': ({}, {}, '3Y CAGR'),
+    'category': ({'Category': 'Mid Cap'}, {}, '1Y Return'),
+    'category + risk': ({'Category': ['Large Cap', 'Index'], 'Risk Level': 'Moderate'}, {}, '5Y CAGR'),
+    'compound + range': ({'Risk Level': ['High', 'Very High']},
+                         {'Expense Ratio': (None, 1.0), '1Y Return': (15.0, None)}, '3Y CAGR')
+}
+
+
+def masked_query(fund_data, filters, ranges, sort_by, offset, limit):
+    """Previous explorer: copy, filter with masks, sort everything, then take a page"""
+    filtered = fund_data.copy()
+    for column, wanted in filters.items():
+        filtered = filtered[filtered[column].isin(wanted if isinstance(wanted, list) else [wanted])]
+    for column, (low, high) in ranges.items():
+        if low is not None:
+            filtered = filtered[filtered[column] >= low]
+        if high is not None:
+            filtered = filtered[filtered[column] <= high]
+    filtered = filtered.sort_values(sort_by, ascending=False, kind='stable')
+    return filtered[EXPLORER_COLUMNS].iloc[offset:offset + limit], len(filtered)
+
+
+def median_ms(function, repeats=50):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def main(schemes=50_000):
+    analyzer = MutualFundAnalyzer(seed=0, funds_per_category=-(-schemes // 9))
+    fund_data = analyzer.fund_data
+
+    start = time.perf_counter()
+    index = analyzer.query_index
+    print(f"schemes: {len(fund_data):,}, index build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"{'query':<18} {'matches':>8} {'indexed (ms)':>13} {'masked (ms)':>12}")
+
+    for name, (filters, ranges, sort_by) in QUERIES.items():
+        page, total = index.query(filters, ranges, sort_by, ascending=False, offset=100, limit=50,
+                                  columns=EXPLORER_COLUMNS)
+        expected, expected_total = masked_query(fund_data, filters, ranges, sort_by, 100, 50)
+        assert total == expected_total and page.index.equals(expected.index), name
+
+        indexed = median_ms(lambda: index.query(filters, ranges, sort_by, ascending=False, offset=100,
+                                                limit=50, columns=EXPLORER_COLUMNS))
+        masked = median_ms(lambda: masked_query(fund_data, filters, ranges, sort_by, 100, 50))
+        print(f"{name:<18} {total:>8,} {indexed:>13.3f} {masked:>12.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
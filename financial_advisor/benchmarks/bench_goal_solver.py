@@ -0,0 +1,70 @@
+"""
+Benchmark: brute-force search with goal_planning_calculator vs GoalSolver
+
+The brute-force approach scans candidate returns (0.1% steps) and timelines
+(1-month steps) until the calculator says no monthly savings are needed beyond
+the given amount, which is how the planning UI used to answer these questions.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_goal_solver [goals]
+"""
+import sys
+import time
+
+import numpy as np
+
+from utils.financial_calculators import FinancialCalculators
+from utils.goal_solver import GoalSolver
+
+
+def brute_force_return(goal, current, monthly, years):
+    for candidate in np.arange(0.0, 40.0, 0.1):
+        required = FinancialCalculators.goal_planning_calculator(goal, current, years, candidate)
+        if required['monthly_savings_required'] <= monthly:
+            return candidate
+    return np.nan
+
+
+def brute_force_years(goal, current, monthly, annual_return):
+    for months in range(1, 12 * 60 + 1):
+        required = FinancialCalculators.goal_planning_calculator(goal, current, months / 12, annual_return)
+        if required['monthly_savings_required'] <= monthly:
+            return months / 12
+    return np.nan
+
+
+def main(goals=2_000):
+    rng = np.random.default_rng(7)
+    goal = rng.uniform(1e6, 5e7, goals)
+    current = rng.uniform(0, 2e6, goals)
+    monthly = rng.uniform(5e3, 1e5, goals)
+    years = rng.integers(3, 30, goals).astype(float)
+    annual_return = np.full(goals, 10.0)
+
+    start = time.perf_counter()
+    loop_returns = np.array([brute_force_return(*args) for args in zip(goal, current, monthly, years)])
+    loop_years = np.array([brute_force_years(*args) for args in zip(goal, current, monthly, annual_return)])
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solved_returns = GoalSolver.solve_expected_return(goal, current, monthly, years)
+    solved_years = GoalSolver.solve_timeline_years(goal, current, monthly, annual_return)
+    solver_time = time.perf_counter() - start
+
+    # The brute force scans upwards from 0% in 0.1% and one-month steps,
+    # so the exact answer lies within one grid step below it
+    both = np.isfinite(loop_returns) & np.isfinite(solved_returns) & (loop_returns > 0)
+    assert np.all((solved_returns[both] > loop_returns[both] - 0.1 - 1e-6) &
+                  (solved_returns[both] <= loop_returns[both] + 1e-6))
+    both = np.isfinite(loop_years) & np.isfinite(solved_years)
+    assert np.all((solved_years[both] > loop_years[both] - 1 / 12 - 1e-6) &
+                  (solved_years[both] <= loop_years[both] + 1e-6))
+
+    print(f"goals:            {goals:,}")
+    print(f"brute force:      {loop_time:.3f}s")
+    print(f"vectorized solve: {solver_time:.4f}s")
+    print(f"speedup:          {loop_time / solver_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
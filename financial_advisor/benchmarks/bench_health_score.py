@@ -0,0 +1,80 @@
+"""
+Benchmark: columnar health scoring of a large population vs the per-user dict path
+
+Scores `rows` synthetic users in chunks (as a nightly job would stream them),
+and times the original generate_financial_health_score on a sample for
+comparison, checking that both give identical scores.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_health_score [rows] [chunk_rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processor import DataProcessor
+
+CATEGORIES = ['rent_emi', 'groceries', 'transportation', 'utilities', 'entertainment', 'loan_repayments', 'other']
+
+
+def make_users(rows, rng):
+    """Profiles in the pd.json_normalize layout process_user_financial_data_bulk expects"""
+    income = rng.uniform(10_000, 300_000, rows).round()
+    columns = {'monthly_income': income, 'investment_percentage': rng.integers(0, 50, rows)}
+    for category in CATEGORIES:
+        columns[f'expenses.{category}'] = (income * rng.uniform(0, 0.35, rows)).round()
+    return pd.DataFrame(columns)
+
+
+def main(rows=10_000_000, chunk_rows=1_000_000):
+    rng = np.random.default_rng(0)
+
+    # Ragged sample: json_normalize leaves NaN where a user's dict lacks a category
+    sample = make_users(20_000, rng)
+    expense_columns = [f'expenses.{category}' for category in CATEGORIES]
+    sample[expense_columns] = sample[expense_columns].mask(rng.random((len(sample), len(CATEGORIES))) < 0.1)
+    processed = DataProcessor.process_user_financial_data_bulk(sample)
+    start = time.perf_counter()
+    singles = [
+        DataProcessor.process_user_financial_data({
+            'monthly_income': user['monthly_income'],
+            'investment_percentage': user['investment_percentage'],
+            'expenses': {category: user[f'expenses.{category}'] for category in CATEGORIES
+                         if not np.isnan(user[f'expenses.{category}'])}
+        })
+        for user in sample.to_dict('records')
+    ]
+    records = [DataProcessor.generate_financial_health_score(single) for single in singles]
+    per_user_rate = len(sample) / (time.perf_counter() - start)
+    columnar = DataProcessor.generate_financial_health_scores(processed)
+    assert np.array_equal(processed['derived_metrics.total_expenses'].to_numpy(),
+                          [single['derived_metrics']['total_expenses'] for single in singles])
+    assert np.array_equal(columnar['total_score'].to_numpy(), [record['total_score'] for record in records])
+
+    process_time = score_time = 0.0
+    counts = pd.Series(0, index=[label for _, label in DataProcessor.HEALTH_SCORE_BANDS])
+    for offset in range(0, rows, chunk_rows):
+        users = make_users(min(chunk_rows, rows - offset), rng)
+        start = time.perf_counter()
+        processed = DataProcessor.process_user_financial_data_bulk(users)
+        process_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = DataProcessor.generate_financial_health_scores(processed)
+        score_time += time.perf_counter() - start
+        counts += scores['interpretation'].value_counts()
+
+    print(f"rows: {rows:,} in chunks of {chunk_rows:,}")
+    print(f"bulk processing: {process_time:.2f} s, columnar scoring: {score_time:.2f} s "
+          f"({rows / score_time / 1e6:.1f}M rows/s)")
+    print(f"per-user dict path: {per_user_rate:,.0f} rows/s "
+          f"(~{rows / per_user_rate / 60:.0f} min for {rows:,} rows)")
+    for label, count in counts.items():
+        print(f"  {label:<52} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
@@ -0,0 +1,68 @@
+"""
+Benchmark: daily NAV ingest into the append-only store vs recomputing from full history
+
+Backfills a synthetic NAV history, then ingests further days one at a time and
+compares the per-day cost (new chunk + tail row + trailing returns) with
+reloading every chunk and recomputing the metrics with NAVAnalytics.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_nav_ingest [schemes] [years] [days]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.nav_analytics import TRADING_DAYS
+from utils.nav_store import NAVStore
+
+
+def nav_file(names, date, navs):
+    """One day's NAV file as the store ingests it"""
+    listed = ~np.isnan(navs)
+    return pd.DataFrame({'scheme': names[listed], 'date': date, 'nav': navs[listed]})
+
+
+def main(schemes=5_000, years=6, days=20):
+    rng = np.random.default_rng(0)
+    history_days = years * TRADING_DAYS
+    dates = pd.bdate_range('2015-01-01', periods=history_days + days)
+    names = np.array([f"Scheme {i}" for i in range(schemes)])
+    navs = 10 * np.exp(np.cumsum(rng.normal(0.0004, 0.01, (schemes, len(dates))), axis=1))
+    navs[rng.random(navs.shape) < 0.002] = np.nan
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = NAVStore(directory)
+        start = time.perf_counter()
+        store.ingest(pd.concat([nav_file(names, dates[d], navs[:, d]) for d in range(history_days)]))
+        print(f"schemes: {schemes:,}, history: {history_days:,} days, "
+              f"backfill: {time.perf_counter() - start:.2f} s")
+
+        ingest_times = []
+        for d in range(history_days, history_days + days):
+            frame = nav_file(names, dates[d], navs[:, d])
+            start = time.perf_counter()
+            store.ingest(frame)
+            incremental = store.metrics()
+            ingest_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        full = NAVStore(directory).analytics().summary()[incremental.columns]
+        recompute = time.perf_counter() - start
+
+        start = time.perf_counter()
+        removed = store.compact()
+        compaction = time.perf_counter() - start
+
+        ingest_ms = np.median(ingest_times) * 1000
+        print(f"incremental ingest + metrics: {ingest_ms:.1f} ms/day (median of {days})")
+        print(f"full reload + recompute:      {recompute * 1000:.1f} ms ({recompute * 1000 / ingest_ms:.0f}x)")
+        print(f"compaction:                   {compaction * 1000:.1f} ms ({removed} chunks merged)")
+        print(f"max |incremental - full|:     {np.nanmax(np.abs(incremental.to_numpy() - full.to_numpy())):.2e}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,84 @@
+"""
+Benchmark: peak RSS and time of building and rendering the mutual fund results
+
+Compares the previous list-of-dicts round trip (to_dict('records') in main(),
+pd.DataFrame(...) again in the view, a full copy for the explorer) with
+FundAnalysisResult, which references the analyzer's frames and slices lazily.
+Each variant runs in a fresh process so peak RSS is measured cleanly.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_results_memory [schemes]
+"""
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis_results import FundAnalysisResult
+from utils.mutual_funds import MutualFundAnalyzer
+
+HORIZONS = ['6 months', '1 year', '3 years', '5 years']
+EXPLORER_COLUMNS = ['Fund Name', 'Category', '1Y Return', '3Y CAGR', '5Y CAGR', 'Risk Level', 'Expense Ratio']
+
+
+def peak_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is in KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def render_records(analyzer):
+    """Previous pipeline: records in the metrics dict, DataFrames rebuilt by the view"""
+    mf_data = {
+        'recommendations': {horizon: analyzer.recommend_funds(20, horizon, 'Moderate').to_dict('records')
+                            for horizon in HORIZONS},
+        'category_performance': analyzer.get_category_performance().to_dict('records'),
+        'all_funds': analyzer.fund_data.to_dict('records')
+    }
+    category_df = pd.DataFrame(mf_data['category_performance'])
+    shown = [fund['Fund Name'] for fund in mf_data['recommendations']['3 years']]
+    all_funds_df = pd.DataFrame(mf_data['all_funds'])
+    filtered = all_funds_df.copy()
+    filtered = filtered[filtered['Risk Level'] == 'High']
+    return len(category_df) + len(shown) + len(filtered[EXPLORER_COLUMNS])
+
+
+def render_results(analyzer):
+    """FundAnalysisResult: frames by reference, per-view slices"""
+    mf_data = FundAnalysisResult.from_analyzer(analyzer, 'Moderate', HORIZONS)
+    category_df = mf_data.category_performance
+    shown = list(mf_data.recommendations('3 years')['Fund Name'])
+    mask = (mf_data.fund_data['Risk Level'] == 'High').to_numpy()
+    filtered = mf_data.funds(EXPLORER_COLUMNS, mask)
+    return len(category_df) + len(shown) + len(filtered)
+
+
+def run_in_child(variant, schemes, queue):
+    analyzer = MutualFundAnalyzer(seed=0, funds_per_category=-(-schemes // 9))
+    analyzer.ranking_index, analyzer.category_aggregate
+    before = peak_mb()
+    start = time.perf_counter()
+    rows = {'records': render_records, 'results': render_results}[variant](analyzer)
+    queue.put((time.perf_counter() - start, peak_mb() - before, rows))
+
+
+def main(schemes=40_000):
+    context = multiprocessing.get_context('spawn')
+    print(f"schemes: {schemes:,}")
+    print(f"{'variant':<10} {'render (ms)':>12} {'peak RSS growth (MB)':>21}")
+    results = {}
+    for variant in ('records', 'results'):
+        queue = context.Queue()
+        process = context.Process(target=run_in_child, args=(variant, schemes, queue))
+        process.start()
+        elapsed, growth, rows = queue.get()
+        process.join()
+        results[variant] = rows
+        print(f"{variant:<10} {elapsed * 1000:>12.1f} {growth:>21.1f}")
+    assert np.unique(list(results.values())).size == 1, "variants rendered different row counts"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
@@ -0,0 +1,107 @@
+"""
+Benchmark: streaming spend anomaly detection over 100M long-format rows
+
+Feeds one month at a time of (user, date, category, amount) rows for every
+user and expense category (1M users x 7 categories x 15 months = 105M rows by
+default) through SpendingAnomalyDetector, with spikes injected into the last
+months. Reports rows/s, alert counts, how many injected spikes were caught
+(recall) and how many alerts were injected spikes (precision). First checks
+that scoring each user on their own, with a save/load halfway, raises the same
+alerts as scoring everyone in one batch.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_spending_anomalies [users] [months] [mad|ewma]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.spending_anomalies import SpendingAnomalyDetector
+from utils.transaction_pipeline import EXPENSE_CATEGORIES
+
+
+def make_month(users, month, base, rng, spike_rate=0.001):
+    """One month of spend for every user x category; returns (frame, spiked mask)"""
+    rows = users * len(EXPENSE_CATEGORIES)
+    amounts = base * rng.lognormal(0, 0.15, rows)
+    spiked = rng.random(rows) < spike_rate
+    amounts[spiked] *= rng.uniform(3, 6, spiked.sum())
+    frame = pd.DataFrame({
+        'user_id': np.repeat(np.arange(users), len(EXPENSE_CATEGORIES)),
+        'date': pd.Timestamp('2023-01-01') + pd.DateOffset(months=month),
+        'category': pd.Categorical.from_codes(np.tile(np.arange(len(EXPENSE_CATEGORIES)), users),
+                                              categories=EXPENSE_CATEGORIES),
+        'amount': amounts
+    })
+    return frame, spiked
+
+
+def check_single_user(method, users=50, months=12):
+    """Assert that per-user updates (with a save/load halfway) match bulk updates"""
+    rng = np.random.default_rng(1)
+    base = rng.uniform(200, 30_000, users * len(EXPENSE_CATEGORIES))
+    bulk, single = SpendingAnomalyDetector(method=method), SpendingAnomalyDetector(method=method)
+    bulk_alerts, single_alerts = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for month in range(months):
+            frame, _ = make_month(users, month, base, rng, spike_rate=0.02)
+            bulk_alerts.append(bulk.update(frame))
+            for user, rows in frame.groupby('user_id'):
+                single_alerts.append(single.update(rows))
+            if month == months // 2:
+                single.save(os.path.join(directory, 'state.npz'))
+                single = SpendingAnomalyDetector.load(os.path.join(directory, 'state.npz'))
+
+    columns = ['user_id', 'category', 'date']
+    expected = pd.concat(bulk_alerts).sort_values(columns, ignore_index=True)
+    actual = pd.concat(single_alerts).sort_values(columns, ignore_index=True)
+    assert expected[columns].astype(str).equals(actual[columns].astype(str)), "per-user alerts differ from bulk"
+    assert np.allclose(expected['z_score'].astype(float), actual['z_score'].astype(float))
+    print(f"{method}: per-user and bulk updates raise the same {len(expected):,} alerts")
+
+
+def main(users=1_000_000, months=15, method='mad'):
+    check_single_user(method)
+
+    rng = np.random.default_rng(0)
+    base = rng.uniform(200, 30_000, users * len(EXPENSE_CATEGORIES))
+    detector = SpendingAnomalyDetector(method=method)
+
+    rows = alerts = eligible_alerts = true_alerts = caught = injected = 0
+    elapsed = 0.0
+    for month in range(months):
+        frame, spiked = make_month(users, month, base, rng)
+        start = time.perf_counter()
+        flagged = detector.update(frame)
+        elapsed += time.perf_counter() - start
+        rows += len(frame)
+        alerts += len(flagged)
+
+        # Spikes can only be caught once a series has min_periods months of history
+        if month >= detector.min_periods:
+            keys = flagged['user_id'].to_numpy() * len(EXPENSE_CATEGORIES) + \
+                pd.Categorical(flagged['category'], categories=EXPENSE_CATEGORIES).codes
+            hits = spiked[keys]
+            injected += spiked.sum()
+            caught += np.isin(np.flatnonzero(spiked), keys).sum()
+            eligible_alerts += len(keys)
+            true_alerts += hits.sum()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{method}: {rows:,} rows ({users:,} users x {len(EXPENSE_CATEGORIES)} categories x {months} months)")
+    print(f"update: {elapsed:.1f} s ({rows / elapsed / 1e6:.2f}M rows/s), peak RSS {peak:,.0f} MB")
+    print(f"alerts: {alerts:,}; injected spikes caught: {caught:,} / {injected:,} ({caught / max(injected, 1):.1%})")
+    false_alerts = eligible_alerts - true_alerts
+    print(f"alerts on injected spikes: {true_alerts:,} / {eligible_alerts:,} ({true_alerts / max(eligible_alerts, 1):.1%}); "
+          f"{false_alerts / max(injected, 1):.2f} false alerts per injected spike")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 15,
+         sys.argv[3] if len(sys.argv) > 3 else 'mad')
@@ -0,0 +1,59 @@
+"""
+Benchmark: nightly next-month forecasts for millions of user x category series
+
+Generates flat, trending and seasonal spend series, forecasts the last month
+from the months before it, and reports series/s, the model mix per series
+family, forecast error and interval coverage. Throughput is extrapolated to
+the 10M-series nightly run.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_spending_forecast [series] [months] [workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.spending_forecast import SpendingForecaster
+
+FAMILIES = ['flat', 'trend', 'seasonal']
+
+
+def make_series(rows, months, rng):
+    """Spend series in three families; returns (values, family label per row)"""
+    family = rng.integers(0, len(FAMILIES), rows)
+    t = np.arange(months)
+    base = rng.uniform(500, 20_000, rows)[:, None]
+    values = base * rng.lognormal(0, 0.08, (rows, months))
+    trending = family == 1
+    values[trending] *= 1 + rng.uniform(0.01, 0.03, trending.sum())[:, None] * t
+    seasonal = family == 2
+    values[seasonal] *= 1 + 0.3 * np.cos(2 * np.pi * (t - 9) / 12)
+    return values, np.array(FAMILIES)[family]
+
+
+def main(rows=1_000_000, months=36, workers=None):
+    workers = workers or os.cpu_count()
+    rng = np.random.default_rng(0)
+    values, family = make_series(rows, months + 1, rng)
+    history, actual = values[:, :-1], values[:, -1]
+
+    start = time.perf_counter()
+    forecasts = SpendingForecaster(history, start='2022-01').forecast(horizon=1, workers=workers)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed
+    print(f"{rows:,} series x {months} months on {workers} worker(s): {elapsed:.1f} s ({rate:,.0f} series/s)")
+    print(f"10M series: ~{10_000_000 / rate / 60:.0f} min at this rate")
+
+    print(pd.crosstab(pd.Series(family, name='family'), pd.Series(forecasts['model'].to_numpy(), name='model')))
+    error = np.abs(forecasts['forecast_1'].to_numpy() - actual) / actual
+    covered = (actual >= forecasts['lower_1'].to_numpy()) & (actual <= forecasts['upper_1'].to_numpy())
+    print(f"mean absolute % error: {np.nanmean(error):.1%}, 80% interval coverage: {covered.mean():.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 36,
+         int(sys.argv[3]) if len(sys.argv) > 3 else None)
@@ -0,0 +1,91 @@
+"""
+Benchmark: streaming raw transactions into monthly spending records
+
+Writes `rows` synthetic bank/UPI transactions to CSV and Parquet, then streams
+each file through read_transaction_chunks and TransactionAggregator, reporting
+rows/sec and peak memory. Peak RSS should stay flat as `rows` grows, since only
+the per-user monthly sums are kept.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.bench_transaction_pipeline [rows] [users] [chunk_rows]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processor import DataProcessor
+from utils.transaction_pipeline import MERCHANT_CATEGORIES, TransactionAggregator, read_transaction_chunks
+
+
+def write_transactions(directory, rows, users, rng, chunk_rows=1_000_000):
+    """Synthetic card/UPI debits plus a monthly salary credit over 24 months, written in pieces"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    codes = np.array(list(MERCHANT_CATEGORIES) + [5999, 7299, 8099])
+    csv_path = os.path.join(directory, 'transactions.csv')
+    parquet_path = os.path.join(directory, 'transactions.parquet')
+    writer = None
+    for offset in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - offset)
+        chunk = pd.DataFrame({
+            'user_id': rng.integers(0, users, size),
+            'date': (np.datetime64('2023-01-01') + rng.integers(0, 730, size)).astype(str),
+            'merchant_code': rng.choice(codes, size),
+            'amount': rng.lognormal(6, 1.2, size).round(2),
+            'txn_type': 'DR'
+        })
+        if offset == 0:
+            months = np.arange(np.datetime64('2023-01'), np.datetime64('2025-01'))
+            salary = pd.DataFrame({
+                'user_id': np.repeat(np.arange(users), len(months)),
+                'date': np.tile(months.astype('datetime64[D]'), users).astype(str),
+                'merchant_code': 0,
+                'amount': np.repeat(rng.uniform(20_000, 200_000, users), len(months)).round(2),
+                'txn_type': 'CR'
+            })
+            chunk = pd.concat([salary, chunk], ignore_index=True)
+        chunk.to_csv(csv_path, mode='a', header=offset == 0, index=False)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        writer = writer or pq.ParquetWriter(parquet_path, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return csv_path, parquet_path
+
+
+def main(rows=10_000_000, users=100_000, chunk_rows=1_000_000):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        paths = write_transactions(directory, rows, users, rng)
+        print(f"wrote {rows:,} transactions for {users:,} users in {time.perf_counter() - start:.1f} s")
+
+        for path in paths:
+            start = time.perf_counter()
+            aggregator = TransactionAggregator().consume(read_transaction_chunks(path, chunk_rows))
+            frame = aggregator.monthly_frame()
+            elapsed = time.perf_counter() - start
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{os.path.splitext(path)[1][1:]:<8} {aggregator.rows / elapsed / 1e6:6.2f}M rows/s "
+                  f"({elapsed:.1f} s, {len(frame):,} user-months, peak RSS {peak:,.0f} MB)")
+
+        start = time.perf_counter()
+        summary = DataProcessor.detect_spending_patterns_bulk(aggregator.to_long())['summary']
+        elapsed = time.perf_counter() - start
+        print(f"detect_spending_patterns_bulk over {len(summary):,} users: {elapsed:.1f} s, "
+              f"lifestyle creep in {int(summary['lifestyle_creep'].sum()):,}")
+
+        user, records = next(aggregator.iter_user_records())
+        single = DataProcessor.detect_spending_patterns(records)
+        assert single['lifestyle_creep'].startswith('Lifestyle creep detected') == bool(summary.loc[user, 'lifestyle_creep'])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100_000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000)
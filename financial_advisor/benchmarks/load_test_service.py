@@ -0,0 +1,129 @@
+"""
+Load test: open-loop /analyze traffic against the analysis service
+
+Starts service.py in a child process, then sends requests on a fixed schedule
+(target RPS) over a pool of keep-alive connections. Latency is measured from
+each request's scheduled send time, so queueing behind a slow response is
+counted rather than hidden.
+
+Run from the financial_advisor directory:
+    python -m benchmarks.load_test_service [rps] [seconds] [json|msgpack]
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+import service
+
+CONNECTIONS = 64
+
+
+def run_service(port_queue):
+    asyncio.run(service.AnalysisService().serve('127.0.0.1', 0, ready=port_queue.put))
+
+
+def make_profiles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for income in rng.integers(20_000, 300_000, count):
+        shares = rng.dirichlet(np.ones(7)) * rng.uniform(0.4, 1.0)
+        names = ['rent_emi', 'groceries', 'transportation', 'utilities', 'entertainment', 'loan_repayments', 'other']
+        profiles.append({
+            'monthly_income': int(income),
+            'expenses': {name: int(income * share) for name, share in zip(names, shares)},
+            'investment_percentage': int(rng.integers(0, 50)),
+            'current_age': int(rng.integers(20, 65)),
+            'current_savings': int(rng.integers(0, 1_000_000)),
+            'retirement_savings': int(rng.integers(0, 5_000_000))
+        })
+    return profiles
+
+
+def encode(payload, content_type):
+    if content_type == service.MSGPACK_TYPE:
+        return service.msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload).encode()
+
+
+async def worker(port, schedule, bodies, content_type, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while True:
+            try:
+                index, send_at = schedule.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            delay = send_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            body = bodies[index % len(bodies)]
+            writer.write(
+                f"POST /analyze HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\n"
+                f"Accept: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+            )
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - send_at)
+            if not head.startswith(b'HTTP/1.1 200'):
+                errors.append(head.split(b'\r\n')[0])
+    finally:
+        writer.close()
+
+
+async def drive(port, rps, seconds, content_type):
+    bodies = [encode(profile, content_type) for profile in make_profiles(500)]
+    total = int(rps * seconds)
+    start = time.perf_counter() + 0.2
+    schedule = asyncio.Queue()
+    for i in range(total):
+        schedule.put_nowait((i, start + i / rps))
+
+    latencies, errors = [], []
+    await asyncio.gather(*(worker(port, schedule, bodies, content_type, latencies, errors)
+                           for _ in range(CONNECTIONS)))
+    return np.array(latencies), errors, time.perf_counter() - start
+
+
+def main(rps=1000, seconds=10, payload_format='json'):
+    content_type = service.MSGPACK_TYPE if payload_format == 'msgpack' else service.JSON_TYPE
+    if content_type == service.MSGPACK_TYPE and not service.MSGPACK_AVAILABLE:
+        raise SystemExit("msgpack is not installed")
+
+    context = multiprocessing.get_context('spawn')
+    port_queue = context.Queue()
+    server = context.Process(target=run_service, args=(port_queue,), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=120)
+
+    try:
+        latencies, errors, elapsed = asyncio.run(drive(port, rps, seconds, content_type))
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+        print(f"target: {rps:,} RPS for {seconds} s ({payload_format}), {CONNECTIONS} connections")
+        print(f"achieved: {len(latencies) / elapsed:,.0f} RPS, {len(latencies):,} responses, {len(errors)} errors")
+        print(f"latency (ms): p50 {p50:.2f}  p90 {p90:.2f}  p99 {p99:.2f}  max {latencies.max() * 1000:.2f}")
+
+        async def health():
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+        stats = asyncio.run(health())
+        print(f"server: {stats['requests']:,} requests in {stats['batches']:,} batches "
+              f"(mean batch size {stats['mean_batch_size']:.1f})")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+         sys.argv[3] if len(sys.argv) > 3 else 'json')
@@ -0,0 +1,303 @@
+"""
+Headless analysis service: the app's analysis pipeline over a local HTTP API
+
+Endpoints (JSON or msgpack bodies, chosen by Content-Type / Accept):
+    POST /analyze        One profile -> metrics, or {"profiles": [...]} -> {"results": [...]}
+    POST /funds/query    Fund explorer page: filters, ranges, sort_by, ascending, offset, limit, columns
+    POST /funds/count    Number of funds matching filters/ranges
+    GET  /funds/values   Distinct Category and Risk Level values
+    GET  /health         Request, batch and fund universe cache counters
+
+Run from the financial_advisor directory:
+    python service.py [--host 127.0.0.1] [--port 8600]
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from utils.analysis_pipeline import analyze_profiles, basic_metrics
+from utils.fund_universe import fund_universe_cache, get_fund_analyzer
+
+# msgpack is optional: without it the service speaks JSON only
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON_TYPE = 'application/json'
+MSGPACK_TYPE = 'application/msgpack'
+
+FUND_UNIVERSE_PATH = os.environ.get('FUND_UNIVERSE_PATH')
+
+# Largest explorer page a client may request
+MAX_PAGE_SIZE = 500
+
+# Largest request body read into memory; headers are bounded by the stream reader limit (64 KiB)
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Content Too Large',
+           415: 'Unsupported Media Type', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error'}
+
+
+class RequestBatcher:
+    """
+    Coalesces concurrent /analyze requests into one pipeline call
+
+    Requests queue up while a batch is being processed, and the next batch
+    takes all of them (up to max_batch). Batches run in a worker thread, so a
+    cold fund universe load does not stall other connections. Fund payloads
+    depend only on the risk appetite, so they are built once per appetite and
+    reused until the shared analyzer changes.
+    """
+
+    def __init__(self, max_batch=256, max_wait=0.0):
+        """
+        Args:
+            max_batch (int): Most profiles analyzed in one pipeline call
+            max_wait (float): Seconds to wait for more requests before processing a batch
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+        self._analyzer = None
+        self._fund_payloads = {}
+
+    async def submit(self, profile):
+        """Analyze one profile as part of the next batch; returns its payload"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((profile, future))
+        return await future
+
+    async def run(self):
+        """Batch loop; runs for the lifetime of the service"""
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_wait:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                outcomes = await loop.run_in_executor(None, self._process, [profile for profile, _ in batch])
+            except Exception as error:
+                # Never leave a request waiting on a failed batch
+                outcomes = [(None, error)] * len(batch)
+            for (_, future), (payload, error) in zip(batch, outcomes):
+                # A client that disconnected may have cancelled its future
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(payload)
+
+    def _process(self, profiles):
+        """Analyze a batch off the event loop; returns (payload, error) per profile"""
+        self.requests += len(profiles)
+        self.batches += 1
+
+        # Warm shared analyzer; a changed fund universe file yields a new one
+        analyzer = get_fund_analyzer(path=FUND_UNIVERSE_PATH)
+        if analyzer is not self._analyzer:
+            self._analyzer = analyzer
+            self._fund_payloads = {}
+
+        outcomes = [None] * len(profiles)
+        valid = []
+        for position, profile in enumerate(profiles):
+            try:
+                basic_metrics(profile)
+                valid.append(position)
+            except (KeyError, TypeError, ValueError, AttributeError) as error:
+                outcomes[position] = (None, ValueError(f"Invalid profile: {error!r}"))
+
+        results = analyze_profiles([profiles[position] for position in valid], analyzer)
+        for position, metrics in zip(valid, results):
+            outcomes[position] = ({'basic': metrics['basic'],
+                                   'mutual_funds': self._fund_payload(metrics['mutual_funds'])}, None)
+        return outcomes
+
+    def _fund_payload(self, fund_result):
+        if fund_result.risk_appetite not in self._fund_payloads:
+            self._fund_payloads[fund_result.risk_appetite] = fund_result.to_dict(include_funds=False)
+        return self._fund_payloads[fund_result.risk_appetite]
+
+
+class AnalysisService:
+    """Minimal asyncio HTTP/1.1 server (keep-alive, Content-Length bodies) around the pipeline"""
+
+    def __init__(self, batcher=None):
+        self.batcher = batcher or RequestBatcher()
+
+    async def serve(self, host='127.0.0.1', port=8600, ready=None):
+        """
+        Serve until cancelled
+
+        Args:
+            ready (callable): Called with the bound port once the server accepts connections
+        """
+        # Build the fund universe and its indexes before the first request
+        analyzer = get_fund_analyzer(path=FUND_UNIVERSE_PATH)
+        analyzer.ranking_index, analyzer.category_aggregate, analyzer.query_index
+
+        batch_task = asyncio.ensure_future(self.batcher.run())
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, {'error': "Request headers are too large"}, JSON_TYPE)
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target = lines[0].split(' ')[:2]
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(f"negative content-length {length}")
+                except ValueError as error:
+                    # The framing is unknown, so answer and drop the connection
+                    await self._respond(writer, 400, {'error': f"Malformed request: {error}"}, JSON_TYPE)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': f"Request body exceeds {MAX_BODY_BYTES} bytes"},
+                                        JSON_TYPE)
+                    break
+                body = await reader.readexactly(length)
+
+                status, payload, content_type = await self._dispatch(method, target, headers, body)
+                await self._respond(writer, status, payload, content_type)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, content_type):
+        data = self._encode(payload, content_type)
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+        )
+        await writer.drain()
+
+    async def _dispatch(self, method, target, headers, body):
+        """Route a request; returns (status, payload, response content type)"""
+        request_type = headers.get('content-type', JSON_TYPE).split(';')[0].strip()
+        accept = headers.get('accept', request_type)
+        content_type = MSGPACK_TYPE if MSGPACK_TYPE in accept and MSGPACK_AVAILABLE else JSON_TYPE
+        path = target.split('?')[0]
+
+        if request_type == MSGPACK_TYPE and not MSGPACK_AVAILABLE:
+            return 415, {'error': 'msgpack is not installed on the server'}, JSON_TYPE
+
+        try:
+            data = self._decode(body, request_type) if body else {}
+            if method == 'POST' and path == '/analyze':
+                if isinstance(data, dict) and 'profiles' in data:
+                    results = await asyncio.gather(*(self.batcher.submit(profile) for profile in data['profiles']))
+                    return 200, {'results': list(results)}, content_type
+                return 200, await self.batcher.submit(data), content_type
+            if path.startswith('/funds/') and method == 'POST' and not isinstance(data, dict):
+                raise TypeError("Request body must be a JSON/msgpack object")
+            if method == 'POST' and path == '/funds/query':
+                return 200, self._query_funds(await self._query_index(), data), content_type
+            if method == 'POST' and path == '/funds/count':
+                index = await self._query_index()
+                return 200, {'total': index.count(data.get('filters'), self._ranges(data))}, content_type
+            if method == 'GET' and path == '/funds/values':
+                index = await self._query_index()
+                return 200, {column: [str(value) for value in index.values(column)]
+                             for column in index.inverted}, content_type
+            if method == 'GET' and path == '/health':
+                return 200, self._health(), content_type
+            return 404, {'error': f"No route for {method} {path}"}, content_type
+        except (KeyError, TypeError, ValueError) as error:
+            return 400, {'error': str(error)}, content_type
+        except Exception as error:
+            return 500, {'error': repr(error)}, content_type
+
+    @staticmethod
+    async def _query_index():
+        # A changed fund universe file is loaded (and indexed) in a worker thread
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: get_fund_analyzer(path=FUND_UNIVERSE_PATH).query_index
+        )
+
+    def _query_funds(self, index, data):
+        page, total = index.query(
+            data.get('filters'),
+            self._ranges(data),
+            sort_by=data.get('sort_by'),
+            ascending=data.get('ascending', True),
+            offset=int(data.get('offset', 0)),
+            limit=min(int(data.get('limit', 50)), MAX_PAGE_SIZE),
+            columns=data.get('columns')
+        )
+        return {'rows': page.to_dict('records'), 'total': total}
+
+    def _health(self):
+        stats = fund_universe_cache.stats()
+        batches = self.batcher.batches
+        return {
+            'status': 'ok',
+            'requests': self.batcher.requests,
+            'batches': batches,
+            'mean_batch_size': self.batcher.requests / batches if batches else 0.0,
+            'fund_universe': {key: stats[key] for key in ('hits', 'misses', 'hit_rate', 'entries')}
+        }
+
+    @staticmethod
+    def _ranges(data):
+        # JSON/msgpack have no tuples: ranges arrive as [low, high] lists
+        return {column: tuple(bounds) for column, bounds in (data.get('ranges') or {}).items()}
+
+    @staticmethod
+    def _decode(body, content_type):
+        if content_type == MSGPACK_TYPE:
+            return msgpack.unpackb(body, raw=False)
+        return json.loads(body)
+
+    @staticmethod
+    def _encode(payload, content_type):
+        if content_type == MSGPACK_TYPE:
+            return msgpack.packb(payload, use_bin_type=True)
+        return json.dumps(payload).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Financial analysis HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+
+    service = AnalysisService()
+    print(f"Serving financial analysis on http://{args.host}:{args.port}")
+    asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
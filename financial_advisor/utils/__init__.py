@@ -1,5 +1,32 @@
 # This file makes the utils directory a Python package
 from .financial_calculators import FinancialCalculators
 from .data_processor import DataProcessor
+from .amortization import AmortizationEngine
+from .debt_payoff import DebtPayoffSimulator
+from .retirement_simulation import RetirementMonteCarlo
+from .goal_solver import GoalSolver
+from .xirr import XIRREngine
+from .mutual_funds import MutualFundAnalyzer
+from .fund_universe import FundUniverseCache, fund_universe_cache, get_fund_analyzer
+from .fund_store import FundUniverseLoader
+from .nav_analytics import NAVAnalytics
+from .nav_store import NAVStore
+from .category_stats import CategoryAggregate
+from .analysis_results import FundAnalysisResult
+from .fund_query import FundQueryIndex
+from .analysis_pipeline import analyze_profile, analyze_profiles
+from .analysis_client import AnalysisClient, AnalysisServiceError
+from .transaction_pipeline import TransactionAggregator, read_transaction_chunks
+from .spending_state import SpendingPatternState
+from .seasonality import SeasonalDecomposition
+from .spending_forecast import SpendingForecaster
+from .spending_anomalies import SpendingAnomalyDetector
 
-__all__ = ['FinancialCalculators', 'DataProcessor']
\ No newline at end of file
+__all__ = ['FinancialCalculators', 'DataProcessor', 'AmortizationEngine', 'DebtPayoffSimulator',
+           'RetirementMonteCarlo', 'GoalSolver', 'XIRREngine',
+           'MutualFundAnalyzer', 'FundUniverseCache', 'fund_universe_cache', 'get_fund_analyzer',
+           'FundUniverseLoader', 'NAVAnalytics', 'NAVStore', 'CategoryAggregate',
+           'FundAnalysisResult', 'FundQueryIndex',
+           'analyze_profile', 'analyze_profiles', 'AnalysisClient', 'AnalysisServiceError',
+           'TransactionAggregator', 'read_transaction_chunks', 'SpendingPatternState',
+           'SeasonalDecomposition', 'SpendingForecaster', 'SpendingAnomalyDetector']
\ No newline at end of file
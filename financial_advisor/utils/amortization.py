@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+
+class AmortizationEngine:
+    """
+    Closed-form loan amortization schedules for one loan or a whole loan book
+
+    Every month the outstanding balance is re-amortized over the remaining tenure,
+    so the balance follows the linear recurrence
+
+        B[t] = B[t-1] * (1 + r[t] - a[t]) - prepayment[t]
+
+    where a[t] is the annuity factor for the remaining months. With a constant
+    rate this gives the usual flat EMI; a rate reset or a prepayment simply
+    changes the EMI from that month on (reduce-EMI servicing). The recurrence is
+    solved with a cumulative product, so there is no per-month Python loop.
+    """
+
+    COLUMNS = ['opening_balance', 'interest', 'principal', 'prepayment', 'payment', 'closing_balance']
+
+    @staticmethod
+    def build_schedule(loan_amount, annual_interest_rate, tenure_months, moratorium_months=0,
+                       prepayments=None, horizon=None):
+        """
+        Build month-by-month schedules for a batch of loans
+
+        Args:
+            loan_amount (array-like): Principal per loan, shape (loans,)
+            annual_interest_rate (array-like): Annual rate in percentage, either one
+                per loan (loans,) or one per loan and month (loans, months) for rate resets
+            tenure_months (array-like): Repayment months after the moratorium, per loan
+            moratorium_months (array-like): Initial months with no payment; interest is capitalized
+            prepayments (array-like): Extra principal paid per loan and month (loans, months)
+            horizon (int): Number of schedule columns; defaults to the longest loan
+
+        Returns:
+            dict: (loans, months) arrays for each of COLUMNS, plus 'rate' (annual %),
+                'month' (1-based month numbers) and 'closed_month' (month the loan is repaid)
+        """
+        loan_amount = np.atleast_1d(np.asarray(loan_amount, dtype=float))
+        loans = loan_amount.shape[0]
+        tenure_months = np.broadcast_to(np.asarray(tenure_months, dtype=np.int64), (loans,))
+        moratorium_months = np.broadcast_to(np.asarray(moratorium_months, dtype=np.int64), (loans,))
+        last_month = moratorium_months + tenure_months
+
+        if horizon is None:
+            horizon = int(last_month.max()) if loans else 0
+
+        annual_rate = np.asarray(annual_interest_rate, dtype=float)
+        if annual_rate.ndim < 2:
+            annual_rate = np.broadcast_to(annual_rate.reshape(-1, 1), (loans, 1))
+        annual_rate = np.broadcast_to(annual_rate[:, :horizon], (loans, horizon))
+        rate = annual_rate / 100 / 12
+
+        month = np.arange(1, horizon + 1)
+        remaining = last_month[:, None] - month[None, :] + 1
+        in_moratorium = month[None, :] <= moratorium_months[:, None]
+        is_last = month[None, :] == last_month[:, None]
+        in_term = month[None, :] <= last_month[:, None]
+
+        # Annuity factor over the remaining tenure (1/n when the rate is zero)
+        safe_remaining = np.maximum(remaining, 1)
+        discount = 1 - (1 + rate) ** -safe_remaining
+        annuity = np.divide(rate, discount, out=1.0 / safe_remaining, where=rate > 0)
+        annuity = np.where(in_moratorium, 0.0, annuity)
+
+        # The final month always clears the loan, so it is left out of the product
+        factor = np.where(is_last | ~in_term, 1.0, 1 + rate - annuity)
+        growth = np.cumprod(factor, axis=1)
+
+        if prepayments is None:
+            prepayments = np.zeros((loans, horizon))
+        else:
+            prepayments = np.broadcast_to(np.asarray(prepayments, dtype=float)[:, :horizon], (loans, horizon))
+            prepayments = np.where(is_last | ~in_term, 0.0, prepayments)
+        scaled_prepayments = prepayments / growth
+
+        closing = growth * (loan_amount[:, None] - np.cumsum(scaled_prepayments, axis=1))
+        closing = np.where(is_last, 0.0, np.maximum(closing, 0.0))
+
+        # A prepayment can close the loan early; everything after that month is zero
+        tolerance = 1e-8 * np.maximum(loan_amount, 1.0)[:, None]
+        ended = np.logical_or.accumulate((closing <= tolerance) | ~in_term, axis=1)
+        active = np.concatenate([np.ones((loans, 1), dtype=bool), ~ended[:, :-1]], axis=1) & in_term
+        closing = np.where(ended, 0.0, closing)
+
+        opening = np.concatenate([loan_amount[:, None], closing[:, :-1]], axis=1)
+        opening = np.where(active, opening, 0.0)
+        interest = opening * rate
+        payment = np.where(is_last, opening + interest, opening * annuity)
+        payment = np.where(active, payment, 0.0)
+        principal = payment - interest
+        # The prepayment that closes a loan is capped at what was still outstanding
+        prepayment = np.where(active, np.minimum(prepayments, opening + interest - payment), 0.0)
+
+        closed_month = np.where(active.any(axis=1), horizon - np.argmax(active[:, ::-1], axis=1), 0)
+
+        return {
+            'month': month,
+            'rate': np.where(active, annual_rate, 0.0),
+            'opening_balance': opening,
+            'interest': interest,
+            'principal': principal,
+            'prepayment': prepayment,
+            'payment': payment,
+            'closing_balance': closing,
+            'closed_month': closed_month
+        }
+
+    @staticmethod
+    def iter_loan_book(loan_book, rate_schedule=None, prepayments=None, chunk_size=10000):
+        """
+        Yield schedules for a loan book in chunks of rows to keep memory bounded
+
+        Args:
+            loan_book (DataFrame): Columns 'loan_amount', 'annual_interest_rate',
+                'tenure_months' and optionally 'moratorium_months'
+            rate_schedule (array-like): Optional (loans, months) annual rates, e.g. a np.memmap
+            prepayments (array-like): Optional (loans, months) extra principal payments
+            chunk_size (int): Loans per chunk
+
+        Yields:
+            tuple: (row slice, schedule dict from build_schedule)
+        """
+        moratorium = loan_book['moratorium_months'] if 'moratorium_months' in loan_book else None
+        horizon = int((loan_book['tenure_months'] + (moratorium if moratorium is not None else 0)).max())
+
+        for start in range(0, len(loan_book), chunk_size):
+            rows = slice(start, min(start + chunk_size, len(loan_book)))
+            chunk = loan_book.iloc[rows]
+            rates = rate_schedule[rows] if rate_schedule is not None else chunk['annual_interest_rate'].to_numpy()
+
+            yield rows, AmortizationEngine.build_schedule(
+                chunk['loan_amount'].to_numpy(),
+                rates,
+                chunk['tenure_months'].to_numpy(),
+                moratorium.iloc[rows].to_numpy() if moratorium is not None else 0,
+                prepayments[rows] if prepayments is not None else None,
+                horizon=horizon
+            )
+
+    @staticmethod
+    def summarize_loan_book(loan_book, rate_schedule=None, prepayments=None, chunk_size=10000):
+        """
+        Per-loan totals for a whole loan book, computed chunk by chunk
+
+        Returns:
+            DataFrame: 'first_emi', 'total_interest', 'total_prepayment',
+                'total_payment' and 'closed_month' per loan, indexed like loan_book
+        """
+        summaries = []
+        for rows, schedule in AmortizationEngine.iter_loan_book(loan_book, rate_schedule, prepayments, chunk_size):
+            paying = schedule['payment'] > 0
+            first_paying = np.argmax(paying, axis=1)
+            summaries.append(pd.DataFrame({
+                'first_emi': schedule['payment'][np.arange(len(first_paying)), first_paying],
+                'total_interest': schedule['interest'].sum(axis=1),
+                'total_prepayment': schedule['prepayment'].sum(axis=1),
+                'total_payment': schedule['payment'].sum(axis=1) + schedule['prepayment'].sum(axis=1),
+                'closed_month': schedule['closed_month']
+            }, index=loan_book.index[rows]))
+
+        if not summaries:
+            return pd.DataFrame(columns=['first_emi', 'total_interest', 'total_prepayment',
+                                         'total_payment', 'closed_month'])
+        return pd.concat(summaries)
+
+    @staticmethod
+    def to_frame(schedule, loan=0):
+        """Convert one loan of a batched schedule to a month-by-month DataFrame"""
+        months = int(schedule['closed_month'][loan])
+        frame = pd.DataFrame({'month': schedule['month'][:months],
+                              'rate': schedule['rate'][loan, :months]})
+        for column in AmortizationEngine.COLUMNS:
+            frame[column] = schedule[column][loan, :months]
+        return frame
@@ -0,0 +1,131 @@
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from .analysis_results import FundAnalysisResult
+
+# msgpack is optional: without it the client speaks JSON
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+class AnalysisServiceError(Exception):
+    """The analysis service rejected a request or could not be reached"""
+
+
+class AnalysisClient:
+    """
+    Client of the headless analysis service (service.py)
+
+    Keeps one keep-alive connection per thread, since Streamlit runs every
+    session on its own thread. Responses are turned back into the same
+    structures the in-process pipeline returns, so the UI code is shared.
+    """
+
+    def __init__(self, base_url, timeout=10, use_msgpack=False):
+        """
+        Args:
+            base_url (str): Service address, e.g. http://127.0.0.1:8600
+            timeout (float): Socket timeout in seconds
+            use_msgpack (bool): Send and accept msgpack instead of JSON (needs msgpack)
+        """
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.content_type = 'application/msgpack' if use_msgpack and MSGPACK_AVAILABLE else 'application/json'
+        self._local = threading.local()
+
+    def analyze(self, user_data):
+        """Metrics for one profile, shaped like analyze_profile output"""
+        return self._to_metrics(self._request('POST', '/analyze', user_data))
+
+    def analyze_many(self, profiles):
+        """Metrics for many profiles in one round trip"""
+        response = self._request('POST', '/analyze', {'profiles': list(profiles)})
+        return [self._to_metrics(payload) for payload in response['results']]
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def _to_metrics(self, payload):
+        return {
+            'basic': payload['basic'],
+            'mutual_funds': FundAnalysisResult.from_dict(payload['mutual_funds'], RemoteFundIndex(self))
+        }
+
+    def _request(self, method, path, payload=None):
+        body = self._encode(payload) if payload is not None else None
+        headers = {'Content-Type': self.content_type, 'Accept': self.content_type}
+
+        # Retry once on a fresh connection if the kept-alive one was dropped
+        for attempt in range(2):
+            connection = self._connection(reset=attempt > 0)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException, OSError) as error:
+                if attempt:
+                    raise AnalysisServiceError(f"Analysis service unreachable: {error}") from error
+
+        result = self._decode(data, response.getheader('Content-Type', 'application/json'))
+        if response.status != 200:
+            raise AnalysisServiceError(result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def _connection(self, reset=False):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or reset:
+            if connection is not None:
+                connection.close()
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _encode(self, payload):
+        if self.content_type == 'application/msgpack':
+            return msgpack.packb(payload, use_bin_type=True)
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def _decode(data, content_type):
+        if content_type.startswith('application/msgpack'):
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data)
+
+
+class RemoteFundIndex:
+    """FundQueryIndex interface (values, count, query) answered by the service"""
+
+    def __init__(self, client):
+        self.client = client
+        self._values = None
+
+    def values(self, column):
+        if self._values is None:
+            self._values = self.client._request('GET', '/funds/values')
+        return self._values[column]
+
+    def count(self, filters=None, ranges=None):
+        return self.client._request('POST', '/funds/count', {'filters': filters, 'ranges': ranges})['total']
+
+    def query(self, filters=None, ranges=None, sort_by=None, ascending=True,
+              offset=0, limit=50, columns=None):
+        response = self.client._request('POST', '/funds/query', {
+            'filters': filters,
+            'ranges': ranges,
+            'sort_by': sort_by,
+            'ascending': ascending,
+            'offset': offset,
+            'limit': limit,
+            'columns': columns
+        })
+        return pd.DataFrame(response['rows'], columns=columns), response['total']
@@ -0,0 +1,67 @@
+from .analysis_results import FundAnalysisResult
+
+HORIZONS = ['6 months', '1 year', '3 years', '5 years']
+
+
+def basic_metrics(user_data):
+    """Income, expenses, savings and investment target of one profile"""
+    income = user_data['monthly_income']
+    if not income or income <= 0:
+        raise ValueError("monthly_income must be positive")
+
+    total_expenses = sum(user_data['expenses'].values())
+    savings = income - total_expenses
+    return {
+        'income': income,
+        'expenses': total_expenses,
+        'savings': savings,
+        'savings_rate': (savings / income) * 100,
+        'investment_amount': income * (user_data['investment_percentage'] / 100)
+    }
+
+
+def risk_appetite_for(savings_rate):
+    """Risk appetite the fund recommendations are filtered by"""
+    if savings_rate >= 30:
+        return 'Aggressive'
+    elif savings_rate >= 15:
+        return 'Moderate'
+    return 'Conservative'
+
+
+def analyze_profile(user_data, analyzer):
+    """
+    Complete analysis of one financial profile
+
+    Pure with respect to the profile: it only reads the (shared) analyzer.
+
+    Args:
+        user_data (dict): Profile with monthly_income, expenses (dict) and investment_percentage
+        analyzer (MutualFundAnalyzer): Fund universe to recommend from
+
+    Returns:
+        dict: {'basic': dict of basic metrics, 'mutual_funds': FundAnalysisResult}
+    """
+    return analyze_profiles([user_data], analyzer)[0]
+
+
+def analyze_profiles(profiles, analyzer):
+    """
+    Analyze many profiles at once
+
+    Recommendations depend only on the risk appetite, so the fund section is
+    built once per distinct appetite and shared (read-only) by every profile
+    in the batch.
+
+    Returns:
+        list: One metrics dict per profile, as returned by analyze_profile
+    """
+    fund_results = {}
+    metrics = []
+    for user_data in profiles:
+        basic = basic_metrics(user_data)
+        risk_appetite = risk_appetite_for(basic['savings_rate'])
+        if risk_appetite not in fund_results:
+            fund_results[risk_appetite] = FundAnalysisResult.from_analyzer(analyzer, risk_appetite, HORIZONS)
+        metrics.append({'basic': basic, 'mutual_funds': fund_results[risk_appetite]})
+    return metrics
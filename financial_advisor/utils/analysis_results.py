@@ -0,0 +1,113 @@
+import pandas as pd
+
+
+class FundAnalysisResult:
+    """
+    Mutual fund part of an analysis, holding the analyzer's frames by reference
+
+    Nothing is converted to records: the fund universe is the analyzer's own
+    DataFrame, recommendations are kept as row positions into it, and each
+    view slices only the rows and columns it shows when it is first asked for.
+    The frames are shared with the analyzer and other sessions, so views must
+    treat them as read-only.
+
+    Attributes:
+        risk_appetite (str): Risk appetite derived from the savings rate
+        fund_data (DataFrame): Full fund universe (shared reference)
+        category_performance (DataFrame): Per-category average returns
+        category_bands (DataFrame): Per-category return percentiles, indexed by category
+        fund_index (FundQueryIndex): Explorer indexes over fund_data, if available
+        horizons (list): Horizons with recommendations
+    """
+
+    __slots__ = ('risk_appetite', 'fund_data', 'category_performance', 'category_bands',
+                 'fund_index', '_recommended', '_views')
+
+    def __init__(self, risk_appetite, fund_data, recommended, category_performance, category_bands,
+                 fund_index=None):
+        """
+        Args:
+            risk_appetite (str): Risk appetite derived from the savings rate
+            fund_data (DataFrame): Fund universe the positions refer to
+            recommended (dict): Horizon -> (row positions, scores) of the recommended funds
+            category_performance (DataFrame): Per-category average returns
+            category_bands (DataFrame): Per-category return percentiles
+            fund_index (FundQueryIndex): Explorer indexes over fund_data
+        """
+        self.risk_appetite = risk_appetite
+        self.fund_data = fund_data
+        self.category_performance = category_performance
+        self.category_bands = category_bands
+        self.fund_index = fund_index
+        self._recommended = recommended
+        self._views = {}
+
+    @classmethod
+    def from_analyzer(cls, analyzer, risk_appetite, horizons, top_k=5):
+        """Collect recommendations and category statistics from a MutualFundAnalyzer"""
+        recommended = {
+            horizon: analyzer.recommend_positions(horizon, risk_appetite, top_k)
+            for horizon in horizons
+        }
+        return cls(risk_appetite, analyzer.fund_data, recommended,
+                   analyzer.get_category_performance(), analyzer.get_category_bands(),
+                   analyzer.query_index)
+
+    @property
+    def horizons(self):
+        return list(self._recommended)
+
+    def recommendations(self, horizon):
+        """Recommended funds for a horizon with their Score, sliced on first access"""
+        key = ('recommendations', horizon)
+        if key not in self._views:
+            positions, scores = self._recommended[horizon]
+            view = self.fund_data.iloc[positions].copy()
+            view['Score'] = scores
+            self._views[key] = view
+        return self._views[key]
+
+    def funds(self, columns=None, mask=None):
+        """
+        Rows and columns of the fund universe for a table view
+
+        Args:
+            columns (list): Columns to project; all columns when None
+            mask (array-like): Boolean row filter; all rows when None
+
+        Returns:
+            DataFrame: Only the selected rows and columns are materialized
+        """
+        frame = self.fund_data if columns is None else self.fund_data[columns]
+        return frame if mask is None else frame[mask]
+
+    def to_dict(self, include_funds=True):
+        """Plain-record form (copies what it includes; for export and the HTTP service, not for rendering)"""
+        data = {
+            'risk_appetite': self.risk_appetite,
+            'recommendations': {horizon: self.recommendations(horizon).to_dict('records')
+                                for horizon in self.horizons},
+            'category_performance': self.category_performance.to_dict('records'),
+            'category_bands': self.category_bands.reset_index().to_dict('records')
+        }
+        if include_funds:
+            data['all_funds'] = self.fund_data.to_dict('records')
+        return data
+
+    @classmethod
+    def from_dict(cls, data, fund_index=None):
+        """
+        Rebuild from to_dict() output, e.g. a service response
+
+        Recommendations arrive already materialized, so their views are prefilled.
+        fund_data is only available if the payload included 'all_funds'.
+        """
+        fund_data = pd.DataFrame(data['all_funds']) if 'all_funds' in data else None
+        bands = pd.DataFrame(data['category_bands'])
+        if 'Category' in bands:
+            bands = bands.set_index('Category')
+        result = cls(data['risk_appetite'], fund_data, dict.fromkeys(data['recommendations']),
+                     pd.DataFrame(data['category_performance']), bands, fund_index)
+        for horizon, records in data['recommendations'].items():
+            result._views[('recommendations', horizon)] = pd.DataFrame(records)
+        return result
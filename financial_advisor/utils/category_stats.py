@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+
+class CategoryAggregate:
+    """
+    Materialized per-category statistics of the fund universe
+
+    Categories are held as integer codes, and per-category sums and counts of
+    each value column come from one np.bincount per column. When funds change,
+    their old contributions are subtracted and the new ones added with
+    np.add.at, so the category view reads a small table instead of regrouping
+    the whole universe on every rerun. Percentile bands need the sorted values,
+    so they are recomputed lazily (one lexsort) after an update.
+
+    Funds with a missing category get code -1 and are left out of every
+    statistic, as groupby drops them.
+    """
+
+    def __init__(self, fund_data, value_columns, group_col='Category', label_col='Risk Level'):
+        """
+        Args:
+            fund_data (DataFrame): Fund universe
+            value_columns (list): Numeric columns to aggregate
+            group_col (str): Column to group by
+            label_col (str): Column whose first value per group is reported
+        """
+        self.value_columns = list(value_columns)
+        self.group_col = group_col
+        self.label_col = label_col
+        self.rebuild(fund_data)
+
+    def rebuild(self, fund_data):
+        """Recompute every statistic from scratch"""
+        groups = fund_data[self.group_col]
+        labels = groups.cat.categories if isinstance(groups.dtype, pd.CategoricalDtype) else groups.dropna().unique()
+        self.categories = pd.Index(sorted(labels))
+        self.codes = self.categories.get_indexer(groups).astype(np.int64)
+        self.labels = fund_data[self.label_col].to_numpy(dtype=object, copy=True)
+        self.values = fund_data[self.value_columns].to_numpy(dtype=float, copy=True)
+
+        grouped = self.codes >= 0
+        codes, values = self.codes[grouped], self.values[grouped]
+        present = ~np.isnan(values)
+        size = len(self.categories)
+        self.sums = np.column_stack([
+            np.bincount(codes, weights=np.where(present[:, i], values[:, i], 0.0), minlength=size)
+            for i in range(len(self.value_columns))
+        ])
+        self.counts = np.column_stack([
+            np.bincount(codes, weights=present[:, i], minlength=size)
+            for i in range(len(self.value_columns))
+        ])
+        self.sizes = np.bincount(codes, minlength=size)
+        self.invalidate()
+
+    def update(self, fund_data, changed_positions):
+        """
+        Re-aggregate only the given row positions after fund_data was modified
+
+        Positions beyond the previous universe size are treated as appended rows.
+        A category not seen before triggers a full rebuild; a missing one is skipped.
+
+        Args:
+            fund_data (DataFrame): Updated fund universe
+            changed_positions (array-like): Row positions whose values changed or were added
+        """
+        changed = np.unique(np.asarray(changed_positions, dtype=np.int64))
+        if len(changed) == 0:
+            return
+        rows = fund_data.iloc[changed]
+        codes = self.categories.get_indexer(rows[self.group_col])
+        if ((codes < 0) & rows[self.group_col].notna().to_numpy()).any():
+            self.rebuild(fund_data)
+            return
+
+        existing = changed < len(self.codes)
+        self._accumulate(self.codes[changed[existing]], self.values[changed[existing]], sign=-1)
+
+        appended = len(fund_data) - len(self.codes)
+        if appended > 0:
+            self.codes = np.concatenate([self.codes, np.full(appended, -1, dtype=np.int64)])
+            self.labels = np.concatenate([self.labels, np.empty(appended, dtype=object)])
+            self.values = np.vstack([self.values, np.full((appended, len(self.value_columns)), np.nan)])
+
+        values = rows[self.value_columns].to_numpy(dtype=float)
+        self.codes[changed] = codes
+        self.labels[changed] = rows[self.label_col].to_numpy(dtype=object)
+        self.values[changed] = values
+        self._accumulate(codes, values, sign=1)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the cached table and percentile bands (the sums and counts stay valid)"""
+        self._table = None
+        self._bands = {}
+
+    def table(self, decimals=2):
+        """
+        Per-category means of the value columns and the first label, like
+        groupby(group_col).agg({column: 'mean', ..., label_col: 'first'}).round(decimals)
+        """
+        if self._table is None:
+            present = self.sizes > 0
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = self.sums / self.counts
+
+            # First row of each category in universe order
+            first = np.full(len(self.categories), len(self.codes))
+            grouped = np.flatnonzero(self.codes >= 0)
+            np.minimum.at(first, self.codes[grouped], grouped)
+
+            table = pd.DataFrame(means[present], columns=self.value_columns)
+            table.insert(0, self.group_col, self.categories[present])
+            table[self.label_col] = self.labels[first[present]]
+            self._table = table.round(decimals)
+        return self._table.copy()
+
+    def bands(self, percentiles=(25, 50, 75)):
+        """
+        Per-category percentiles of every value column (linear interpolation, NaNs ignored)
+
+        Returns:
+            DataFrame: Indexed by category, one column per (value column, percentile)
+                named like '1Y Return P50'
+        """
+        key = tuple(percentiles)
+        if key not in self._bands:
+            present = self.sizes > 0
+            columns = {}
+            for i, column in enumerate(self.value_columns):
+                values = self.values[:, i]
+                valid = ~np.isnan(values) & (self.codes >= 0)
+                codes, values = self.codes[valid], values[valid]
+                order = np.lexsort((values, codes))
+                codes, values = codes[order], values[order]
+
+                counts = np.bincount(codes, minlength=len(self.categories))
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+                for q in percentiles:
+                    # Same rank interpolation as np.percentile, applied within each group's slice
+                    rank = (counts - 1).clip(min=0) * q / 100
+                    low = np.floor(rank).astype(np.int64)
+                    high = np.minimum(low + 1, (counts - 1).clip(min=0))
+                    fraction = rank - low
+                    has_values = counts > 0
+                    band = np.full(len(self.categories), np.nan)
+                    lower = values[(starts + low)[has_values]]
+                    upper = values[(starts + high)[has_values]]
+                    band[has_values] = lower + (upper - lower) * fraction[has_values]
+                    columns[f"{column} P{q}"] = band[present]
+            self._bands[key] = pd.DataFrame(columns, index=pd.Index(self.categories[present], name=self.group_col))
+        return self._bands[key].copy()
+
+    def _accumulate(self, codes, values, sign):
+        grouped = codes >= 0
+        codes, values = codes[grouped], values[grouped]
+        present = ~np.isnan(values)
+        np.add.at(self.sums, codes, sign * np.where(present, values, 0.0))
+        np.add.at(self.counts, codes, sign * present)
+        np.add.at(self.sizes, codes, sign)
@@ -3,11 +3,45 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 
+from .seasonality import SeasonalDecomposition
+
 class DataProcessor:
     """
     Data processing utilities for financial data analysis
     """
     
+    # Thresholds shared by the single-user and multi-user pattern detectors
+    LIFESTYLE_CREEP_THRESHOLD = 0.05
+    SEASONAL_VARIATION_THRESHOLD = 0.2
+    SAVINGS_CV_THRESHOLD = 0.3
+    
+    # From three years of history, seasonality is an F-test on the decomposed expenses
+    # (SeasonalDecomposition) instead of the calendar-month variation heuristic; the 2x12
+    # moving average drops six months at each end, and the test needs every calendar
+    # month detrended twice
+    SEASONAL_TEST_MONTHS = 36
+    SEASONAL_SIGNIFICANCE = 0.05
+    
+    # Health score components: score = intercept + slope * input, capped at max_points
+    # and floored at floor (NaN = no cap / no floor). Inputs: savings rate (%), emergency fund
+    # months, debt ratio (% of income), investment target (%), and the number of
+    # expense categories above threshold (% of income).
+    HEALTH_SCORE_WEIGHTS = {
+        'savings_rate': {'max_points': 25, 'intercept': 0, 'slope': 1.0, 'floor': np.nan, 'threshold': np.nan},
+        'emergency_fund': {'max_points': 20, 'intercept': 0, 'slope': 20 / 6, 'floor': np.nan, 'threshold': np.nan},
+        'debt_management': {'max_points': 15, 'intercept': 15, 'slope': -1.0, 'floor': 0, 'threshold': np.nan},
+        'investment_rate': {'max_points': 15, 'intercept': 0, 'slope': 0.75, 'floor': np.nan, 'threshold': np.nan},
+        'expense_management': {'max_points': 25, 'intercept': 25, 'slope': -5.0, 'floor': 0, 'threshold': 30}
+    }
+    
+    # (minimum total score, interpretation), best band first; lower scores get the last label
+    HEALTH_SCORE_BANDS = [
+        (80, "Excellent - Strong financial health"),
+        (60, "Good - Solid financial foundation"),
+        (40, "Fair - Room for improvement"),
+        (None, "Needs Attention - Significant improvements needed")
+    ]
+    
     @staticmethod
     def process_user_financial_data(user_data):
         """
@@ -21,27 +55,78 @@ class DataProcessor:
         """
         processed_data = user_data.copy()
         
-        # Calculate derived metrics
+        income = user_data['monthly_income']
+        
+        # Calculate derived metrics (rates are NaN when there is no income)
         total_expenses = sum(user_data['expenses'].values())
-        monthly_savings = user_data['monthly_income'] - total_expenses
-        savings_rate = (monthly_savings / user_data['monthly_income']) * 100
+        monthly_savings = income - total_expenses
+        savings_rate = (monthly_savings / income) * 100 if income else float('nan')
         
         processed_data['derived_metrics'] = {
             'total_expenses': total_expenses,
             'monthly_savings': monthly_savings,
             'savings_rate': savings_rate,
-            'desired_investment': user_data['monthly_income'] * (user_data['investment_percentage'] / 100)
+            'desired_investment': income * (user_data['investment_percentage'] / 100)
         }
         
         # Calculate expense ratios
         expense_ratios = {}
         for category, amount in user_data['expenses'].items():
-            expense_ratios[category] = (amount / user_data['monthly_income']) * 100
+            expense_ratios[category] = (amount / income) * 100 if income else float('nan')
         
         processed_data['expense_ratios'] = expense_ratios
         
         return processed_data
     
+    @staticmethod
+    def process_user_financial_data_bulk(users, expense_columns=None):
+        """
+        Column-wise process_user_financial_data over a DataFrame of users
+        
+        Uses the column names pd.json_normalize gives the single-user dicts: expense
+        categories are 'expenses.<category>' columns, and the outputs are added as
+        'derived_metrics.<metric>' and 'expense_ratios.<category>' columns. Every
+        value equals the single-dict result for the same user (expenses are summed
+        in the same column order), and zero income gives NaN rates instead of
+        raising. A missing expense cell (a category absent from that user's dict)
+        counts as 0 in the totals and gives a NaN ratio.
+        
+        Args:
+            users (DataFrame): One row per user with monthly_income, investment_percentage
+                and expense columns
+            expense_columns (list): Expense columns, in summation order; defaults to
+                every 'expenses.*' column
+        
+        Returns:
+            DataFrame: Input columns plus the derived metric and expense ratio columns
+        """
+        if expense_columns is None:
+            expense_columns = [column for column in users.columns if str(column).startswith('expenses.')]
+        
+        income = users['monthly_income'].to_numpy()
+        has_income = income != 0
+        safe_income = np.where(has_income, income, 1)
+        
+        # Left-to-right accumulation, exactly like Python's sum() over the dict
+        total_expenses = 0
+        for column in expense_columns:
+            total_expenses = total_expenses + users[column].fillna(0).to_numpy()
+        total_expenses = np.broadcast_to(total_expenses, income.shape)
+        monthly_savings = income - total_expenses
+        
+        derived = {
+            'derived_metrics.total_expenses': total_expenses,
+            'derived_metrics.monthly_savings': monthly_savings,
+            'derived_metrics.savings_rate': np.where(has_income, (monthly_savings / safe_income) * 100, np.nan),
+            'derived_metrics.desired_investment': income * (users['investment_percentage'].to_numpy() / 100)
+        }
+        for column in expense_columns:
+            category = str(column)[len('expenses.'):] if str(column).startswith('expenses.') else column
+            ratio = (users[column].to_numpy() / safe_income) * 100
+            derived[f'expense_ratios.{category}'] = np.where(has_income, ratio, np.nan)
+        
+        return pd.concat([users, pd.DataFrame(derived, index=users.index)], axis=1)
+    
     @staticmethod
     def detect_spending_patterns(historical_data):
         """
@@ -67,6 +152,141 @@ class DataProcessor:
         
         return patterns
     
+    @staticmethod
+    def detect_spending_patterns_bulk(transactions, user_col='user_id', date_col='date',
+                                      category_col='category', amount_col='amount'):
+        """
+        detect_spending_patterns for many users at once from a long-format table
+        
+        Rows are (user, date, category, amount). Category 'income' is income; every
+        other category except 'total_expenses' and 'savings' is an expense category.
+        Amounts are summed per user and calendar month, and each user's months in date
+        order play the role of the single-user records. total_expenses and savings are
+        derived (expense sum, income - expenses) unless given as categories. A category
+        missing in a month counts as 0.
+        
+        All users are handled in grouped array passes: bincount sums per user for the
+        growth, variability and seasonality statistics, and closed-form OLS sums for the
+        category slopes (slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2) with x = 0..n-1).
+        Users with SEASONAL_TEST_MONTHS months get the seasonality F-test of
+        SeasonalDecomposition over one grid of their total expenses.
+        
+        Args:
+            transactions (DataFrame): Long-format table
+            user_col, date_col, category_col, amount_col (str): Column names
+        
+        Returns:
+            dict: 'summary' (DataFrame indexed by user: months, income_growth,
+                expense_growth, lifestyle_creep, seasonal_variation, seasonal_strength,
+                seasonal_p_value, seasonal_spending, savings_cv, high_savings_variability)
+                and 'category_trends' (DataFrame of OLS slopes per month, users x expense
+                categories). Statistics are NaN and flags False where the single-user
+                detector reports insufficient data.
+        """
+        users, user_index = pd.factorize(transactions[user_col], sort=True)
+        categories, category_index = pd.factorize(transactions[category_col], sort=True)
+        dates = pd.to_datetime(transactions[date_col])
+        months = (dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1).astype(np.int64)
+        amounts = transactions[amount_col].to_numpy(dtype=float)
+        
+        # One row per (user, month), ordered by user then month
+        first_month = months.min() if len(months) else 0
+        span = (months.max() - first_month + 1) if len(months) else 1
+        keys, rows = np.unique(users.astype(np.int64) * span + (months - first_month), return_inverse=True)
+        row_user = keys // span
+        row_month = keys % span + first_month
+        user_count, row_count = len(user_index), len(keys)
+        
+        values = np.zeros((row_count, len(category_index)))
+        np.add.at(values, (rows, categories), amounts)
+        columns = {name: values[:, i] for i, name in enumerate(category_index)}
+        
+        expense_names = [name for name in category_index if name not in ('income', 'total_expenses', 'savings')]
+        income = columns.get('income', np.zeros(row_count))
+        total_expenses = columns.get('total_expenses')
+        if total_expenses is None:
+            total_expenses = sum((columns[name] for name in expense_names), np.zeros(row_count))
+        savings = columns.get('savings', income - total_expenses)
+        
+        counts = np.bincount(row_user, minlength=user_count)
+        first_row = np.cumsum(counts) - counts
+        last_row = first_row + counts - 1
+        position = np.arange(row_count) - first_row[row_user]
+        valid_users = counts > 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Lifestyle creep: first vs last month growth
+            enough = counts >= 3
+            income_growth = np.full(user_count, np.nan)
+            expense_growth = np.full(user_count, np.nan)
+            income_growth[valid_users] = ((income[last_row] - income[first_row]) / income[first_row])[valid_users]
+            expense_growth[valid_users] = ((total_expenses[last_row] - total_expenses[first_row]) /
+                                           total_expenses[first_row])[valid_users]
+            income_growth[~enough] = np.nan
+            expense_growth[~enough] = np.nan
+            lifestyle_creep = expense_growth > income_growth + DataProcessor.LIFESTYLE_CREEP_THRESHOLD
+        
+            # Seasonality: variation of the calendar-month averages of total expenses
+            calendar = row_user * 12 + row_month % 12
+            month_sums = np.bincount(calendar, weights=total_expenses, minlength=user_count * 12).reshape(user_count, 12)
+            month_counts = np.bincount(calendar, minlength=user_count * 12).reshape(user_count, 12)
+            month_means = np.where(month_counts > 0, month_sums / month_counts, np.nan)
+            observed = (month_counts > 0).sum(axis=1)
+            average = np.nansum(month_means, axis=1) / observed
+            spread = np.sqrt(np.nansum((month_means - average[:, None]) ** 2, axis=1) / (observed - 1))
+            seasonal_variation = np.where(counts >= 12, spread / average, np.nan)
+            
+            # Longer histories: F-test on the decomposed expenses, one (users, months) grid
+            tested = counts >= DataProcessor.SEASONAL_TEST_MONTHS
+            seasonal_strength = np.full(user_count, np.nan)
+            seasonal_p_value = np.full(user_count, np.nan)
+            if tested.any():
+                slots = np.cumsum(tested) - 1
+                selected = tested[row_user]
+                wide = np.full((int(tested.sum()), span), np.nan)
+                wide[slots[row_user[selected]], row_month[selected] - first_month] = total_expenses[selected]
+                start = pd.Period(year=first_month // 12, month=first_month % 12 + 1, freq='M')
+                test = SeasonalDecomposition(wide, start=start).significance()
+                seasonal_strength[tested] = test['strength'].to_numpy()
+                seasonal_p_value[tested] = test['p_value'].to_numpy()
+            seasonal_spending = np.where(np.isnan(seasonal_p_value),
+                                         seasonal_variation > DataProcessor.SEASONAL_VARIATION_THRESHOLD,
+                                         seasonal_p_value < DataProcessor.SEASONAL_SIGNIFICANCE)
+        
+            # Savings consistency: coefficient of variation (sample standard deviation)
+            savings_mean = np.bincount(row_user, weights=savings, minlength=user_count) / counts
+            squared = np.bincount(row_user, weights=(savings - savings_mean[row_user]) ** 2, minlength=user_count)
+            savings_cv = np.where(enough, np.sqrt(squared / (counts - 1)) / savings_mean, np.nan)
+        
+            # Category trends: closed-form OLS slope against the month position
+            n = counts.astype(float)
+            sum_x = n * (n - 1) / 2
+            sum_xx = (n - 1) * n * (2 * n - 1) / 6
+            denominator = n * sum_xx - sum_x ** 2
+            slopes = {}
+            for name in expense_names:
+                sum_y = np.bincount(row_user, weights=columns[name], minlength=user_count)
+                sum_xy = np.bincount(row_user, weights=position * columns[name], minlength=user_count)
+                slopes[name] = np.where(counts > 1, (n * sum_xy - sum_x * sum_y) / denominator, np.nan)
+        
+        summary = pd.DataFrame({
+            'months': counts,
+            'income_growth': income_growth,
+            'expense_growth': expense_growth,
+            'lifestyle_creep': lifestyle_creep,
+            'seasonal_variation': seasonal_variation,
+            'seasonal_strength': seasonal_strength,
+            'seasonal_p_value': seasonal_p_value,
+            'seasonal_spending': seasonal_spending,
+            'savings_cv': savings_cv,
+            'high_savings_variability': savings_cv > DataProcessor.SAVINGS_CV_THRESHOLD
+        }, index=pd.Index(user_index, name=user_col))
+        
+        return {
+            'summary': summary,
+            'category_trends': pd.DataFrame(slopes, index=summary.index)
+        }
+    
     @staticmethod
     def _detect_lifestyle_creep(df):
         """Detect if expenses are growing faster than income"""
@@ -76,7 +296,11 @@ class DataProcessor:
         income_growth = (df['income'].iloc[-1] - df['income'].iloc[0]) / df['income'].iloc[0]
         expense_growth = (df['total_expenses'].iloc[-1] - df['total_expenses'].iloc[0]) / df['total_expenses'].iloc[0]
         
-        if expense_growth > income_growth + 0.05:  # 5% threshold
+        return DataProcessor._lifestyle_creep_message(income_growth, expense_growth)
+    
+    @staticmethod
+    def _lifestyle_creep_message(income_growth, expense_growth):
+        if expense_growth > income_growth + DataProcessor.LIFESTYLE_CREEP_THRESHOLD:
             return f"Lifestyle creep detected: Expenses growing {expense_growth:.1%} vs income {income_growth:.1%}"
         else:
             return "No significant lifestyle creep detected"
@@ -87,11 +311,27 @@ class DataProcessor:
         if len(df) < 12:
             return "Need at least 12 months of data for seasonal analysis"
         
-        # Simple seasonal detection - you can enhance this with proper time series analysis
-        monthly_avg = df.groupby(df['date'].dt.month)['total_expenses'].mean()
-        seasonal_variation = monthly_std = monthly_avg.std() / monthly_avg.mean()
+        if len(df) >= DataProcessor.SEASONAL_TEST_MONTHS:
+            test = SeasonalDecomposition.from_long(df.assign(user_id=0)).significance().iloc[0]
+            if not np.isnan(test['p_value']):
+                return DataProcessor._seasonal_test_message(test['strength'], test['p_value'])
+        
+        # Shorter (or gappy) histories: variation of the calendar-month averages
+        monthly_avg = df.groupby(pd.to_datetime(df['date']).dt.month)['total_expenses'].mean()
+        seasonal_variation = monthly_avg.std() / monthly_avg.mean()
         
-        if seasonal_variation > 0.2:
+        return DataProcessor._seasonal_message(seasonal_variation)
+    
+    @staticmethod
+    def _seasonal_test_message(strength, p_value):
+        if p_value < DataProcessor.SEASONAL_SIGNIFICANCE:
+            return f"Significant seasonal spending pattern detected (strength {strength:.0%}, p = {p_value:.3f})"
+        else:
+            return "Spending patterns are relatively consistent throughout the year"
+    
+    @staticmethod
+    def _seasonal_message(seasonal_variation):
+        if seasonal_variation > DataProcessor.SEASONAL_VARIATION_THRESHOLD:
             return f"Significant seasonal spending variation detected ({seasonal_variation:.1%})"
         else:
             return "Spending patterns are relatively consistent throughout the year"
@@ -107,14 +347,18 @@ class DataProcessor:
         for category in expense_columns:
             if len(df[category]) > 1:
                 trend = np.polyfit(range(len(df)), df[category], 1)[0]  # Linear trend slope
-                category_trends[category] = {
-                    'trend': trend,
-                    'direction': 'increasing' if trend > 0 else 'decreasing',
-                    'magnitude': abs(trend)
-                }
+                category_trends[category] = DataProcessor._trend_entry(trend)
         
         return category_trends
     
+    @staticmethod
+    def _trend_entry(trend):
+        return {
+            'trend': trend,
+            'direction': 'increasing' if trend > 0 else 'decreasing',
+            'magnitude': abs(trend)
+        }
+    
     @staticmethod
     def _analyze_savings_consistency(df):
         """Analyze consistency of savings over time"""
@@ -124,7 +368,11 @@ class DataProcessor:
         savings_std = df['savings'].std()
         savings_cv = savings_std / df['savings'].mean()  # Coefficient of variation
         
-        if savings_cv > 0.3:
+        return DataProcessor._savings_consistency_message(savings_cv)
+    
+    @staticmethod
+    def _savings_consistency_message(savings_cv):
+        if savings_cv > DataProcessor.SAVINGS_CV_THRESHOLD:
             return f"High savings variability detected (CV: {savings_cv:.2f})"
         else:
             return f"Savings are relatively consistent (CV: {savings_cv:.2f})"
@@ -178,17 +426,124 @@ class DataProcessor:
             'interpretation': DataProcessor._interpret_health_score(total_score)
         }
     
+    @staticmethod
+    def generate_financial_health_scores(users, weights=None, bands=None, emergency_fund_months=3):
+        """
+        Columnar generate_financial_health_score for a whole population
+        
+        Args:
+            users (DataFrame): Output of process_user_financial_data_bulk (monthly_income,
+                investment_percentage, expenses.* and expense_ratios.* columns, and
+                derived_metrics.savings_rate); an 'emergency_fund_months' column is used if present
+            weights: Overrides of HEALTH_SCORE_WEIGHTS as a dict, DataFrame, or path to a
+                CSV/JSON table (see load_health_score_weights)
+            bands (list): (minimum score, label) pairs replacing HEALTH_SCORE_BANDS
+            emergency_fund_months (float): Emergency fund assumed when there is no column
+        
+        Returns:
+            DataFrame: total_score, one column per component and a categorical
+                interpretation, indexed like users. Users without income score NaN
+                and have a missing (NaN) interpretation.
+        """
+        table = DataProcessor.load_health_score_weights(weights)
+        bands = bands or DataProcessor.HEALTH_SCORE_BANDS
+        income = users['monthly_income'].to_numpy(dtype=float)
+        
+        def expense(category):
+            column = f'expenses.{category}'
+            return users[column].fillna(0).to_numpy(dtype=float) if column in users else 0.0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            debt_ratio = np.where(income != 0, (expense('loan_repayments') + expense('rent_emi')) / income, np.nan)
+        
+        ratio_columns = [column for column in users.columns if str(column).startswith('expense_ratios.')]
+        threshold = table.loc['expense_management', 'threshold']
+        high_expense_categories = np.zeros(len(users), dtype=np.int64)
+        for column in ratio_columns:
+            high_expense_categories += users[column].to_numpy(dtype=float) > threshold
+        
+        if 'emergency_fund_months' in users:
+            emergency_months = users['emergency_fund_months'].to_numpy(dtype=float)
+        else:
+            emergency_months = np.full(len(users), float(emergency_fund_months))
+        
+        inputs = {
+            'savings_rate': users['derived_metrics.savings_rate'].to_numpy(dtype=float),
+            'emergency_fund': emergency_months,
+            'debt_management': debt_ratio * 100,
+            'investment_rate': users['investment_percentage'].to_numpy(dtype=float),
+            'expense_management': high_expense_categories
+        }
+        
+        scores = {}
+        total = 0
+        for component, values in inputs.items():
+            row = table.loc[component]
+            points = row['intercept'] + row['slope'] * values
+            if not np.isnan(row['max_points']):
+                points = np.minimum(row['max_points'], points)
+            if not np.isnan(row['floor']):
+                points = np.maximum(row['floor'], points)
+            scores[component] = points
+            total = total + points
+        
+        # Band codes instead of strings keep the interpretation column small at scale
+        thresholds = [minimum for minimum, _ in bands if minimum is not None]
+        codes = np.select([total >= minimum for minimum in thresholds], np.arange(len(thresholds)),
+                          default=len(bands) - 1)
+        codes = np.where(np.isnan(total), -1, codes)
+        interpretation = pd.Categorical.from_codes(codes, categories=[label for _, label in bands])
+        
+        result = pd.DataFrame({'total_score': total, **scores}, index=users.index)
+        result['interpretation'] = interpretation
+        return result
+    
+    @staticmethod
+    def load_health_score_weights(weights=None):
+        """
+        Health score weights table, with overrides applied to the defaults
+        
+        Args:
+            weights: None for the defaults; a dict of {component: {parameter: value}}; a
+                DataFrame indexed by component; or a path to a CSV (first column is the
+                component) or JSON file in the dict layout. Every given value replaces the
+                default, and None/NaN (a blank CSV cell) removes a floor or threshold.
+        
+        Returns:
+            DataFrame: One row per component with max_points, intercept, slope, floor, threshold
+        """
+        table = pd.DataFrame.from_dict(DataProcessor.HEALTH_SCORE_WEIGHTS, orient='index').astype(float)
+        if weights is None:
+            return table
+        
+        if isinstance(weights, str):
+            if weights.lower().endswith('.json'):
+                with open(weights) as f:
+                    weights = json.load(f)
+            else:
+                weights = pd.read_csv(weights, index_col=0)
+        if isinstance(weights, pd.DataFrame):
+            weights = {component: row.to_dict() for component, row in weights.iterrows()}
+        
+        unknown = set(weights) - set(table.index)
+        if unknown:
+            raise ValueError(f"Unknown health score components: {sorted(unknown)}")
+        unknown = {parameter for values in weights.values() for parameter in values} - set(table.columns)
+        if unknown:
+            raise ValueError(f"Unknown health score parameters: {sorted(unknown)}")
+        
+        # .loc rather than DataFrame.update, which skips NaN and so could never clear a floor
+        for component, values in weights.items():
+            for parameter, value in values.items():
+                table.loc[component, parameter] = np.nan if value is None else float(value)
+        return table
+    
     @staticmethod
     def _interpret_health_score(score):
         """Interpret the financial health score"""
-        if score >= 80:
-            return "Excellent - Strong financial health"
-        elif score >= 60:
-            return "Good - Solid financial foundation"
-        elif score >= 40:
-            return "Fair - Room for improvement"
-        else:
-            return "Needs Attention - Significant improvements needed"
+        for minimum, label in DataProcessor.HEALTH_SCORE_BANDS:
+            if minimum is None or score >= minimum:
+                return label
     
     @staticmethod
     def create_sample_historical_data(user_data, months=12):
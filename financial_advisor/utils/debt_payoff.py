@@ -0,0 +1,337 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+class DebtPayoffSimulator:
+    """
+    Event-driven debt payoff simulation for snowball, avalanche and custom orderings
+
+    Instead of stepping month by month, the simulator jumps from one payoff event
+    to the next. Between events every debt pays a constant amount, so balances,
+    interest and months-to-payoff follow from the annuity formulas. Debts that are
+    not yet the priority target only ever pay their minimum, so their natural
+    payoff months are computed once up front in a single vectorized pass.
+
+    The monthly budget is the sum of all minimum payments plus the extra payment.
+    The priority target receives whatever the other open debts do not need, so
+    minimums freed by paid-off debts roll forward to the next target. Any surplus
+    in the month a debt is cleared is not redistributed within that month.
+    """
+
+    METHODS = ('snowball', 'avalanche', 'custom')
+
+    @staticmethod
+    def simulate(debts, extra_payment=0, method='snowball', order=None):
+        """
+        Simulate a debt payoff plan
+
+        Args:
+            debts (list): List of dictionaries with 'name', 'balance', 'interest_rate', 'min_payment'
+            extra_payment (float): Additional monthly payment
+            method (str): 'snowball' (smallest balance first), 'avalanche' (highest
+                interest first) or 'custom' (the sequence of names given in order)
+            order (list): Debt names in payoff priority, required for 'custom'
+
+        Returns:
+            dict: Debt payoff plan
+
+        Raises:
+            ValueError: If the method is unknown, or the payments can never clear the debts
+        """
+        if method not in DebtPayoffSimulator.METHODS:
+            raise ValueError(f"Unsupported method: {method}")
+
+        names = [debt['name'] for debt in debts]
+        balance = np.array([debt['balance'] for debt in debts], dtype=float)
+        rate = np.array([debt['interest_rate'] for debt in debts], dtype=float) / 100 / 12
+        min_payment = np.array([debt['min_payment'] for debt in debts], dtype=float)
+
+        priority = DebtPayoffSimulator.priority_order(names, balance, rate, method, order)
+        names = [names[i] for i in priority]
+        balance, rate, min_payment = balance[priority], rate[priority], min_payment[priority]
+
+        non_amortizing = [names[i] for i in np.flatnonzero((balance > 0) & (min_payment <= balance * rate))]
+
+        payoff_month, interest = DebtPayoffSimulator._run(balance, rate, min_payment, extra_payment)
+        if payoff_month is None:
+            raise ValueError(
+                f"Payments never clear the debts; minimum payments do not cover interest for: {non_amortizing}"
+            )
+
+        paid = np.flatnonzero(balance > 0)
+        payoff_plan = [
+            {'debt': names[i], 'payoff_month': int(payoff_month[i]), 'total_interest': float(interest[i])}
+            for i in paid[np.argsort(payoff_month[paid], kind='stable')]
+        ]
+
+        return {
+            'total_months': int(payoff_month.max()) if len(payoff_month) else 0,
+            'total_interest_paid': float(interest.sum()),
+            'payoff_plan': payoff_plan,
+            'method_used': method,
+            'non_amortizing': non_amortizing
+        }
+
+    @staticmethod
+    def compare_strategies_batch(debt_table, methods=('snowball', 'avalanche'), extra_payment=0,
+                                 chunk_size=5000, max_workers=None):
+        """
+        Run every payoff method for many users, sharded across worker processes
+
+        Args:
+            debt_table (DataFrame): One row per debt with 'user_id', 'name', 'balance',
+                'interest_rate' and 'min_payment'. An 'extra_payment' column (read from
+                each user's first row) overrides extra_payment, and a 'priority'
+                column (lowest first) drives the 'custom' method.
+            methods (tuple): Methods to run for every user
+            extra_payment (float): Additional monthly payment per user
+            chunk_size (int): Users per shard sent to a worker
+            max_workers (int): Worker processes (None uses one per CPU); 1 runs
+                everything in this process
+
+        Returns:
+            dict: 'totals' DataFrame (user_id, method, total_months, total_interest_paid,
+                cleared) and 'payoffs' DataFrame (user_id, method, debt, payoff_month,
+                total_interest). Rows are ordered by user and method regardless of
+                the number of workers.
+        """
+        for method in methods:
+            if method not in DebtPayoffSimulator.METHODS:
+                raise ValueError(f"Unsupported method: {method}")
+        if 'custom' in methods and 'priority' not in debt_table:
+            raise ValueError("The 'custom' method needs a 'priority' column")
+
+        table = debt_table.sort_values('user_id', kind='stable')
+        user_ids = table['user_id'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, user_ids[1:] != user_ids[:-1]]) if len(table) else np.array([], int)
+        bounds = np.r_[starts, len(table)]
+
+        columns = {
+            'balance': table['balance'].to_numpy(dtype=float),
+            'rate': table['interest_rate'].to_numpy(dtype=float) / 100 / 12,
+            'min_payment': table['min_payment'].to_numpy(dtype=float),
+            'extra_payment': (table['extra_payment'].to_numpy(dtype=float) if 'extra_payment' in table
+                              else np.full(len(table), float(extra_payment))),
+            'priority': table['priority'].to_numpy(dtype=float) if 'priority' in table else np.zeros(len(table))
+        }
+
+        shards = []
+        for first in range(0, len(starts), chunk_size):
+            last = min(first + chunk_size, len(starts))
+            rows = slice(bounds[first], bounds[last])
+            shards.append(({key: values[rows] for key, values in columns.items()},
+                           bounds[first:last + 1] - bounds[first], tuple(methods)))
+
+        if max_workers == 1 or len(shards) <= 1:
+            results = [_simulate_shard(shard) for shard in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_simulate_shard, shards))
+
+        user_of_group = user_ids[starts]
+        names = table['name'].to_numpy()
+        totals, payoffs = [], []
+        group_offset = 0
+        for (_, shard_bounds, _), (shard_totals, shard_payoffs) in zip(shards, results):
+            shard_totals['user_id'] = user_of_group[group_offset + shard_totals.pop('group')]
+            shard_payoffs['user_id'] = user_of_group[group_offset + shard_payoffs.pop('group')]
+            shard_payoffs['debt'] = names[bounds[group_offset] + shard_payoffs.pop('row')]
+            totals.append(pd.DataFrame(shard_totals))
+            payoffs.append(pd.DataFrame(shard_payoffs))
+            group_offset += len(shard_bounds) - 1
+
+        total_columns = ['user_id', 'method', 'total_months', 'total_interest_paid', 'cleared']
+        payoff_columns = ['user_id', 'method', 'debt', 'payoff_month', 'total_interest']
+        return {
+            'totals': (pd.concat(totals, ignore_index=True)[total_columns] if totals
+                       else pd.DataFrame(columns=total_columns)),
+            'payoffs': (pd.concat(payoffs, ignore_index=True)[payoff_columns] if payoffs
+                        else pd.DataFrame(columns=payoff_columns))
+        }
+
+    @staticmethod
+    def priority_order(names, balance, rate, method, order=None):
+        """Positions of the debts in payoff priority for the given method"""
+        if method == 'snowball':
+            return np.argsort(balance, kind='stable')
+        if method == 'avalanche':
+            return np.argsort(-rate, kind='stable')
+
+        if order is None:
+            raise ValueError("The 'custom' method needs an order of debt names")
+        position = {name: i for i, name in enumerate(names)}
+        missing = [name for name in position if name not in order]
+        unknown = [name for name in order if name not in position]
+        repeated = sorted({name for name in order if list(order).count(name) > 1})
+        if missing or unknown or repeated:
+            raise ValueError(f"Custom order must list every debt exactly once "
+                             f"(missing: {missing}, unknown: {unknown}, repeated: {repeated})")
+        return np.array([position[name] for name in order], dtype=np.int64)
+
+    @staticmethod
+    def months_to_payoff(balance, monthly_rate, payment):
+        """
+        Months needed to clear each balance under a constant payment
+
+        Works element-wise on arrays; returns inf where the payment does not cover
+        the interest and 0 where there is nothing left to pay.
+        """
+        balance, monthly_rate, payment = np.broadcast_arrays(
+            np.asarray(balance, dtype=float), np.asarray(monthly_rate, dtype=float),
+            np.asarray(payment, dtype=float)
+        )
+        months = np.full(balance.shape, np.inf)
+
+        simple = (monthly_rate == 0) & (payment > 0)
+        months[simple] = balance[simple] / payment[simple]
+
+        amortizing = (monthly_rate > 0) & (payment > balance * monthly_rate)
+        months[amortizing] = -np.log1p(-balance[amortizing] * monthly_rate[amortizing] / payment[amortizing]) / \
+            np.log1p(monthly_rate[amortizing])
+
+        months = np.where(np.isfinite(months), np.maximum(np.ceil(months - 1e-9), 1), np.inf)
+        return np.where(balance > 0, months, 0)
+
+    @staticmethod
+    def _balance_after(balance, monthly_rate, payment, months):
+        """Balance left after paying a constant amount for a number of months"""
+        if monthly_rate == 0:
+            return balance - payment * months
+        growth = (1 + monthly_rate) ** months
+        return balance * growth - payment * (growth - 1) / monthly_rate
+
+    @staticmethod
+    def _months_to_payoff(balance, monthly_rate, payment):
+        """Scalar version of months_to_payoff for the event loop"""
+        if balance <= 0:
+            return 0
+        if monthly_rate == 0:
+            return max(math.ceil(balance / payment - 1e-9), 1) if payment > 0 else math.inf
+        if payment <= balance * monthly_rate:
+            return math.inf
+        months = -math.log1p(-balance * monthly_rate / payment) / math.log1p(monthly_rate)
+        return max(math.ceil(months - 1e-9), 1)
+
+    @staticmethod
+    def _interest_until_payoff(balance, monthly_rate, payment, months):
+        """Interest paid while a balance is cleared in the given number of months"""
+        before_last = DebtPayoffSimulator._balance_after(balance, monthly_rate, payment, months - 1)
+        return payment * (months - 1) - (balance - before_last) + before_last * monthly_rate
+
+    @staticmethod
+    def _run(balance, rate, min_payment, extra_payment):
+        """
+        Core event loop over debts already sorted in priority order
+
+        Returns:
+            tuple: (payoff month per debt, interest per debt), or (None, None)
+                if the debts can never be cleared
+        """
+        count = len(balance)
+        budget = min_payment.sum() + extra_payment
+        payoff_month = np.zeros(count, dtype=np.int64)
+        interest = np.zeros(count)
+
+        # Natural payoff months when paying only the minimum
+        natural = DebtPayoffSimulator.months_to_payoff(balance, rate, min_payment)
+        natural_order = [i for i in np.argsort(natural, kind='stable') if np.isfinite(natural[i]) and balance[i] > 0]
+        open_debt = balance > 0
+        committed = float(min_payment[open_debt].sum())
+        cursor = 0
+        month = 0
+
+        for target in range(count):
+            if not open_debt[target] and balance[target] <= 0:
+                continue
+            if not open_debt[target]:
+                # Cleared on minimum payments before it ever became the target
+                months = int(natural[target])
+                payoff_month[target] = months
+                interest[target] = DebtPayoffSimulator._interest_until_payoff(
+                    balance[target], rate[target], min_payment[target], months
+                )
+                continue
+
+            open_debt[target] = False
+            committed -= min_payment[target]
+            r = rate[target]
+            start_balance = DebtPayoffSimulator._balance_after(balance[target], r, min_payment[target], month)
+            target_interest = min_payment[target] * month - (balance[target] - start_balance)
+            current = start_balance
+
+            while True:
+                while cursor < len(natural_order) and (
+                        natural[natural_order[cursor]] <= month or not open_debt[natural_order[cursor]]):
+                    if open_debt[natural_order[cursor]]:
+                        open_debt[natural_order[cursor]] = False
+                        committed -= min_payment[natural_order[cursor]]
+                    cursor += 1
+                next_event = natural[natural_order[cursor]] if cursor < len(natural_order) else math.inf
+
+                payment = budget - committed
+                months = DebtPayoffSimulator._months_to_payoff(current, r, payment)
+                if month + months <= next_event:
+                    if math.isinf(months):
+                        return None, None
+                    target_interest += DebtPayoffSimulator._interest_until_payoff(current, r, payment, months)
+                    month += months
+                    break
+
+                # A lower-priority debt clears first and frees its minimum payment
+                step = int(next_event) - month
+                after = DebtPayoffSimulator._balance_after(current, r, payment, step)
+                target_interest += payment * step - (current - after)
+                current = after
+                month = int(next_event)
+
+            payoff_month[target] = month
+            interest[target] = target_interest
+
+        return payoff_month, interest
+
+
+def _simulate_shard(shard):
+    """Worker entry point: simulate every method for a shard of users"""
+    columns, bounds, methods = shard
+    totals = {'group': [], 'method': [], 'total_months': [], 'total_interest_paid': [], 'cleared': []}
+    payoffs = {'group': [], 'method': [], 'row': [], 'payoff_month': [], 'total_interest': []}
+
+    for group in range(len(bounds) - 1):
+        rows = slice(bounds[group], bounds[group + 1])
+        balance, rate, min_payment = columns['balance'][rows], columns['rate'][rows], columns['min_payment'][rows]
+        extra_payment = columns['extra_payment'][bounds[group]]
+
+        for method in methods:
+            if method == 'custom':
+                priority = np.argsort(columns['priority'][rows], kind='stable')
+            else:
+                priority = DebtPayoffSimulator.priority_order(None, balance, rate, method)
+            payoff_month, interest = DebtPayoffSimulator._run(
+                balance[priority], rate[priority], min_payment[priority], extra_payment
+            )
+
+            totals['group'].append(group)
+            totals['method'].append(method)
+            if payoff_month is None:
+                totals['total_months'].append(-1)
+                totals['total_interest_paid'].append(np.nan)
+                totals['cleared'].append(False)
+                continue
+            totals['total_months'].append(int(payoff_month.max()) if len(payoff_month) else 0)
+            totals['total_interest_paid'].append(float(interest.sum()))
+            totals['cleared'].append(True)
+
+            paid = np.flatnonzero(balance[priority] > 0)
+            for i in paid[np.argsort(payoff_month[paid], kind='stable')]:
+                payoffs['group'].append(group)
+                payoffs['method'].append(method)
+                payoffs['row'].append(bounds[group] + priority[i])
+                payoffs['payoff_month'].append(int(payoff_month[i]))
+                payoffs['total_interest'].append(float(interest[i]))
+
+    return ({key: np.asarray(values) if key in ('group', 'row') else values for key, values in totals.items()},
+            {key: np.asarray(values, dtype=np.int64) if key in ('group', 'row') else values
+             for key, values in payoffs.items()})
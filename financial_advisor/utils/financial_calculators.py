@@ -3,6 +3,10 @@ import pandas as pd
 from datetime import datetime, timedelta
 import math
 
+from .amortization import AmortizationEngine
+from .debt_payoff import DebtPayoffSimulator
+from .retirement_simulation import RetirementMonteCarlo
+
 class FinancialCalculators:
     """
     Comprehensive financial calculators for various scenarios
@@ -31,7 +35,9 @@ class FinancialCalculators:
         future_value_principal = principal * (1 + periodic_rate) ** periods
         
         # Future value of monthly contributions
-        if monthly_contribution > 0:
+        if monthly_contribution > 0 and periodic_rate == 0:
+            future_value_contributions = monthly_contribution * periods
+        elif monthly_contribution > 0:
             future_value_contributions = monthly_contribution * \
                 (((1 + periodic_rate) ** periods - 1) / periodic_rate)
         else:
@@ -48,6 +54,80 @@ class FinancialCalculators:
             'return_multiple': total_future_value / total_contributions if total_contributions > 0 else 0
         }
     
+    @staticmethod
+    def compound_interest_batch(principal, annual_rate=None, years=None, monthly_contribution=0,
+                                compounding_frequency=12):
+        """
+        Vectorized compound interest for many accounts at once
+        
+        Inputs are broadcast against each other, so a scalar rate can be combined
+        with an array of principals. A DataFrame may be passed as the first argument
+        instead, with columns named after the arguments of compound_interest
+        ('monthly_contribution' and 'compounding_frequency' are optional).
+        Results match compound_interest element by element.
+        
+        Args:
+            principal (array-like or DataFrame): Initial investment amounts
+            annual_rate (array-like): Annual interest rates in percentage (required
+                unless a DataFrame is passed)
+            years (array-like): Investment periods in years (required unless a
+                DataFrame is passed)
+            monthly_contribution (array-like): Monthly contribution amounts
+            compounding_frequency (array-like): Number of times interest compounds per year
+        
+        Returns:
+            dict: Arrays for 'future_value', 'total_contributions', 'total_interest'
+                and 'return_multiple' (a DataFrame with the same index when a
+                DataFrame was passed)
+        """
+        frame = principal if isinstance(principal, pd.DataFrame) else None
+        if frame is not None:
+            principal = frame['principal'].to_numpy()
+            annual_rate = frame['annual_rate'].to_numpy()
+            years = frame['years'].to_numpy()
+            if 'monthly_contribution' in frame:
+                monthly_contribution = frame['monthly_contribution'].to_numpy()
+            if 'compounding_frequency' in frame:
+                compounding_frequency = frame['compounding_frequency'].to_numpy()
+        elif annual_rate is None or years is None:
+            raise TypeError("annual_rate and years are required unless a DataFrame is passed")
+        
+        principal, annual_rate, years, monthly_contribution, compounding_frequency = np.broadcast_arrays(
+            *(np.asarray(value, dtype=float) for value in
+              (principal, annual_rate, years, monthly_contribution, compounding_frequency))
+        )
+        
+        rate_decimal = annual_rate / 100
+        periods = years * compounding_frequency
+        periodic_rate = rate_decimal / compounding_frequency
+        growth = (1 + periodic_rate) ** periods
+        
+        future_value_principal = principal * growth
+        
+        # Zero-rate accounts fall back to the plain sum of contributions
+        annuity_factor = np.divide(growth - 1, periodic_rate,
+                                   out=np.array(periods, dtype=float), where=periodic_rate != 0)
+        future_value_contributions = np.where(monthly_contribution > 0,
+                                              monthly_contribution * annuity_factor, 0.0)
+        
+        total_future_value = future_value_principal + future_value_contributions
+        total_contributions = principal + (monthly_contribution * periods)
+        total_interest = total_future_value - total_contributions
+        return_multiple = np.divide(total_future_value, total_contributions,
+                                    out=np.zeros_like(total_future_value),
+                                    where=total_contributions > 0)
+        
+        results = {
+            'future_value': total_future_value,
+            'total_contributions': total_contributions,
+            'total_interest': total_interest,
+            'return_multiple': return_multiple
+        }
+        
+        if frame is not None:
+            return pd.DataFrame(results, index=frame.index)
+        return results
+    
     @staticmethod
     def sip_calculator(monthly_investment, years, expected_return):
         """
@@ -106,6 +186,39 @@ class FinancialCalculators:
             'interest_percentage': (total_interest / loan_amount) * 100
         }
     
+    @staticmethod
+    def amortization_schedule(loan_amount, annual_interest_rate, loan_tenure_years, prepayments=None,
+                              rate_resets=None, moratorium_months=0):
+        """
+        Month-by-month amortization schedule for a single loan
+        
+        Args:
+            loan_amount (float): Principal loan amount
+            annual_interest_rate (float): Annual interest rate in percentage
+            loan_tenure_years (int): Loan tenure in years (excluding moratorium)
+            prepayments (dict): Extra principal paid, keyed by month number
+            rate_resets (dict): New annual rate in percentage, keyed by the month it takes effect
+            moratorium_months (int): Initial months without EMI; interest is capitalized
+        
+        Returns:
+            DataFrame: One row per month with opening balance, interest, principal,
+                prepayment, payment and closing balance
+        """
+        horizon = moratorium_months + loan_tenure_years * 12
+        
+        rates = np.full(horizon, float(annual_interest_rate))
+        for month, new_rate in sorted((rate_resets or {}).items()):
+            rates[month - 1:] = new_rate
+        
+        extra = np.zeros(horizon)
+        for month, amount in (prepayments or {}).items():
+            extra[month - 1] += amount
+        
+        schedule = AmortizationEngine.build_schedule(
+            [loan_amount], rates[None, :], loan_tenure_years * 12, moratorium_months, extra[None, :]
+        )
+        return AmortizationEngine.to_frame(schedule)
+    
     @staticmethod
     def inflation_adjustment(amount, years, inflation_rate=6):
         """
@@ -176,6 +289,27 @@ class FinancialCalculators:
             'retirement_years': retirement_years
         }
     
+    @staticmethod
+    def retirement_monte_carlo(current_age, retirement_age, current_savings, monthly_contribution,
+                               expected_return, inflation_rate, retirement_expenses, simulations=10000,
+                               seed=None, **kwargs):
+        """
+        Stochastic counterpart of retirement_calculator
+        
+        Returns and inflation are drawn per year and life expectancy comes from a
+        mortality table instead of a fixed age of 90. Extra keyword arguments
+        (volatilities, correlation, mortality_table, chunk_size, ...) are passed to
+        RetirementMonteCarlo.simulate.
+        
+        Returns:
+            dict: Probability of success, corpus percentile bands by age and the
+                depletion-age distribution
+        """
+        return RetirementMonteCarlo.simulate(
+            current_age, retirement_age, current_savings, monthly_contribution, expected_return,
+            inflation_rate, retirement_expenses, simulations=simulations, seed=seed, **kwargs
+        )
+    
     @staticmethod
     def goal_planning_calculator(goal_amount, current_savings, timeline_years, expected_return=8):
         """
@@ -198,10 +332,10 @@ class FinancialCalculators:
         # Additional amount needed
         additional_needed = max(0, goal_amount - future_value_current)
         
-        # Monthly savings required
+        # Monthly savings required to accumulate the additional amount (sinking fund)
         if additional_needed > 0:
             monthly_savings = FinancialCalculators.pmt(
-                expected_return/100/12, timeline_years*12, additional_needed
+                expected_return/100/12, timeline_years*12, 0, additional_needed
             )
         else:
             monthly_savings = 0
@@ -228,59 +362,42 @@ class FinancialCalculators:
         return -pmt
     
     @staticmethod
-    def debt_snowball_calculator(debts, extra_payment=0, method='snowball'):
+    def debt_snowball_calculator(debts, extra_payment=0, method='snowball', order=None):
         """
         Calculate debt payoff strategy using snowball or avalanche method
         
+        Minimum payments freed by paid-off debts roll forward to the next debt in
+        priority. See DebtPayoffSimulator for the event-driven engine.
+        
         Args:
             debts (list): List of dictionaries with 'name', 'balance', 'interest_rate', 'min_payment'
             extra_payment (float): Additional monthly payment
-            method (str): 'snowball' (smallest balance first) or 'avalanche' (highest interest first)
+            method (str): 'snowball' (smallest balance first), 'avalanche' (highest interest first)
+                or 'custom' (the names given in order)
+            order (list): Debt names in payoff priority, used by the 'custom' method
         
         Returns:
             dict: Debt payoff plan
         """
-        debts_copy = [debt.copy() for debt in debts]
-        
-        if method == 'snowball':
-            debts_copy.sort(key=lambda x: x['balance'])
-        else:  # avalanche
-            debts_copy.sort(key=lambda x: x['interest_rate'], reverse=True)
-        
-        total_interest_paid = 0
-        months_to_payoff = 0
-        payoff_plan = []
-        
-        while any(debt['balance'] > 0 for debt in debts_copy):
-            months_to_payoff += 1
-            monthly_extra = extra_payment
-            
-            for debt in debts_copy:
-                if debt['balance'] <= 0:
-                    continue
-                
-                # Calculate interest for the month
-                monthly_interest = debt['balance'] * (debt['interest_rate'] / 100 / 12)
-                total_interest_paid += monthly_interest
-                
-                # Total payment for this debt
-                total_payment = debt['min_payment'] + monthly_extra
-                monthly_extra = 0  # Use extra payment only for first debt in priority
-                
-                # Apply payment to debt
-                principal_payment = min(total_payment - monthly_interest, debt['balance'])
-                debt['balance'] -= principal_payment
-                
-                if debt['balance'] <= 0 and debt not in [p['debt'] for p in payoff_plan]:
-                    payoff_plan.append({
-                        'debt': debt['name'],
-                        'payoff_month': months_to_payoff,
-                        'total_interest': monthly_interest
-                    })
+        return DebtPayoffSimulator.simulate(debts, extra_payment, method, order)
+    
+    @staticmethod
+    def debt_strategy_batch(debt_table, methods=('snowball', 'avalanche'), extra_payment=0,
+                            chunk_size=5000, max_workers=None):
+        """
+        Compare debt payoff methods for many users at once
         
-        return {
-            'total_months': months_to_payoff,
-            'total_interest_paid': total_interest_paid,
-            'payoff_plan': payoff_plan,
-            'method_used': method
-        }
\ No newline at end of file
+        Args:
+            debt_table (DataFrame): One row per debt keyed by 'user_id', with the same
+                fields debt_snowball_calculator takes
+            methods (tuple): Methods to run for every user
+            extra_payment (float): Additional monthly payment per user
+            chunk_size (int): Users per worker shard
+            max_workers (int): Worker processes
+        
+        Returns:
+            dict: Per-user 'totals' and per-debt 'payoffs' DataFrames
+        """
+        return DebtPayoffSimulator.compare_strategies_batch(
+            debt_table, methods, extra_payment, chunk_size, max_workers
+        )
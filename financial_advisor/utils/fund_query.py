@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class FundQueryIndex:
+    """
+    Prebuilt indexes for filtering, sorting and paging the fund universe
+
+    Categorical columns get an inverted index (value -> sorted row positions)
+    and numeric columns get their rows pre-sorted in both directions. A query
+    ORs the posting lists of each filter's values, ANDs the filters together
+    as one boolean row mask, narrows range filters with a binary search on the
+    sorted values, and walks a pre-sorted order to pick the page. Only the rows
+    of the requested page are ever taken from the DataFrame.
+    """
+
+    def __init__(self, fund_data, categorical_columns=('Category', 'Risk Level'),
+                 numeric_columns=('6M Return', '1Y Return', '3Y CAGR', '5Y CAGR', 'Expense Ratio')):
+        """
+        Args:
+            fund_data (DataFrame): Fund universe (indexed as of construction; rebuild after changes)
+            categorical_columns (iterable): Columns supporting equality / IN filters
+            numeric_columns (iterable): Columns supporting range filters and sorting
+        """
+        self.fund_data = fund_data
+        positions = np.arange(len(fund_data))
+
+        self.inverted = {}
+        for column in categorical_columns:
+            codes, values = fund_data[column].factorize(sort=True)
+            # Missing cells (code -1) match no value, as with an isin() mask
+            present = np.flatnonzero(codes >= 0)
+            order = present[np.argsort(codes[present], kind='stable')]
+            boundaries = np.searchsorted(codes[order], np.arange(1, len(values)))
+            self.inverted[column] = dict(zip(values, np.split(order, boundaries)))
+
+        self.ascending = {}
+        self.descending = {}
+        self.sorted_values = {}
+        for column in numeric_columns:
+            values = fund_data[column].to_numpy(dtype=float)
+            # NaNs sort last in both directions; ties keep row order
+            self.ascending[column] = np.lexsort((positions, values))
+            self.descending[column] = np.lexsort((positions, -values))
+            self.sorted_values[column] = values[self.ascending[column]]
+
+    def values(self, column):
+        """Distinct values of a categorical column, sorted"""
+        return list(self.inverted[column])
+
+    def query(self, filters=None, ranges=None, sort_by=None, ascending=True,
+              offset=0, limit=50, columns=None):
+        """
+        Filter, sort and page the fund universe
+
+        Args:
+            filters (dict): Categorical column -> value or list of values (IN)
+            ranges (dict): Numeric column -> (low, high); either bound may be None, both inclusive
+            sort_by (str): Numeric column to sort by; row order when None
+            ascending (bool): Sort direction
+            offset (int): Rows to skip
+            limit (int): Maximum rows to return
+            columns (list): Columns of the returned page; all when None
+
+        Returns:
+            tuple: (DataFrame with at most `limit` rows, total number of matching rows)
+        """
+        mask = self._mask(filters or {}, ranges or {})
+        if sort_by is None:
+            matches = np.flatnonzero(mask) if mask is not None else np.arange(len(self.fund_data))
+        else:
+            order = self.ascending[sort_by] if ascending else self.descending[sort_by]
+            matches = order[mask[order]] if mask is not None else order
+
+        rows = self.fund_data.iloc[matches[offset:offset + limit]]
+        return (rows if columns is None else rows[columns]), len(matches)
+
+    def count(self, filters=None, ranges=None):
+        """Number of rows matching the filters"""
+        mask = self._mask(filters or {}, ranges or {})
+        return len(self.fund_data) if mask is None else int(np.count_nonzero(mask))
+
+    def _mask(self, filters, ranges):
+        """Boolean row mask of all filters (None when nothing is filtered)"""
+        mask = None
+        for column, wanted in filters.items():
+            postings = self.inverted[column]
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            selected = np.zeros(len(self.fund_data), dtype=bool)
+            for value in wanted:
+                selected[postings.get(value, [])] = True
+            mask = selected if mask is None else mask & selected
+
+        for column, (low, high) in ranges.items():
+            sorted_values = self.sorted_values[column]
+            start = 0 if low is None else np.searchsorted(sorted_values, low, side='left')
+            stop = np.count_nonzero(~np.isnan(sorted_values)) if high is None else \
+                np.searchsorted(sorted_values, high, side='right')
+            selected = np.zeros(len(self.fund_data), dtype=bool)
+            selected[self.ascending[column][start:stop]] = True
+            mask = selected if mask is None else mask & selected
+        return mask
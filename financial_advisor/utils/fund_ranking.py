@@ -0,0 +1,88 @@
+import numpy as np
+
+
+class FundRankingIndex:
+    """
+    Pre-sorted fund positions for every (risk appetite, return column) pair
+
+    recommend_funds always ranks the same universe by the same score, so the
+    ranking is computed once and a top-k query becomes a slice. Each entry keeps
+    the positions of eligible funds ordered by descending score, ties broken by
+    position (the order DataFrame.nlargest keeps), along with their scores.
+    Changed or appended rows are re-slotted with binary search instead of
+    re-sorting everything.
+    """
+
+    def __init__(self, fund_data, risk_filters, return_columns, score_function):
+        """
+        Args:
+            fund_data (DataFrame): Fund universe
+            risk_filters (dict): Risk appetite -> allowed risk levels
+            return_columns (iterable): Return columns a horizon can rank by
+            score_function (callable): (DataFrame, return column) -> score array
+        """
+        self.risk_filters = dict(risk_filters)
+        self.return_columns = list(return_columns)
+        self.score_function = score_function
+        self._entries = {}
+        self.rebuild(fund_data)
+
+    def rebuild(self, fund_data):
+        """Rank the whole universe from scratch"""
+        self._entries = {}
+        positions = np.arange(len(fund_data))
+        for risk_appetite, allowed in self.risk_filters.items():
+            eligible = fund_data['Risk Level'].isin(allowed).to_numpy()
+            for return_col in self.return_columns:
+                scores = np.asarray(self.score_function(fund_data, return_col), dtype=float)
+                order = np.lexsort((positions[eligible], -scores[eligible]))
+                self._entries[(risk_appetite, return_col)] = (positions[eligible][order], scores[eligible][order])
+
+    def top(self, risk_appetite, return_col, k=5):
+        """Positions and scores of the k best funds; O(k)"""
+        positions, scores = self._entries[(risk_appetite, return_col)]
+        return positions[:k], scores[:k]
+
+    def update(self, fund_data, changed_positions):
+        """
+        Re-rank only the given row positions after fund_data was modified in place
+
+        Positions beyond the previous universe size are treated as appended rows.
+
+        Args:
+            fund_data (DataFrame): Updated fund universe
+            changed_positions (array-like): Row positions whose values changed or were added
+        """
+        changed = np.unique(np.asarray(changed_positions, dtype=np.int64))
+        if len(changed) == 0:
+            return
+        rows = fund_data.iloc[changed]
+
+        for risk_appetite, allowed in self.risk_filters.items():
+            eligible = rows['Risk Level'].isin(allowed).to_numpy()
+            for return_col in self.return_columns:
+                positions, scores = self._entries[(risk_appetite, return_col)]
+                keep = ~np.isin(positions, changed)
+                positions, scores = positions[keep], scores[keep]
+
+                new_positions = changed[eligible]
+                new_scores = np.asarray(self.score_function(rows, return_col), dtype=float)[eligible]
+                slots = self._slots(scores, positions, new_scores, new_positions)
+
+                # Insert in slot order so equal slots keep their (score, position) order
+                order = np.lexsort((new_positions, -new_scores))
+                self._entries[(risk_appetite, return_col)] = (
+                    np.insert(positions, slots[order], new_positions[order]),
+                    np.insert(scores, slots[order], new_scores[order])
+                )
+
+    @staticmethod
+    def _slots(scores, positions, new_scores, new_positions):
+        """Insertion points keeping descending score and ascending position order"""
+        descending = -scores
+        low = np.searchsorted(descending, -new_scores, side='left')
+        high = np.searchsorted(descending, -new_scores, side='right')
+        slots = low.copy()
+        for i in np.flatnonzero(high > low):
+            slots[i] += np.searchsorted(positions[low[i]:high[i]], new_positions[i])
+        return slots
@@ -0,0 +1,102 @@
+import os
+
+import pandas as pd
+
+# pyarrow is optional: without it only CSV universes can be loaded
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class FundUniverseLoader:
+    """
+    Load a fund universe from columnar files with column projection
+
+    Parquet files, Arrow IPC (Feather v2) files and directories of Parquet
+    partitions are read through memory maps, and only the columns the app uses
+    (FUND_COLUMNS) are materialized. Category and Risk Level come back as pandas
+    categoricals, which keeps a 40k-scheme universe small and makes filtering
+    and grouping on them cheap.
+    """
+
+    # Columns read by recommend_funds, get_category_performance and the fund explorer
+    FUND_COLUMNS = ['Fund Name', 'Category', '6M Return', '1Y Return', '3Y CAGR', '5Y CAGR',
+                    'Risk Level', 'Expense Ratio']
+    CATEGORICAL_COLUMNS = ['Category', 'Risk Level']
+
+    PARQUET_SUFFIXES = ('.parquet', '.pq')
+    ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+    @staticmethod
+    def load(path, columns=None):
+        """
+        Load a fund universe file or partition directory
+
+        Args:
+            path (str): Parquet file, Arrow IPC file, directory of Parquet partitions or CSV file
+            columns (list): Columns to load; defaults to FUND_COLUMNS
+
+        Returns:
+            DataFrame: Fund universe with categorical Category/Risk Level columns
+        """
+        columns = list(columns or FundUniverseLoader.FUND_COLUMNS)
+        suffix = os.path.splitext(str(path))[1].lower()
+
+        if suffix == '.csv':
+            categories = {name: 'category' for name in FundUniverseLoader.CATEGORICAL_COLUMNS if name in columns}
+            return pd.read_csv(path, usecols=columns, dtype=categories)[columns]
+
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to load Parquet/Arrow fund universes")
+
+        if os.path.isdir(path):
+            table = ds.dataset(path, format='parquet', partitioning='hive').to_table(columns=columns)
+        elif suffix in FundUniverseLoader.PARQUET_SUFFIXES:
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        elif suffix in FundUniverseLoader.ARROW_SUFFIXES:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        else:
+            raise ValueError(f"Unsupported fund universe format: {path}")
+
+        return FundUniverseLoader._to_pandas(table)
+
+    @staticmethod
+    def save(fund_data, path, partition_by=None):
+        """
+        Write a fund universe as Parquet (optionally partitioned into a directory) or Arrow IPC
+
+        Args:
+            fund_data (DataFrame): Fund universe
+            path (str): Target file, or directory when partition_by is given
+            partition_by (list): Columns to partition a Parquet dataset by
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to write Parquet/Arrow fund universes")
+
+        table = pa.Table.from_pandas(fund_data, preserve_index=False)
+        suffix = os.path.splitext(str(path))[1].lower()
+        if partition_by:
+            pq.write_to_dataset(table, path, partition_cols=partition_by)
+        elif suffix in FundUniverseLoader.ARROW_SUFFIXES:
+            feather.write_feather(table, path, compression='uncompressed')
+        else:
+            pq.write_table(table, path)
+
+    @staticmethod
+    def _to_pandas(table):
+        """Convert to pandas, dictionary-encoding the categorical columns first"""
+        for name in FundUniverseLoader.CATEGORICAL_COLUMNS:
+            if name in table.column_names and not pa.types.is_dictionary(table.schema.field(name).type):
+                table = table.set_column(table.column_names.index(name), name, table[name].dictionary_encode())
+        frame = table.to_pandas()
+        # Sorted categories keep groupby output in the same order as plain strings
+        for name in FundUniverseLoader.CATEGORICAL_COLUMNS:
+            if name in frame:
+                values = frame[name].astype('category')
+                frame[name] = values.cat.set_categories(sorted(values.cat.categories))
+        return frame
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+from .fund_store import FundUniverseLoader
+from .mutual_funds import MutualFundAnalyzer
+
+DATA_VERSION = 'synthetic-v1'
+DEFAULT_SEED = 42
+
+
+class FundUniverseCache:
+    """
+    Process-wide cache of loaded fund universes
+
+    Entries are keyed by (data_version, seed) and hold a ready MutualFundAnalyzer.
+    Streamlit runs every session in the same process, so a module-level instance
+    is shared by all sessions and reruns. Entries expire after ttl_seconds (None
+    keeps them until invalidated).
+    """
+
+    def __init__(self, ttl_seconds=None, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data_version, seed, loader, replaces=None):
+        """
+        Return the cached universe for the key, building it with loader() on a miss
+
+        The lock is held while loading so concurrent sessions build a universe once.
+        When replaces is given, a miss also drops every other entry for the seed whose
+        data version starts with it (e.g. older versions of the same file).
+        """
+        key = (data_version, seed)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry):
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            value = loader()
+            if replaces is not None:
+                for stale in [other for other in self._entries
+                              if other[1] == seed and other[0].startswith(replaces) and other != key]:
+                    del self._entries[stale]
+            self._entries[key] = (value, self.clock())
+            return value
+
+    def invalidate(self, data_version=None, seed=None):
+        """Drop matching entries (all of them when no filter is given); returns the count dropped"""
+        with self._lock:
+            stale = [key for key in self._entries
+                     if (data_version is None or key[0] == data_version) and (seed is None or key[1] == seed)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self):
+        """Hit/miss counters and the keys currently cached"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'keys': list(self._entries)
+            }
+
+    def _expired(self, entry):
+        return self.ttl_seconds is not None and self.clock() - entry[1] > self.ttl_seconds
+
+
+fund_universe_cache = FundUniverseCache()
+
+
+def get_fund_analyzer(seed=DEFAULT_SEED, data_version=DATA_VERSION, loader=None, path=None):
+    """
+    Shared MutualFundAnalyzer for a data version and seed
+
+    Args:
+        seed (int): Seed of the synthetic universe
+        data_version (str): Version tag of the underlying fund data
+        loader (callable): Builds the analyzer on a miss; defaults to the synthetic generator
+        path (str): Fund universe file or partition directory to load instead of
+            synthetic data; its latest modification time becomes part of the data
+            version, and loading a new version drops the older ones for that path
+
+    Returns:
+        MutualFundAnalyzer: Cached analyzer (treat its fund_data as read-only)
+    """
+    replaces = None
+    if path is not None:
+        replaces = f"{os.path.abspath(path)}@"
+        data_version = f"{replaces}{_latest_mtime(path)}"
+        loader = loader or (lambda: MutualFundAnalyzer(fund_data=FundUniverseLoader.load(path)))
+    if loader is None:
+        loader = lambda: MutualFundAnalyzer(seed=seed)
+    return fund_universe_cache.get(data_version, seed, loader, replaces=replaces)
+
+
+def _latest_mtime(path):
+    """
+    Latest modification time of a file, or of a partition directory and everything
+    under it that the Parquet dataset reader picks up (names starting with '.' or
+    '_' are skipped, as pyarrow does). A directory's own mtime only changes when
+    entries are added or removed, not when a partition file is rewritten in place.
+    """
+    latest = os.path.getmtime(path)
+    if os.path.isdir(path):
+        for root, directories, files in os.walk(path):
+            directories[:] = [name for name in directories if not name.startswith(('.', '_'))]
+            for name in directories + [name for name in files if not name.startswith(('.', '_'))]:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return latest
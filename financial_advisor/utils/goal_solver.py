@@ -0,0 +1,150 @@
+import numpy as np
+
+from .financial_calculators import FinancialCalculators
+
+
+class GoalSolver:
+    """
+    Solve the goal planning equation for any one unknown, over arrays of goals
+
+    Goals follow the same model as goal_planning_calculator: current savings
+    compound monthly and a fixed amount is added at the end of every month,
+
+        goal = current * (1 + i)^n + monthly * ((1 + i)^n - 1) / i
+
+    with i the monthly rate and n the number of months. Monthly savings, current
+    savings and the timeline have closed-form inverses; the return is found with
+    a bracketed Newton iteration that falls back to bisection. All inputs are
+    broadcast against each other.
+    """
+
+    UNKNOWNS = ('monthly_savings', 'current_savings', 'timeline_years', 'expected_return')
+
+    @staticmethod
+    def future_value(current_savings, monthly_savings, timeline_years, expected_return):
+        """Projected value of current savings plus monthly savings"""
+        return FinancialCalculators.compound_interest_batch(
+            current_savings, expected_return, timeline_years, monthly_savings
+        )['future_value']
+
+    @staticmethod
+    def solve(unknown, **known):
+        """
+        Solve for one of UNKNOWNS given the other variables and 'goal_amount'
+
+        Example:
+            GoalSolver.solve('timeline_years', goal_amount=goals, current_savings=saved,
+                             monthly_savings=sip, expected_return=12)
+        """
+        if unknown not in GoalSolver.UNKNOWNS:
+            raise ValueError(f"Cannot solve for: {unknown}")
+        solver = getattr(GoalSolver, f'solve_{unknown}')
+        arguments = {name: known[name] for name in ('goal_amount',) + GoalSolver.UNKNOWNS if name != unknown}
+        return solver(**arguments)
+
+    @staticmethod
+    def solve_monthly_savings(goal_amount, current_savings, timeline_years, expected_return=8):
+        """Monthly savings needed to reach the goal (0 when current savings already get there)"""
+        goal, current, years, annual_return = GoalSolver._arrays(
+            goal_amount, current_savings, timeline_years, expected_return
+        )
+        growth, annuity = GoalSolver._factors(annual_return / 1200, years * 12)
+        shortfall = np.maximum(goal - current * growth, 0.0)
+        return np.divide(shortfall, annuity, out=np.full(shortfall.shape, np.nan), where=annuity > 0)
+
+    @staticmethod
+    def solve_current_savings(goal_amount, monthly_savings, timeline_years, expected_return=8):
+        """Lump sum needed today to reach the goal alongside the monthly savings"""
+        goal, monthly, years, annual_return = GoalSolver._arrays(
+            goal_amount, monthly_savings, timeline_years, expected_return
+        )
+        growth, annuity = GoalSolver._factors(annual_return / 1200, years * 12)
+        return np.maximum(goal - monthly * annuity, 0.0) / growth
+
+    @staticmethod
+    def solve_timeline_years(goal_amount, current_savings, monthly_savings, expected_return=8):
+        """
+        Years needed to reach the goal (fractional; NaN when it is never reached)
+
+        Uses the log formula for the number of periods of an annuity.
+        """
+        goal, current, monthly, annual_return = GoalSolver._arrays(
+            goal_amount, current_savings, monthly_savings, expected_return
+        )
+        rate = annual_return / 1200
+        months = np.full(goal.shape, np.nan)
+
+        zero_rate = rate == 0
+        months[zero_rate] = np.divide(goal - current, monthly, out=np.full(goal.shape, np.nan),
+                                      where=monthly > 0)[zero_rate]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            perpetuity = np.where(zero_rate, 0.0, monthly / np.where(zero_rate, 1.0, rate))
+            ratio = (goal + perpetuity) / (current + perpetuity)
+            compounding = np.log(ratio) / np.log1p(rate)
+        reachable = ~zero_rate & (current + perpetuity > 0) & (ratio > 0)
+        months[reachable] = compounding[reachable]
+
+        months = np.where(goal <= current, 0.0, months)
+        months = np.where(np.isfinite(months) & (months >= 0), months, np.nan)
+        return months / 12
+
+    @staticmethod
+    def solve_expected_return(goal_amount, current_savings, monthly_savings, timeline_years,
+                              bounds=(-50.0, 100.0), tolerance=1e-10, max_iterations=100):
+        """
+        Annual return in percentage needed to reach the goal
+
+        Runs a vectorized Newton iteration kept inside a shrinking bracket; any step
+        that would leave the bracket is replaced by bisection. Goals that cannot be
+        reached within bounds return NaN.
+        """
+        goal, current, monthly, years = GoalSolver._arrays(goal_amount, current_savings, monthly_savings,
+                                                           timeline_years)
+        periods = years * 12
+        low = np.full(goal.shape, bounds[0] / 1200)
+        high = np.full(goal.shape, bounds[1] / 1200)
+
+        def excess(rate):
+            growth, annuity = GoalSolver._factors(rate, periods)
+            return current * growth + monthly * annuity - goal
+
+        feasible = (excess(low) <= 0) & (excess(high) >= 0) & (periods > 0)
+        rate = np.where(feasible, 0.005, np.nan)
+        scale = np.maximum(np.abs(goal), 1.0)
+
+        for _ in range(max_iterations):
+            value = excess(rate)
+            if not np.any(np.abs(value[feasible]) > tolerance * scale[feasible]):
+                break
+            low = np.where(value < 0, rate, low)
+            high = np.where(value > 0, rate, high)
+
+            step = value / GoalSolver._derivative(rate, periods, current, monthly)
+            newton = rate - step
+            inside = np.isfinite(newton) & (newton > low) & (newton < high)
+            rate = np.where(feasible, np.where(inside, newton, (low + high) / 2), np.nan)
+
+        return rate * 1200
+
+    @staticmethod
+    def _arrays(*values):
+        return np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in values))
+
+    @staticmethod
+    def _factors(rate, periods):
+        """Growth (1 + i)^n and annuity ((1 + i)^n - 1) / i, with the i = 0 limit"""
+        growth = (1 + rate) ** periods
+        annuity = np.divide(growth - 1, rate, out=np.broadcast_to(periods, growth.shape).astype(float),
+                            where=np.abs(rate) > 1e-12)
+        return growth, annuity
+
+    @staticmethod
+    def _derivative(rate, periods, current, monthly):
+        """Derivative of the projected value with respect to the monthly rate"""
+        growth, annuity = GoalSolver._factors(rate, periods)
+        growth_slope = periods * growth / (1 + rate)
+        annuity_slope = np.divide(growth_slope - annuity, rate,
+                                  out=np.broadcast_to(periods * (periods - 1) / 2, growth.shape).astype(float),
+                                  where=np.abs(rate) > 1e-12)
+        return current * growth_slope + monthly * annuity_slope
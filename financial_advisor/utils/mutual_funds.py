@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from .category_stats import CategoryAggregate
+from .fund_query import FundQueryIndex
+from .fund_ranking import FundRankingIndex
+
+
+class MutualFundAnalyzer:
+    RISK_FILTERS = {
+        'Conservative': ['Low', 'Moderate'],
+        'Moderate': ['Low', 'Moderate', 'Moderately High'],
+        'Aggressive': ['Low', 'Moderate', 'Moderately High', 'High', 'Very High']
+    }
+
+    RETURN_COLUMNS = {
+        '6 months': '6M Return',
+        '1 year': '1Y Return',
+        '3 years': '3Y CAGR',
+        '5 years': '5Y CAGR'
+    }
+
+    def __init__(self, fund_data=None, seed=None, funds_per_category=3):
+        if fund_data is None:
+            fund_data = self.generate_mutual_fund_data(seed, funds_per_category)
+        self.fund_data = fund_data
+        self._ranking_index = None
+        self._category_aggregate = None
+        self._query_index = None
+
+    def generate_mutual_fund_data(self, seed=None, funds_per_category=3):
+        """Comprehensive mutual fund database with historical returns (reproducible for a given seed)"""
+        categories = {
+            'Large Cap': 12,
+            'Mid Cap': 15,
+            'Small Cap': 18,
+            'Flexi Cap': 14,
+            'ELSS': 16,
+            'Sectoral': 20,
+            'Hybrid': 11,
+            'Debt': 8,
+            'Index': 13
+        }
+
+        rng = np.random.default_rng(seed)
+        category = np.repeat(list(categories), funds_per_category)
+        base_return = np.repeat(np.array(list(categories.values()), dtype=float), funds_per_category)
+        fund_number = np.tile(np.arange(1, funds_per_category + 1), len(categories))
+        count = len(category)
+
+        return pd.DataFrame({
+            'Fund Name': [f"{name} Fund {i}" for name, i in zip(category, fund_number)],
+            'Category': category,
+            '6M Return': np.maximum(5, base_return * 0.5 + rng.normal(0, 2, count)),
+            '1Y Return': np.maximum(8, base_return + rng.normal(0, 3, count)),
+            '3Y CAGR': np.maximum(10, base_return + rng.normal(0, 2, count)),
+            '5Y CAGR': np.maximum(12, base_return + rng.normal(0, 1.5, count)),
+            'Risk Level': [self.get_risk_level(name) for name in category],
+            'Expense Ratio': np.round(0.5 + rng.random(count) * 1.5, 2),
+            'Minimum SIP': 500,
+            'Fund Size (Cr)': rng.integers(100, 5000, count)
+        })
+
+    def get_risk_level(self, category):
+        risk_map = {
+            'Large Cap': 'Moderate',
+            'Mid Cap': 'High',
+            'Small Cap': 'Very High',
+            'Flexi Cap': 'Moderately High',
+            'ELSS': 'High',
+            'Sectoral': 'Very High',
+            'Hybrid': 'Moderate',
+            'Debt': 'Low',
+            'Index': 'Moderate'
+        }
+        return risk_map.get(category, 'Moderate')
+
+    @staticmethod
+    def score_funds(funds, return_col):
+        """
+        Recommendation score: horizon return, cost and long-term consistency
+
+        Once NAV analytics have been applied (a 'Sharpe Ratio' column exists), part of
+        the return weight moves to risk-adjusted return.
+        """
+        if 'Sharpe Ratio' not in funds:
+            return (
+                funds[return_col] * 0.6 +
+                (100 - funds['Expense Ratio'] * 10) * 0.2 +
+                (funds['5Y CAGR'] if return_col != '5Y CAGR' else 0) * 0.2
+            )
+
+        return (
+            funds[return_col] * 0.5 +
+            (100 - funds['Expense Ratio'] * 10) * 0.2 +
+            (funds['5Y CAGR'] if return_col != '5Y CAGR' else 0) * 0.2 +
+            funds['Sharpe Ratio'].fillna(0) * 10 * 0.1
+        )
+
+    @property
+    def ranking_index(self):
+        """Per (risk appetite, horizon) ranking, built on first use"""
+        if self._ranking_index is None:
+            # Unknown risk appetites fall back to Moderate-risk funds only
+            risk_filters = {**self.RISK_FILTERS, None: ['Moderate']}
+            self._ranking_index = FundRankingIndex(
+                self.fund_data, risk_filters, self.RETURN_COLUMNS.values(), self.score_funds
+            )
+        return self._ranking_index
+
+    @property
+    def category_aggregate(self):
+        """Per-category return statistics, built on first use"""
+        if self._category_aggregate is None:
+            self._category_aggregate = CategoryAggregate(self.fund_data, self.RETURN_COLUMNS.values())
+        return self._category_aggregate
+
+    @property
+    def query_index(self):
+        """Filter/sort/paging indexes for the fund explorer, built on first use"""
+        if self._query_index is None:
+            self._query_index = FundQueryIndex(self.fund_data)
+        return self._query_index
+
+    def invalidate_derived(self):
+        """Drop the ranking, category and query indexes; they are rebuilt on next use"""
+        self._ranking_index = None
+        self._category_aggregate = None
+        self._query_index = None
+
+    def recommend_positions(self, investment_horizon, risk_appetite, top_k=5):
+        """Row positions and scores of the top_k funds, without materializing any rows"""
+        return_col = self.RETURN_COLUMNS.get(investment_horizon, '3Y CAGR')
+        risk_key = risk_appetite if risk_appetite in self.RISK_FILTERS else None
+        return self.ranking_index.top(risk_key, return_col, top_k)
+
+    def recommend_funds(self, savings_rate, investment_horizon, risk_appetite, top_k=5):
+        positions, scores = self.recommend_positions(investment_horizon, risk_appetite, top_k)
+        recommendations = self.fund_data.iloc[positions].copy()
+        recommendations['Score'] = scores
+        return recommendations
+
+    def update_funds(self, updates):
+        """
+        Apply changed or new fund rows and re-rank only those rows
+
+        Args:
+            updates (DataFrame): Rows indexed like fund_data; unknown index labels are appended
+        """
+        existing = updates.index.isin(self.fund_data.index)
+        if existing.any():
+            changed = updates[existing]
+            self.fund_data.loc[changed.index, changed.columns] = changed
+        if not existing.all():
+            self.fund_data = pd.concat([self.fund_data, updates[~existing]])
+
+        positions = self.fund_data.index.get_indexer(updates.index)
+        if self._ranking_index is not None:
+            self._ranking_index.update(self.fund_data, positions)
+        if self._category_aggregate is not None:
+            self._category_aggregate.update(self.fund_data, positions)
+        # Sorted orders shift with any change, so the explorer index is rebuilt lazily
+        self._query_index = None
+
+    def apply_nav_metrics(self, metrics):
+        """
+        Replace the return columns with NAV-derived analytics and add the risk metrics
+
+        Args:
+            metrics (DataFrame): NAVAnalytics.summary() output, indexed by 'Fund Name'
+        """
+        matched = metrics.reindex(self.fund_data['Fund Name'])
+        matched.index = self.fund_data.index
+        matched = matched[matched.notna().any(axis=1)]
+
+        added = [column for column in matched.columns if column not in self.fund_data]
+        if added:
+            # New columns change every fund's score, so the ranking is rebuilt lazily
+            self.fund_data = self.fund_data.assign(**{column: np.nan for column in added})
+            self.fund_data.loc[matched.index, matched.columns] = matched
+            self.invalidate_derived()
+        else:
+            self.update_funds(matched)
+
+    def get_category_performance(self):
+        return self.category_aggregate.table()
+
+    def get_category_bands(self, percentiles=(25, 50, 75)):
+        """Per-category return percentiles, e.g. '1Y Return P50' for the median"""
+        return self.category_aggregate.bands(percentiles)
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+class NAVAnalytics:
+    """
+    Rolling return and risk analytics over daily NAV histories
+
+    NAVs are held as one 2-D float array of shape (schemes, trading days), with
+    NaN before a scheme's launch or on missing days. Every rolling statistic is
+    a difference of cumulative sums taken `window` columns apart, so all schemes
+    and all dates are computed in a handful of array operations instead of a
+    per-fund rolling().apply. Windows containing a missing return are NaN.
+    """
+
+    # Trailing windows (in trading days) for the fixed return columns used by the app
+    RETURN_WINDOWS = {
+        '6M Return': TRADING_DAYS // 2,
+        '1Y Return': TRADING_DAYS,
+        '3Y CAGR': TRADING_DAYS * 3,
+        '5Y CAGR': TRADING_DAYS * 5
+    }
+
+    def __init__(self, navs, schemes=None, dates=None, benchmark=None, risk_free_rate=6.5):
+        """
+        Args:
+            navs (array-like): NAVs of shape (schemes, days)
+            schemes (list): Scheme names, one per row
+            dates (array-like): Trading dates, one per column
+            benchmark (array-like): Index levels of shape (days,) for beta
+            risk_free_rate (float): Annual risk-free rate in percentage
+        """
+        self.navs = np.asarray(navs, dtype=float)
+        self.schemes = list(schemes) if schemes is not None else list(range(self.navs.shape[0]))
+        self.dates = pd.DatetimeIndex(dates) if dates is not None else None
+        self.benchmark = np.asarray(benchmark, dtype=float) if benchmark is not None else None
+        self.daily_risk_free = (1 + risk_free_rate / 100) ** (1 / TRADING_DAYS) - 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.log_returns = np.diff(np.log(self.navs), axis=1)
+
+    @classmethod
+    def from_long(cls, frame, scheme_col='scheme', date_col='date', nav_col='nav', **kwargs):
+        """Build from a long table of (scheme, date, nav) rows"""
+        wide = frame.pivot(index=scheme_col, columns=date_col, values=nav_col).sort_index(axis=1)
+        return cls(wide.to_numpy(), schemes=wide.index, dates=wide.columns, **kwargs)
+
+    def rolling_cagr(self, years):
+        """Annualized return over every window of `years` years, shape (schemes, days - window)"""
+        window = int(round(years * TRADING_DAYS))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            log_navs = np.log(self.navs)
+        return np.expm1((log_navs[:, window:] - log_navs[:, :-window]) / years)
+
+    def rolling_volatility(self, window=TRADING_DAYS):
+        """Annualized volatility of daily simple returns over every window"""
+        returns = np.expm1(self.log_returns)
+        mean, variance = self._rolling_moments(returns, window)
+        return np.sqrt(variance * TRADING_DAYS)
+
+    def rolling_sharpe(self, window=TRADING_DAYS):
+        """Annualized Sharpe ratio over every window"""
+        excess = np.expm1(self.log_returns) - self.daily_risk_free
+        mean, variance = self._rolling_moments(excess, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return mean / np.sqrt(variance) * np.sqrt(TRADING_DAYS)
+
+    def rolling_sortino(self, window=TRADING_DAYS):
+        """Annualized Sortino ratio (downside deviation below the risk-free rate) over every window"""
+        excess = np.expm1(self.log_returns) - self.daily_risk_free
+        mean = self._rolling_sum(excess, window) / window
+        downside = self._rolling_sum(np.minimum(excess, 0.0) ** 2, window) / window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return mean / np.sqrt(downside) * np.sqrt(TRADING_DAYS)
+
+    def rolling_beta(self, window=TRADING_DAYS):
+        """Beta against the benchmark over every window"""
+        if self.benchmark is None:
+            raise ValueError("A benchmark series is required for beta")
+        returns = np.expm1(self.log_returns)
+        market = np.broadcast_to(np.expm1(np.diff(np.log(self.benchmark))), returns.shape)
+
+        sum_xy = self._rolling_sum(returns * market, window)
+        sum_x = self._rolling_sum(returns, window)
+        sum_y = self._rolling_sum(market, window)
+        sum_yy = self._rolling_sum(market * market, window)
+        covariance = sum_xy - sum_x * sum_y / window
+        variance = sum_yy - sum_y * sum_y / window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return covariance / variance
+
+    def max_drawdown(self, window=None):
+        """
+        Maximum drawdown (negative fraction) over the whole history, or the trailing window days
+
+        The running peak is a np.maximum.accumulate along the date axis for all schemes.
+        """
+        navs = self.navs if window is None else self.navs[:, -window:]
+        filled = np.where(np.isnan(navs), -np.inf, navs)
+        peaks = np.maximum.accumulate(filled, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(np.isfinite(peaks) & ~np.isnan(navs), navs / peaks - 1, np.inf)
+        deepest = drawdown.min(axis=1) if drawdown.shape[1] else np.full(len(navs), np.inf)
+        return np.where(np.isinf(deepest), np.nan, np.minimum(deepest, 0.0))
+
+    def summary(self, window=TRADING_DAYS):
+        """
+        Latest value of every metric, one row per scheme
+
+        Returns:
+            DataFrame: Trailing returns in percentage (the app's return columns), plus
+                'Volatility' and 'Max Drawdown' in percentage, 'Sharpe Ratio',
+                'Sortino Ratio' and 'Beta' (when a benchmark is set)
+        """
+        missing = np.full(len(self.schemes), np.nan)
+        metrics = {}
+        for column, days in self.RETURN_WINDOWS.items():
+            if self.navs.shape[1] > days:
+                metrics[column] = self.trailing_return(self.navs[:, -1], self.navs[:, -1 - days], days)
+            else:
+                metrics[column] = missing
+
+        enough = self.log_returns.shape[1] >= window
+        metrics['Volatility'] = self.rolling_volatility(window)[:, -1] * 100 if enough else missing
+        metrics['Max Drawdown'] = self.max_drawdown(window) * 100
+        metrics['Sharpe Ratio'] = self.rolling_sharpe(window)[:, -1] if enough else missing
+        metrics['Sortino Ratio'] = self.rolling_sortino(window)[:, -1] if enough else missing
+        if self.benchmark is not None:
+            metrics['Beta'] = self.rolling_beta(window)[:, -1] if enough else missing
+
+        return pd.DataFrame(metrics, index=pd.Index(self.schemes, name='Fund Name'))
+
+    @staticmethod
+    def trailing_return(current, base, days):
+        """
+        Return in percentage between NAVs `days` trading days apart
+
+        Periods under a year are quoted as absolute returns, longer ones as CAGR.
+        """
+        years = days / TRADING_DAYS
+        with np.errstate(invalid='ignore', divide='ignore'):
+            annualized = np.expm1((np.log(current) - np.log(base)) / years)
+        return ((1 + annualized) ** years - 1 if years < 1 else annualized) * 100
+
+    @staticmethod
+    def _rolling_sum(values, window):
+        """Sum over every trailing window; NaN where the window has a missing value"""
+        valid = ~np.isnan(values)
+        padding = np.zeros(values.shape[:-1] + (1,))
+        sums = np.concatenate([padding, np.cumsum(np.where(valid, values, 0.0), axis=-1)], axis=-1)
+        counts = np.concatenate([padding, np.cumsum(valid, axis=-1)], axis=-1)
+        window_sums = sums[..., window:] - sums[..., :-window]
+        complete = (counts[..., window:] - counts[..., :-window]) == window
+        return np.where(complete, window_sums, np.nan)
+
+    @staticmethod
+    def _rolling_moments(values, window):
+        """Rolling mean and sample variance from cumulative sums of values and squares"""
+        # Centering on the overall mean keeps the sum-of-squares difference well conditioned
+        center = np.nanmean(values, axis=-1, keepdims=True) if values.size else 0.0
+        shifted = values - center
+        sum_x = NAVAnalytics._rolling_sum(shifted, window)
+        sum_xx = NAVAnalytics._rolling_sum(shifted * shifted, window)
+        mean = sum_x / window
+        variance = np.maximum((sum_xx - sum_x * mean) / (window - 1), 0.0)
+        return mean + center, variance
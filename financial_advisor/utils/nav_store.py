@@ -0,0 +1,259 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .nav_analytics import NAVAnalytics
+
+
+class NAVStore:
+    """
+    Append-only on-disk store of daily scheme NAVs
+
+    Layout of the store directory:
+        manifest.json   Scheme names, trading dates and the list of chunk files
+        chunk-*.npz     Rows of (scheme, day, nav); one file per ingest until compacted
+        tail.npy        Ring buffer of the last TAIL_DAYS trading days, shape (TAIL_DAYS, schemes)
+
+    Schemes and trading days are stored as integer positions into the manifest's
+    scheme and date lists. Ingesting a day writes a new chunk, one row of the
+    memory-mapped tail and the manifest; nothing already on disk is rewritten.
+    The trailing 6M/1Y/3Y/5Y returns only need today's NAV and the NAV a fixed
+    number of trading days back, both of which live in the tail, so they are
+    refreshed in O(schemes) per day instead of recomputed over the full history.
+    The tail is derived data: it is rebuilt from the chunks if missing or stale.
+    """
+
+    MANIFEST = 'manifest.json'
+    TAIL = 'tail.npy'
+    # The longest return window needs today's NAV plus the one 5Y (1260 trading days) back
+    TAIL_DAYS = max(NAVAnalytics.RETURN_WINDOWS.values()) + 1
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Store directory; created with an empty manifest if needed
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        manifest_path = os.path.join(directory, self.MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest:
+                self.manifest = json.load(manifest)
+        else:
+            self.manifest = {'schemes': [], 'dates': [], 'days': 0, 'tail_days': 0, 'chunks': []}
+            self._write_manifest()
+
+        self._scheme_positions = {name: i for i, name in enumerate(self.manifest['schemes'])}
+        self._tail = self._open_tail()
+
+    @property
+    def schemes(self):
+        return self.manifest['schemes']
+
+    @property
+    def dates(self):
+        return pd.DatetimeIndex(self.manifest['dates'])
+
+    def ingest(self, frame, scheme_col='scheme', date_col='date', nav_col='nav'):
+        """
+        Append NAV rows for trading days after the last stored day
+
+        Args:
+            frame (DataFrame): Long table of (scheme, date, nav) rows, e.g. one day's NAV file
+            scheme_col, date_col, nav_col (str): Column names in frame
+
+        Returns:
+            int: Number of rows appended
+        """
+        rows = frame[[scheme_col, date_col, nav_col]].dropna()
+        rows = rows.drop_duplicates([scheme_col, date_col], keep='last')
+        if rows.empty:
+            return 0
+
+        dates = pd.to_datetime(rows[date_col]).dt.normalize()
+        new_dates = pd.DatetimeIndex(np.unique(dates.to_numpy()))
+        if self.manifest['days'] and new_dates[0] <= self.dates[-1]:
+            raise ValueError(
+                f"NAVs for {new_dates[0].date()} are not after the last stored day "
+                f"{self.dates[-1].date()}; the store is append-only"
+            )
+
+        schemes = self._scheme_codes(rows[scheme_col])
+        first_day = self.manifest['days']
+        days = first_day + new_dates.searchsorted(dates.to_numpy()).astype(np.int32)
+        navs = rows[nav_col].to_numpy(dtype=float)
+
+        order = np.lexsort((schemes, days))
+        chunk = self._write_chunk(schemes[order], days[order], navs[order])
+
+        # Mark the tail stale while its rows are overwritten, so a crash mid-update rebuilds it
+        self.manifest['tail_days'] = None
+        self._write_manifest()
+        self._update_tail(schemes[order], days[order], navs[order], first_day, len(new_dates))
+
+        self.manifest['dates'] += [date.strftime('%Y-%m-%d') for date in new_dates]
+        self.manifest['days'] += len(new_dates)
+        self.manifest['tail_days'] = self.manifest['days']
+        self.manifest['chunks'].append(chunk)
+        self._write_manifest()
+        return len(rows)
+
+    def ingest_file(self, path, **columns):
+        """Ingest a daily NAV file (CSV or Parquet)"""
+        if str(path).lower().endswith(('.parquet', '.pq')):
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path)
+        return self.ingest(frame, **columns)
+
+    def metrics(self):
+        """
+        Trailing 6M/1Y/3Y/5Y returns as of the last stored day, read from the tail
+
+        Returns:
+            DataFrame: Return columns in percentage, indexed by 'Fund Name', matching
+                NAVAnalytics.summary() over the full history
+        """
+        schemes = len(self.schemes)
+        last_day = self.manifest['days'] - 1
+        current = self._tail[last_day % self.TAIL_DAYS] if last_day >= 0 else np.full(schemes, np.nan)
+
+        metrics = {}
+        for column, days in NAVAnalytics.RETURN_WINDOWS.items():
+            if last_day >= days:
+                base = self._tail[(last_day - days) % self.TAIL_DAYS]
+                metrics[column] = NAVAnalytics.trailing_return(current, base, days)
+            else:
+                metrics[column] = np.full(schemes, np.nan)
+        return pd.DataFrame(metrics, index=pd.Index(self.schemes, name='Fund Name'))
+
+    def history(self, first_day=0):
+        """
+        Full NAV matrix from the chunk files
+
+        Args:
+            first_day (int): First trading-day position to load
+
+        Returns:
+            ndarray: NAVs of shape (schemes, days - first_day), NaN where a scheme has no NAV
+        """
+        navs = np.full((len(self.schemes), self.manifest['days'] - first_day), np.nan)
+        for chunk in self.manifest['chunks']:
+            if chunk['last_day'] < first_day:
+                continue
+            schemes, days, values = self._read_chunk(chunk)
+            keep = days >= first_day
+            navs[schemes[keep], days[keep] - first_day] = values[keep]
+        return navs
+
+    def analytics(self, **kwargs):
+        """NAVAnalytics over the full stored history (the full-recompute path)"""
+        return NAVAnalytics(self.history(), schemes=self.schemes, dates=self.dates, **kwargs)
+
+    def compact(self, target_days=252):
+        """
+        Merge runs of small chunks into chunks of up to target_days trading days
+
+        The new chunks are written and the manifest swapped before the old files are
+        removed, so a crash at any point leaves a readable store (at worst with
+        orphaned chunk files that the manifest no longer references).
+
+        Returns:
+            int: Number of chunk files removed
+        """
+        groups, current = [], []
+        for chunk in self.manifest['chunks']:
+            if current and chunk['last_day'] - current[0]['first_day'] >= target_days:
+                groups.append(current)
+                current = []
+            current.append(chunk)
+        if current:
+            groups.append(current)
+
+        chunks, replaced = [], []
+        for group in groups:
+            if len(group) == 1:
+                chunks.append(group[0])
+                continue
+            parts = [self._read_chunk(chunk) for chunk in group]
+            chunks.append(self._write_chunk(*(np.concatenate(column) for column in zip(*parts))))
+            replaced += [chunk['file'] for chunk in group]
+
+        if not replaced:
+            return 0
+        self.manifest['chunks'] = chunks
+        self._write_manifest()
+        for name in replaced:
+            os.remove(os.path.join(self.directory, name))
+        return len(replaced)
+
+    def _scheme_codes(self, names):
+        """Positions of the given scheme names, registering unseen schemes"""
+        added = [name for name in pd.unique(names) if name not in self._scheme_positions]
+        if added:
+            for name in added:
+                self._scheme_positions[name] = len(self.manifest['schemes'])
+                self.manifest['schemes'].append(name)
+            self._tail = self._resize_tail(len(self.manifest['schemes']))
+        return names.map(self._scheme_positions).to_numpy(dtype=np.int32)
+
+    def _write_chunk(self, schemes, days, navs):
+        name = f"chunk-{int(days.min()):06d}-{int(days.max()):06d}.npz"
+        np.savez(os.path.join(self.directory, name), scheme=schemes, day=days, nav=navs)
+        return {'file': name, 'first_day': int(days.min()), 'last_day': int(days.max()), 'rows': len(navs)}
+
+    def _read_chunk(self, chunk):
+        with np.load(os.path.join(self.directory, chunk['file'])) as data:
+            return data['scheme'], data['day'], data['nav']
+
+    def _write_manifest(self):
+        # Write-then-rename so readers never see a half-written manifest
+        path = os.path.join(self.directory, self.MANIFEST)
+        with open(path + '.tmp', 'w') as manifest:
+            json.dump(self.manifest, manifest)
+        os.replace(path + '.tmp', path)
+
+    def _update_tail(self, schemes, days, navs, first_day, day_count):
+        """Overwrite the ring-buffer rows of the new days (only the last TAIL_DAYS of them matter)"""
+        start = max(first_day, first_day + day_count - self.TAIL_DAYS)
+        for day in range(start, first_day + day_count):
+            self._tail[day % self.TAIL_DAYS] = np.nan
+        keep = days >= start
+        self._tail[days[keep] % self.TAIL_DAYS, schemes[keep]] = navs[keep]
+        self._tail.flush()
+
+    def _open_tail(self):
+        """Memory-map the tail, rebuilding it from the chunks if it is missing or stale"""
+        path = os.path.join(self.directory, self.TAIL)
+        shape = (self.TAIL_DAYS, len(self.schemes))
+        if os.path.exists(path):
+            tail = np.load(path, mmap_mode='r+')
+            if tail.shape == shape and self.manifest.get('tail_days') == self.manifest['days']:
+                return tail
+            del tail
+
+        self.manifest['tail_days'] = None
+
+        tail = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=shape)
+        tail[:] = np.nan
+        first_day = max(0, self.manifest['days'] - self.TAIL_DAYS)
+        recent = self.history(first_day)
+        tail[np.arange(first_day, self.manifest['days']) % self.TAIL_DAYS] = recent.T
+        tail.flush()
+
+        self.manifest['tail_days'] = self.manifest['days']
+        self._write_manifest()
+        return tail
+
+    def _resize_tail(self, schemes):
+        """Grow the tail to more scheme columns (new schemes have no history)"""
+        path = os.path.join(self.directory, self.TAIL)
+        previous = np.array(self._tail)
+        del self._tail
+        tail = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=(self.TAIL_DAYS, schemes))
+        tail[:] = np.nan
+        tail[:, :previous.shape[1]] = previous
+        return tail
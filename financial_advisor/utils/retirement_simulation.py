@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+
+class RetirementMonteCarlo:
+    """
+    Stochastic retirement planning with correlated returns, inflation and longevity
+
+    Each path steps through the years from the current age with an annual return
+    and an annual inflation rate drawn from a correlated bivariate normal, and a
+    death age drawn from a mortality table. Contributions are added until
+    retirement; afterwards the inflated expenses are withdrawn at the start of each
+    year. A path succeeds if the corpus lasts as long as the person does.
+
+    Paths are simulated in chunks and folded into fixed-size accumulators (success
+    counts, per-age log-spaced corpus histograms and a depletion-age histogram),
+    so memory depends on chunk_size rather than the number of simulations.
+    Percentile bands are read from the histograms and are accurate to a fraction
+    of one bin width.
+    """
+
+    @staticmethod
+    def gompertz_mortality_table(max_age=110, modal_age=86, dispersion=9.5):
+        """
+        Annual death probabilities q_x for ages 0..max_age from a Gompertz law
+
+        Args:
+            max_age (int): Last age in the table; q_x is 1 at this age
+            modal_age (float): Age with the highest number of deaths
+            dispersion (float): Spread of deaths around the modal age in years
+
+        Returns:
+            ndarray: q_x indexed by age
+        """
+        ages = np.arange(max_age + 1)
+        cumulative_hazard = np.exp((ages - modal_age) / dispersion)
+        q = 1 - np.exp(-cumulative_hazard * (np.exp(1 / dispersion) - 1))
+        q[-1] = 1.0
+        return q
+
+    @staticmethod
+    def sample_death_ages(rng, current_age, size, mortality_table):
+        """Draw ages at death for people alive at current_age"""
+        q = np.asarray(mortality_table, dtype=float)[current_age:]
+        # Dying during the year at age current_age + k has probability S[k-1] * q[k]
+        cumulative_death = 1 - np.cumprod(1 - q)
+        return current_age + np.searchsorted(cumulative_death, rng.random(size), side='right')
+
+    @staticmethod
+    def simulate(current_age, retirement_age, current_savings, monthly_contribution, expected_return,
+                 inflation_rate, retirement_expenses, return_volatility=15, inflation_volatility=2,
+                 correlation=-0.2, mortality_table=None, simulations=10000, chunk_size=50000, seed=None,
+                 percentiles=(5, 25, 50, 75, 95), bins_per_decade=50):
+        """
+        Monte Carlo retirement simulation
+
+        Args:
+            current_age (int): Current age
+            retirement_age (int): Planned retirement age
+            current_savings (float): Current retirement savings
+            monthly_contribution (float): Monthly retirement contribution until retirement
+            expected_return (float): Mean annual return in percentage
+            inflation_rate (float): Mean annual inflation in percentage
+            retirement_expenses (float): Monthly expenses in retirement (today's value)
+            return_volatility (float): Standard deviation of annual returns in percentage
+            inflation_volatility (float): Standard deviation of annual inflation in percentage
+            correlation (float): Correlation between annual returns and inflation
+            mortality_table (array-like): Annual death probabilities indexed by age;
+                defaults to gompertz_mortality_table()
+            simulations (int): Number of paths
+            chunk_size (int): Paths simulated at a time
+            seed (int): Seed for reproducible results (for a given chunk_size)
+            percentiles (tuple): Corpus percentile bands to report
+            bins_per_decade (int): Histogram resolution used for the percentile bands
+
+        Returns:
+            dict: Probability of success, corpus percentile bands by age and the
+                depletion-age distribution
+        """
+        if mortality_table is None:
+            mortality_table = RetirementMonteCarlo.gompertz_mortality_table()
+        mortality_table = np.asarray(mortality_table, dtype=float)
+        max_age = len(mortality_table) - 1
+        ages = np.arange(current_age, max_age + 1)
+        years = len(ages)
+
+        mean = np.array([expected_return, inflation_rate]) / 100
+        scale = np.array([return_volatility, inflation_volatility]) / 100
+        cholesky = np.linalg.cholesky(np.array([[1.0, correlation], [correlation, 1.0]]))
+
+        # Depleted paths land in [0, 1); the rest in log-spaced bins from 1e3 to 1e13
+        edges = np.concatenate([[0.0, 1.0], np.logspace(3, 13, 10 * bins_per_decade + 1)])
+        bin_count = len(edges) - 1
+        corpus_histogram = np.zeros((years, bin_count), dtype=np.int64)
+        depletion_counts = np.zeros(years, dtype=np.int64)
+        death_counts = np.zeros(years, dtype=np.int64)
+        successes = 0
+
+        chunk_seeds = np.random.SeedSequence(seed).spawn(max(1, -(-simulations // chunk_size)))
+        for chunk, chunk_seed in enumerate(chunk_seeds):
+            size = min(chunk_size, simulations - chunk * chunk_size)
+            rng = np.random.default_rng(chunk_seed)
+
+            death_age = RetirementMonteCarlo.sample_death_ages(rng, current_age, size, mortality_table)
+            death_counts += np.bincount(death_age - current_age, minlength=years)
+
+            corpus = np.full(size, float(current_savings))
+            price_level = np.ones(size)
+            depleted_at = np.full(size, -1)
+
+            for year, age in enumerate(ages):
+                shocks = rng.standard_normal((size, 2)) @ cholesky.T
+                annual_return = np.maximum(mean[0] + scale[0] * shocks[:, 0], -0.99)
+                inflation = mean[1] + scale[1] * shocks[:, 1]
+
+                alive = age <= death_age
+                if age < retirement_age:
+                    corpus = corpus * (1 + annual_return) + monthly_contribution * 12
+                else:
+                    withdrawal = retirement_expenses * 12 * price_level
+                    newly_depleted = alive & (depleted_at < 0) & (corpus < withdrawal)
+                    depleted_at[newly_depleted] = age
+                    corpus = np.maximum(corpus - withdrawal, 0.0) * (1 + annual_return)
+                price_level = price_level * (1 + inflation)
+
+                bins = np.clip(np.searchsorted(edges, corpus[alive], side='right') - 1, 0, bin_count - 1)
+                corpus_histogram[year] += np.bincount(bins, minlength=bin_count)
+
+            depleted = depleted_at >= 0
+            successes += int(size - depleted.sum())
+            depletion_counts += np.bincount(depleted_at[depleted] - current_age, minlength=years)
+
+        bands = RetirementMonteCarlo._histogram_percentiles(corpus_histogram, edges, percentiles)
+        alive_paths = corpus_histogram.sum(axis=1)
+
+        return {
+            'simulations': simulations,
+            'probability_of_success': successes / simulations,
+            'corpus_percentiles': pd.DataFrame(
+                {f'p{p}': bands[:, i] for i, p in enumerate(percentiles)}, index=pd.Index(ages, name='age')
+            )[alive_paths > 0],
+            'depletion_age_distribution': pd.Series(
+                depletion_counts / simulations, index=pd.Index(ages, name='age')
+            )[depletion_counts > 0],
+            'median_death_age': float(ages[min(np.searchsorted(np.cumsum(death_counts), simulations / 2),
+                                               years - 1)]),
+            'survival_to_retirement': float(death_counts[max(0, retirement_age - current_age):].sum()
+                                            / simulations)
+        }
+
+    @staticmethod
+    def _histogram_percentiles(histogram, edges, percentiles):
+        """
+        Percentiles per row of a histogram, interpolating linearly inside each bin
+
+        The first bin [0, 1) holds depleted paths, whose corpus is exactly 0, so
+        percentiles falling in it are 0 rather than interpolated.
+        """
+        cumulative = np.cumsum(histogram, axis=1)
+        totals = cumulative[:, -1:]
+        results = np.zeros((histogram.shape[0], len(percentiles)))
+
+        for i, p in enumerate(percentiles):
+            target = totals[:, 0] * p / 100
+            position = np.minimum((cumulative < target[:, None]).sum(axis=1), histogram.shape[1] - 1)
+            rows = np.arange(histogram.shape[0])
+            below = np.where(position > 0, cumulative[rows, np.maximum(position - 1, 0)], 0)
+            in_bin = histogram[rows, position]
+            fraction = np.divide(target - below, in_bin, out=np.zeros(len(rows)), where=in_bin > 0)
+            interpolated = edges[position] + fraction * (edges[position + 1] - edges[position])
+            results[:, i] = np.where(position == 0, edges[0], interpolated)
+
+        return results
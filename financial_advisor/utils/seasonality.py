@@ -0,0 +1,218 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+PERIOD = 12
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+class SeasonalDecomposition:
+    """
+    Classical moving-average seasonal decomposition of many monthly series
+
+    Series are held as one 2-D float array of shape (users, months), NaN for
+    missing months. The trend is the centred 2x12 moving average (NaN for the
+    first and last six months), the seasonal index of a calendar month is the
+    mean detrended value in that month (normalized to average 1, or 0 for the
+    additive model), and the residual is what is left.
+
+    Seasonality is tested per user with a one-way ANOVA of the detrended values
+    grouped by calendar month (F-test); its strength is the share of detrended
+    variance explained by the calendar-month means. Users are processed in row
+    blocks, so memory stays bounded for millions of users.
+    """
+
+    def __init__(self, values, users=None, start=None, model='multiplicative', block_rows=100_000):
+        """
+        Args:
+            values (array-like): Monthly values of shape (users, months)
+            users (list): User ids, one per row
+            start: First month (anything pd.Period accepts); column 0 is a January when None
+            model (str): 'multiplicative' (indices average 1) or 'additive' (indices average 0)
+            block_rows (int): Users per processing block
+        """
+        if model not in ('multiplicative', 'additive'):
+            raise ValueError(f"Unknown seasonal model: {model}")
+
+        self.values = np.asarray(values, dtype=float)
+        self.users = list(users) if users is not None else list(range(self.values.shape[0]))
+        self.start = pd.Period(start, freq='M') if start is not None else None
+        self.model = model
+        self.block_rows = block_rows
+
+        first_month = self.start.month - 1 if self.start is not None else 0
+        self.calendar = (first_month + np.arange(self.values.shape[1])) % PERIOD
+        self._indices = None
+        self._statistics = None
+
+    @classmethod
+    def from_long(cls, frame, user_col='user_id', date_col='date', value_col='total_expenses', **kwargs):
+        """Build from (user, date, value) rows, e.g. TransactionAggregator.monthly_frame().reset_index()"""
+        months = pd.to_datetime(frame[date_col]).dt.to_period('M')
+        wide = frame.assign(**{date_col: months}).pivot_table(
+            index=user_col, columns=date_col, values=value_col, aggfunc='sum'
+        )
+        wide = wide.reindex(columns=pd.period_range(months.min(), months.max(), freq='M'))
+        return cls(wide.to_numpy(), users=wide.index, start=months.min(), **kwargs)
+
+    @classmethod
+    def from_records(cls, historical_data, value='total_expenses', **kwargs):
+        """Build for one user from the monthly records detect_spending_patterns takes"""
+        frame = pd.DataFrame(historical_data).assign(user_id=0)
+        return cls.from_long(frame, value_col=value, **kwargs)
+
+    def trend(self):
+        """Centred 2x12 moving average, shape (users, months)"""
+        return self._moving_average(self.values)
+
+    def seasonal_indices(self):
+        """Seasonal index per user and calendar month, shape (users, 12), January first"""
+        self._decompose()
+        return self._indices
+
+    def seasonal_for(self, months):
+        """
+        Seasonal indices for arbitrary months, e.g. the months being forecast
+
+        Args:
+            months (array-like): Calendar months 1-12
+
+        Returns:
+            ndarray: Shape (users, len(months))
+        """
+        return self.seasonal_indices()[:, np.asarray(months) - 1]
+
+    def seasonal(self):
+        """Seasonal component aligned with the input, shape (users, months)"""
+        return self.seasonal_indices()[:, self.calendar]
+
+    def residual(self):
+        """Remainder after removing trend and seasonal component, shape (users, months)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.model == 'multiplicative':
+                return self.values / (self.trend() * self.seasonal())
+            return self.values - self.trend() - self.seasonal()
+
+    def significance(self, alpha=0.05):
+        """
+        Seasonality test per user
+
+        Returns:
+            DataFrame: strength, f_statistic, p_value and significant (p_value < alpha),
+                NaN/False where there are fewer than two detrended values per calendar month
+        """
+        self._decompose()
+        strength, f_statistic, p_value = self._statistics
+        return pd.DataFrame({
+            'strength': strength,
+            'f_statistic': f_statistic,
+            'p_value': p_value,
+            'significant': p_value < alpha
+        }, index=pd.Index(self.users, name='user'))
+
+    def summary(self, alpha=0.05):
+        """Seasonal indices (one column per calendar month) alongside the significance test"""
+        indices = pd.DataFrame(self.seasonal_indices(), columns=MONTH_NAMES, index=pd.Index(self.users, name='user'))
+        return pd.concat([indices, self.significance(alpha)], axis=1)
+
+    def _decompose(self):
+        if self._indices is not None:
+            return
+
+        rows = self.values.shape[0]
+        self._indices = np.full((rows, PERIOD), np.nan)
+        self._statistics = np.full((3, rows), np.nan)
+        for start in range(0, rows, self.block_rows):
+            block = slice(start, start + self.block_rows)
+            self._indices[block], self._statistics[:, block] = self._decompose_block(self.values[block])
+
+    def _decompose_block(self, values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend = self._moving_average(values)
+            detrended = values / trend if self.model == 'multiplicative' else values - trend
+            valid = ~np.isnan(detrended)
+            detrended_zero = np.where(valid, detrended, 0.0)
+
+            sums = np.zeros((len(values), PERIOD))
+            counts = np.zeros((len(values), PERIOD))
+            for month in range(PERIOD):
+                columns = self.calendar == month
+                sums[:, month] = detrended_zero[:, columns].sum(axis=1)
+                counts[:, month] = valid[:, columns].sum(axis=1)
+            means = sums / counts
+
+            center = np.nansum(means, axis=1, keepdims=True) / (counts > 0).sum(axis=1, keepdims=True)
+            indices = means / center if self.model == 'multiplicative' else means - center
+
+            # One-way ANOVA of the detrended values by calendar month
+            observed = (counts > 0).sum(axis=1)
+            total = counts.sum(axis=1)
+            grand = sums.sum(axis=1) / total
+            between = np.nansum(counts * (means - grand[:, None]) ** 2, axis=1)
+            within = np.where(valid, detrended_zero - np.nan_to_num(means)[:, self.calendar], 0.0)
+            within = (within ** 2).sum(axis=1)
+            df_between, df_within = observed - 1, total - observed
+            testable = (observed >= 2) & (total >= 2 * observed)
+            f_statistic = np.where(testable, (between / df_between) / (within / df_within), np.nan)
+            p_value = np.where(testable, self._f_survival(f_statistic, df_between, df_within), np.nan)
+
+            # Strength: share of detrended variance explained by the seasonal means
+            total_ss = within + between
+            strength = np.where(testable, np.maximum(0.0, 1 - within / total_ss), np.nan)
+
+        return indices, (strength, f_statistic, p_value)
+
+    @staticmethod
+    def _moving_average(values):
+        """Centred 2x12 moving average; NaN where the 13-month window is incomplete"""
+        months = values.shape[1]
+        trend = np.full(values.shape, np.nan)
+        if months <= PERIOD:
+            return trend
+
+        missing = np.isnan(values)
+        zero = np.concatenate([np.zeros((len(values), 1)), np.where(missing, 0.0, values).cumsum(axis=1)], axis=1)
+        gaps = np.concatenate([np.zeros((len(values), 1)), missing.cumsum(axis=1)], axis=1)
+
+        # Window t-6..t+6 with half weights on both ends = mean of the two 12-month sums around t
+        half = PERIOD // 2
+        sums = zero[:, PERIOD:] - zero[:, :-PERIOD]
+        gap_counts = gaps[:, PERIOD + 1:] - gaps[:, :-PERIOD - 1]
+        centred = (sums[:, :-1] + sums[:, 1:]) / (2 * PERIOD)
+        trend[:, half:months - half] = np.where(gap_counts > 0, np.nan, centred)
+        return trend
+
+    @staticmethod
+    def _f_survival(f_statistic, df1, df2, iterations=300):
+        """P(F > f) for the F distribution, via the regularized incomplete beta function"""
+        f_statistic, df1, df2 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (f_statistic, df1, df2)))
+        x = df2 / (df2 + df1 * f_statistic)
+        a, b = df2 / 2, df1 / 2
+
+        # Continued fraction converges fast for x < (a + 1) / (a + b + 2); use symmetry otherwise
+        swap = x > (a + 1) / (a + b + 2)
+        a, b, x = np.where(swap, b, a), np.where(swap, a, b), np.where(swap, 1 - x, x)
+
+        lgamma = np.frompyfunc(lambda v: math.lgamma(v) if v > 0 else np.nan, 1, 1)
+        log_front = np.asarray(lgamma(a + b) - lgamma(a) - lgamma(b), dtype=float) + a * np.log(x) + b * np.log1p(-x)
+
+        tiny = 1e-300
+        c = np.ones_like(x)
+        d = 1 - (a + b) * x / (a + 1)
+        d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+        fraction = d.copy()
+        for m in range(1, iterations + 1):
+            for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                              -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+                d = 1 + numerator * d
+                d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+                c = 1 + numerator / c
+                c = np.where(np.abs(c) < tiny, tiny, c)
+                step = c * d
+                fraction *= step
+            if np.nanmax(np.abs(step - 1), initial=0.0) < 1e-12:
+                break
+
+        incomplete = np.exp(log_front) * fraction / a
+        return np.where(swap, 1 - incomplete, incomplete)
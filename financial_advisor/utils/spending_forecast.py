@@ -0,0 +1,238 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .seasonality import PERIOD
+
+
+class SpendingForecaster:
+    """
+    Next-month spend forecasts for many user x category series
+
+    Series are held as one 2-D float array of shape (series, months), NaN for
+    months before a user's history starts. Three light models are fitted to all
+    series at once with array operations:
+
+    - ses: simple exponential smoothing, alpha from SES_ALPHAS
+    - seasonal_naive: the value twelve months earlier
+    - linear_trend: OLS line over the history, as in DataProcessor._analyze_category_trends
+
+    Each model's one-step forecasts are backtested at rolling origins over the
+    last `backtest_months` months, and every series keeps the model with the
+    lowest mean absolute error. Prediction intervals use the RMSE of that
+    model's backtest errors, widened with the horizon. Series are processed in
+    row chunks, optionally spread over a process pool.
+
+    When seasonal indices are given (e.g. SeasonalDecomposition.seasonal_indices()),
+    ses and linear_trend run on seasonally adjusted values and the forecasts are
+    re-seasonalized.
+    """
+
+    SES_ALPHAS = (0.1, 0.3, 0.5, 0.8)
+
+    def __init__(self, values, series=None, start=None, seasonal_indices=None, backtest_months=12,
+                 level=0.8, chunk_rows=250_000):
+        """
+        Args:
+            values (array-like): Monthly spend of shape (series, months)
+            series (list or Index): Series labels, one per row (e.g. (user, category) tuples)
+            start: First month (anything pd.Period accepts); column 0 is a January when None
+            seasonal_indices (array-like): Multiplicative indices of shape (series, 12), January first
+            backtest_months (int): Rolling origins used for model selection and intervals
+            level (float): Prediction interval coverage
+            chunk_rows (int): Series per processing chunk
+        """
+        self.values = np.asarray(values, dtype=float)
+        self.series = series if series is not None else pd.RangeIndex(self.values.shape[0])
+        self.start = pd.Period(start, freq='M') if start is not None else None
+        self.seasonal_indices = np.asarray(seasonal_indices, dtype=float) if seasonal_indices is not None else None
+        self.backtest_months = backtest_months
+        self.level = level
+        self.chunk_rows = chunk_rows
+
+        first_month = self.start.month - 1 if self.start is not None else 0
+        self.calendar = (first_month + np.arange(self.values.shape[1])) % PERIOD
+        self.candidates = [('ses', alpha) for alpha in self.SES_ALPHAS] + [('seasonal_naive', np.nan),
+                                                                            ('linear_trend', np.nan)]
+
+    @classmethod
+    def from_long(cls, frame, user_col='user_id', date_col='date', category_col='category',
+                  amount_col='amount', **kwargs):
+        """
+        Build one series per (user, expense category) from long-format rows
+
+        Amounts are summed per calendar month. A category missing in a month the user
+        has other rows for counts as 0; months before or after the user's history are NaN.
+        Category 'income' and derived 'total_expenses'/'savings' rows are skipped.
+        """
+        months = pd.to_datetime(frame[date_col]).dt.to_period('M')
+        spans = months.groupby(frame[user_col]).agg(['min', 'max'])
+        expenses = ~frame[category_col].isin(['income', 'total_expenses', 'savings'])
+
+        wide = frame[expenses].assign(**{date_col: months[expenses]}).pivot_table(
+            index=[user_col, category_col], columns=date_col, values=amount_col, aggfunc='sum', fill_value=0.0
+        )
+        columns = pd.period_range(months.min(), months.max(), freq='M')
+        wide = wide.reindex(columns=columns, fill_value=0.0)
+
+        users = wide.index.get_level_values(0)
+        first = spans['min'].reindex(users).to_numpy()
+        last = spans['max'].reindex(users).to_numpy()
+        outside = (columns.to_numpy()[None, :] < first[:, None]) | (columns.to_numpy()[None, :] > last[:, None])
+        values = np.where(outside, np.nan, wide.to_numpy(dtype=float))
+        return cls(values, series=wide.index, start=months.min(), **kwargs)
+
+    def forecast(self, horizon=1, workers=1):
+        """
+        Forecast the next `horizon` months of every series
+
+        Args:
+            horizon (int): Months ahead
+            workers (int): Processes to spread the chunks over (1 = in-process)
+
+        Returns:
+            DataFrame: Indexed by series, with the chosen model, its SES alpha (NaN for
+                other models), backtest_mae, and forecast_k / lower_k / upper_k for
+                k = 1..horizon. Forecasts and lower bounds are floored at 0. Series
+                with too little history for any model get a NaN model and forecast.
+        """
+        bounds = [(start, min(start + self.chunk_rows, len(self.values)))
+                  for start in range(0, len(self.values), self.chunk_rows)]
+        settings = (self.calendar, self.backtest_months, self.level, self.candidates, horizon)
+        columns = ['model', 'alpha', 'backtest_mae'] + [f'{key}_{step + 1}' for step in range(horizon)
+                                                         for key in ('forecast', 'lower', 'upper')]
+        if not bounds:
+            return pd.DataFrame(columns=columns, index=self.series)
+
+        if workers > 1 and len(bounds) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Submit lazily so at most two chunks per worker are pickled and in flight
+                pending, parts = {}, [None] * len(bounds)
+                chunks = iter(enumerate(bounds))
+                for index, (start, stop) in islice(chunks, 2 * workers):
+                    pending[pool.submit(_forecast_chunk, *self._chunk(start, stop), *settings)] = index
+                while pending:
+                    future = next(iter(pending))
+                    parts[pending.pop(future)] = future.result()
+                    for index, (start, stop) in islice(chunks, 1):
+                        pending[pool.submit(_forecast_chunk, *self._chunk(start, stop), *settings)] = index
+        else:
+            parts = [_forecast_chunk(*self._chunk(start, stop), *settings) for start, stop in bounds]
+
+        names = list(dict.fromkeys(name for name, _ in self.candidates))
+        codes = np.array([names.index(name) for name, _ in self.candidates] + [-1])
+        alphas = np.array([alpha for _, alpha in self.candidates] + [np.nan])
+        choice = np.concatenate([part['choice'] for part in parts])
+        result = {
+            'model': pd.Categorical.from_codes(codes[choice], categories=names),
+            'alpha': alphas[choice],
+            'backtest_mae': np.concatenate([part['mae'] for part in parts])
+        }
+        for key in ('forecast', 'lower', 'upper'):
+            stacked = np.concatenate([part[key] for part in parts])
+            for step in range(horizon):
+                result[f'{key}_{step + 1}'] = stacked[:, step]
+
+        return pd.DataFrame(result, index=self.series)[columns]
+
+    def _chunk(self, start, stop):
+        seasonal = self.seasonal_indices[start:stop] if self.seasonal_indices is not None else None
+        return self.values[start:stop], seasonal
+
+
+def _forecast_chunk(values, seasonal_indices, calendar, backtest_months, level, candidates, horizon):
+    """Backtest, select and forecast one chunk of series (module level so pool workers can pickle it)"""
+    rows, months = values.shape
+    future_calendar = (calendar[-1] + 1 + np.arange(horizon)) % PERIOD if months else np.arange(horizon) % PERIOD
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if seasonal_indices is not None:
+            factors, future_factors = seasonal_indices[:, calendar], seasonal_indices[:, future_calendar]
+            adjusted = values / factors
+        else:
+            factors, future_factors, adjusted = 1.0, np.ones((1, horizon)), values
+
+        # One-step forecasts at every origin (column t forecasts month t from months < t) and the
+        # final forecasts, per candidate
+        one_step, final, growth = [], [], []
+        for name, alpha in candidates:
+            if name == 'ses':
+                predictions, level_now = _ses(adjusted, alpha)
+                one_step.append(predictions * factors)
+                final.append(level_now[:, None] * future_factors)
+                growth.append(1 + np.arange(horizon) * alpha ** 2)
+            elif name == 'seasonal_naive':
+                predictions = np.full(values.shape, np.nan)
+                predictions[:, PERIOD:] = values[:, :-PERIOD]
+                one_step.append(predictions)
+                lags = months - PERIOD + np.arange(horizon) % PERIOD
+                final.append(values[:, lags] if months >= PERIOD else np.full((rows, horizon), np.nan))
+                growth.append(1 + np.arange(horizon) // PERIOD)
+            else:
+                predictions, intercept, slope = _linear_trend(adjusted)
+                one_step.append(predictions * factors)
+                final.append((intercept[:, None] + slope[:, None] * (months + np.arange(horizon))) * future_factors)
+                growth.append(np.ones(horizon))
+
+        # Rolling-origin backtest over the last backtest_months months
+        window = slice(max(months - backtest_months, 1), months)
+        needed = max(1, (window.stop - window.start) // 2)
+        errors = np.stack([values[:, window] - predictions[:, window] for predictions in one_step])
+        counts = (~np.isnan(errors)).sum(axis=2)
+        mae = np.where(counts >= needed, np.nansum(np.abs(errors), axis=2) / counts, np.inf)
+        rmse = np.sqrt(np.nansum(errors ** 2, axis=2) / counts)
+
+        choice = np.argmin(mae, axis=0)
+        picked = np.arange(rows)
+        forecast = np.stack(final)[choice, picked]
+        sigma = rmse[choice, picked][:, None] * np.sqrt(np.stack(growth)[choice])
+        best_mae = mae[choice, picked]
+        unfit = np.isinf(best_mae)
+        forecast[unfit] = np.nan
+        best_mae[unfit] = np.nan
+        choice[unfit] = -1
+
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        return {
+            'choice': choice,
+            'mae': best_mae,
+            'forecast': np.maximum(forecast, 0.0),
+            'lower': np.maximum(forecast - z * sigma, 0.0),
+            'upper': forecast + z * sigma
+        }
+
+
+def _ses(values, alpha):
+    """Simple exponential smoothing; missing months keep the previous level"""
+    predictions = np.full(values.shape, np.nan)
+    level = np.full(values.shape[0], np.nan)
+    for month in range(values.shape[1]):
+        predictions[:, month] = level
+        observed = values[:, month]
+        smoothed = np.where(np.isnan(level), observed, alpha * observed + (1 - alpha) * level)
+        level = np.where(np.isnan(observed), level, smoothed)
+    return predictions, level
+
+
+def _linear_trend(values):
+    """Expanding-window OLS forecasts from prefix sums, plus the line fitted to the full history"""
+    valid = ~np.isnan(values)
+    y = np.where(valid, values, 0.0)
+    x = np.arange(values.shape[1], dtype=float)
+
+    def prefix(series):
+        # Sums over months < t for every t, then over the full history
+        cumulative = np.cumsum(series, axis=1)
+        return np.concatenate([np.zeros((len(series), 1)), cumulative], axis=1)
+
+    n, sum_x, sum_xx = prefix(valid.astype(float)), prefix(valid * x), prefix(valid * x ** 2)
+    sum_y, sum_xy = prefix(y), prefix(y * x)
+    denominator = n * sum_xx - sum_x ** 2
+    fitted = (n >= 2) & (denominator > 0)
+    slope = np.where(fitted, (n * sum_xy - sum_x * sum_y) / denominator, np.nan)
+    intercept = (sum_y - slope * sum_x) / n
+
+    predictions = intercept[:, :-1] + slope[:, :-1] * x
+    return predictions, intercept[:, -1], slope[:, -1]
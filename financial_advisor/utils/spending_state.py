@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+from .data_processor import DataProcessor
+from .seasonality import SeasonalDecomposition
+
+# Record fields that are not expense categories (as in DataProcessor._analyze_category_trends)
+NON_CATEGORY_FIELDS = ('date', 'income', 'total_expenses', 'savings')
+
+
+class SpendingPatternState:
+    """
+    Incremental form of DataProcessor.detect_spending_patterns for one user
+
+    Keeps only what the detectors need: first and last income/expenses (lifestyle
+    creep), per-calendar-month sums and counts of total expenses (seasonality),
+    Welford mean and sum of squares of savings (savings consistency), and per
+    category the running mean and co-moment with the month position (OLS slope).
+    The monthly total expenses are kept as well, since from SEASONAL_TEST_MONTHS
+    months seasonality is an F-test on their decomposition. Folding in a month
+    costs O(categories), and patterns() matches a full recompute over the same
+    records to float tolerance.
+
+    Months must arrive in date order. A category missing from a month counts as 0.
+    """
+
+    def __init__(self):
+        self.months = 0
+        self.last_date = None
+        self.first_income = self.first_expenses = np.nan
+        self.last_income = self.last_expenses = np.nan
+        self.calendar_sums = np.zeros(12)
+        self.calendar_counts = np.zeros(12, dtype=np.int64)
+        self.expense_history = []
+        self.savings_mean = 0.0
+        self.savings_m2 = 0.0
+        self.category_means = {}
+        self.category_comoments = {}
+
+    @classmethod
+    def from_records(cls, historical_data):
+        """State after folding in a list of monthly records"""
+        state = cls()
+        for record in historical_data:
+            state.update(record)
+        return state
+
+    def update(self, record):
+        """
+        Fold in the next month
+
+        Args:
+            record (dict): Monthly record with date, income, total_expenses, savings
+                and one value per expense category
+
+        Returns:
+            SpendingPatternState: self
+        """
+        date = pd.Timestamp(record['date'])
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Month {date.date()} is not after the last folded month {self.last_date.date()}")
+
+        income = float(record['income'])
+        expenses = float(record['total_expenses'])
+        savings = float(record['savings'])
+        if self.months == 0:
+            self.first_income, self.first_expenses = income, expenses
+        self.last_income, self.last_expenses = income, expenses
+        self.last_date = date
+
+        self.calendar_sums[date.month - 1] += expenses
+        self.calendar_counts[date.month - 1] += 1
+        self.expense_history.append((date.year * 12 + date.month - 1, expenses))
+
+        # Welford updates; x is the 0-based month position, so its mean is x / 2 after the update
+        x = self.months
+        self.months += 1
+        delta = savings - self.savings_mean
+        self.savings_mean += delta / self.months
+        self.savings_m2 += delta * (savings - self.savings_mean)
+
+        x_delta = x - (x - 1) / 2 if x else 0.0
+        new_categories = [key for key in record if key not in NON_CATEGORY_FIELDS and key not in self.category_means]
+        for category in list(self.category_means) + new_categories:
+            value = float(record.get(category, 0.0))
+            mean = self.category_means.get(category, 0.0)
+            mean += (value - mean) / self.months
+            self.category_means[category] = mean
+            self.category_comoments[category] = self.category_comoments.get(category, 0.0) + x_delta * (value - mean)
+
+        return self
+
+    def patterns(self):
+        """Detected patterns, in the format of DataProcessor.detect_spending_patterns"""
+        if self.months == 0:
+            return {}
+
+        return {
+            'lifestyle_creep': self._lifestyle_creep(),
+            'seasonal_spending': self._seasonal_spending(),
+            'category_trends': self._category_trends(),
+            'savings_consistency': self._savings_consistency()
+        }
+
+    def to_dict(self):
+        """Plain-data form of the state (JSON/msgpack friendly)"""
+        return {
+            'months': self.months,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'first': [self.first_income, self.first_expenses],
+            'last': [self.last_income, self.last_expenses],
+            'calendar_sums': self.calendar_sums.tolist(),
+            'calendar_counts': self.calendar_counts.tolist(),
+            'expense_history': [list(entry) for entry in self.expense_history],
+            'savings': [self.savings_mean, self.savings_m2],
+            'category_means': dict(self.category_means),
+            'category_comoments': dict(self.category_comoments)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a state saved with to_dict"""
+        state = cls()
+        state.months = data['months']
+        state.last_date = pd.Timestamp(data['last_date']) if data['last_date'] is not None else None
+        state.first_income, state.first_expenses = data['first']
+        state.last_income, state.last_expenses = data['last']
+        state.calendar_sums = np.array(data['calendar_sums'], dtype=float)
+        state.calendar_counts = np.array(data['calendar_counts'], dtype=np.int64)
+        state.expense_history = [(int(month), float(value)) for month, value in data.get('expense_history', [])]
+        state.savings_mean, state.savings_m2 = data['savings']
+        state.category_means = dict(data['category_means'])
+        state.category_comoments = dict(data['category_comoments'])
+        return state
+
+    def _lifestyle_creep(self):
+        if self.months < 3:
+            return "Insufficient data for analysis"
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            income_growth = (np.float64(self.last_income) - self.first_income) / np.float64(self.first_income)
+            expense_growth = (np.float64(self.last_expenses) - self.first_expenses) / np.float64(self.first_expenses)
+        return DataProcessor._lifestyle_creep_message(income_growth, expense_growth)
+
+    def _seasonal_spending(self):
+        if self.months < 12:
+            return "Need at least 12 months of data for seasonal analysis"
+
+        # States saved before the history was kept fall back to the calendar-month variation
+        if self.months >= DataProcessor.SEASONAL_TEST_MONTHS and len(self.expense_history) == self.months:
+            months, expenses = np.array(self.expense_history).T
+            first = int(months[0])
+            values = np.full(int(months[-1]) - first + 1, np.nan)
+            values[months.astype(np.int64) - first] = expenses
+            start = pd.Period(year=first // 12, month=first % 12 + 1, freq='M')
+            test = SeasonalDecomposition(values[None, :], start=start).significance().iloc[0]
+            if not np.isnan(test['p_value']):
+                return DataProcessor._seasonal_test_message(test['strength'], test['p_value'])
+
+        observed = self.calendar_counts > 0
+        monthly_avg = self.calendar_sums[observed] / self.calendar_counts[observed]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            seasonal_variation = monthly_avg.std(ddof=1) / monthly_avg.mean()
+        return DataProcessor._seasonal_message(seasonal_variation)
+
+    def _category_trends(self):
+        if self.months < 2:
+            return {}
+
+        # Sum of squared deviations of 0..n-1 from their mean
+        position_m2 = np.float64(self.months * (self.months ** 2 - 1) / 12)
+        return {
+            category: DataProcessor._trend_entry(comoment / position_m2)
+            for category, comoment in self.category_comoments.items()
+        }
+
+    def _savings_consistency(self):
+        if self.months < 3:
+            return "Insufficient data for savings consistency analysis"
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            savings_cv = np.sqrt(np.float64(self.savings_m2) / (self.months - 1)) / np.float64(self.savings_mean)
+        return DataProcessor._savings_consistency_message(savings_cv)
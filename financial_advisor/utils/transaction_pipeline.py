@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional: without it only CSV transaction files can be streamed
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Expense categories of the app's financial profile, in display order
+EXPENSE_CATEGORIES = ['rent_emi', 'groceries', 'transportation', 'utilities', 'entertainment',
+                      'loan_repayments', 'other']
+
+# ISO 18245 merchant category codes -> expense category; unlisted codes count as 'other'.
+# Contractors (1520), brokers (6211) and insurers (6300) are neither housing nor debt
+# service, so they stay unlisted; hotels (7011) count as leisure spend
+MERCHANT_CATEGORIES = {
+    **dict.fromkeys([6513], 'rent_emi'),
+    **dict.fromkeys([5411, 5422, 5441, 5451, 5462, 5499, 5331], 'groceries'),
+    **dict.fromkeys([4111, 4112, 4121, 4131, 4784, 4789, 5541, 5542, 5172, 7523, 4511], 'transportation'),
+    **dict.fromkeys([4814, 4816, 4899, 4900], 'utilities'),
+    **dict.fromkeys([5812, 5813, 5814, 7832, 7841, 7922, 7991, 7996, 7999, 5815, 5816, 4722, 7011],
+                    'entertainment'),
+    **dict.fromkeys([6012, 6051, 6141], 'loan_repayments')
+}
+
+# Transaction types counted as income; everything else is spending
+CREDIT_TYPES = ('CR', 'C', 'CREDIT')
+
+
+def read_transaction_chunks(paths, chunk_rows=1_000_000, columns=None):
+    """
+    Stream transaction files as DataFrame chunks
+
+    Args:
+        paths (str or list): CSV or Parquet files
+        chunk_rows (int): Rows per chunk
+        columns (list): Columns to read; all when None
+
+    Yields:
+        DataFrame: Up to chunk_rows transactions
+    """
+    for path in [paths] if isinstance(paths, (str, os.PathLike)) else paths:
+        if str(path).lower().endswith(('.parquet', '.pq')):
+            if not PYARROW_AVAILABLE:
+                raise ImportError("pyarrow is required to stream Parquet transaction files")
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunk_rows, usecols=columns)
+
+
+class TransactionAggregator:
+    """
+    Fold raw bank/UPI transactions into per-user monthly records
+
+    Each chunk is reduced to (user, month, category) sums, so memory grows with
+    the number of user-months rather than the number of transactions. Partial
+    sums are consolidated every few chunks. The result is the monthly record
+    format detect_spending_patterns expects (and the long format of
+    detect_spending_patterns_bulk).
+    """
+
+    def __init__(self, merchant_categories=None, user_col='user_id', date_col='date',
+                 merchant_col='merchant_code', amount_col='amount', type_col='txn_type',
+                 consolidate_every=8):
+        """
+        Args:
+            merchant_categories (dict): Merchant code -> expense category; defaults to MERCHANT_CATEGORIES
+            user_col, date_col, merchant_col, amount_col (str): Transaction columns
+            type_col (str): Debit/credit column; when absent, negative amounts are credits
+            consolidate_every (int): Chunks between consolidations of the partial sums
+        """
+        self.merchant_categories = MERCHANT_CATEGORIES if merchant_categories is None else merchant_categories
+        self.user_col = user_col
+        self.date_col = date_col
+        self.merchant_col = merchant_col
+        self.amount_col = amount_col
+        self.type_col = type_col
+        self.consolidate_every = consolidate_every
+        self.rows = 0
+
+        # Category code 0 is income, then the expense categories
+        self.categories = ['income'] + EXPENSE_CATEGORIES
+        codes = {name: i for i, name in enumerate(self.categories)}
+        unknown = set(self.merchant_categories.values()) - set(EXPENSE_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown expense categories in merchant map: {sorted(unknown)}")
+
+        numeric = [code for code in self.merchant_categories if isinstance(code, (int, np.integer))]
+        self._code_lookup = np.full(max(numeric, default=0) + 1, codes['other'], dtype=np.int8)
+        for code in numeric:
+            self._code_lookup[code] = codes[self.merchant_categories[code]]
+        self._codes = codes
+        self._partials = []
+
+    def add_chunk(self, chunk):
+        """Fold one chunk of transactions into the running monthly sums"""
+        amounts = chunk[self.amount_col].to_numpy(dtype=float)
+        if self.type_col in chunk:
+            credit = chunk[self.type_col].astype(str).str.upper().isin(CREDIT_TYPES).to_numpy()
+        else:
+            credit = amounts < 0
+
+        categories = np.where(credit, self._codes['income'], self._merchant_codes(chunk[self.merchant_col]))
+        dates = pd.to_datetime(chunk[self.date_col])
+        months = dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1
+
+        sums = pd.DataFrame({
+            'user': chunk[self.user_col].to_numpy(),
+            'month': months,
+            'category': categories,
+            'amount': np.abs(amounts)
+        }).groupby(['user', 'month', 'category'], sort=False)['amount'].sum()
+
+        self._partials.append(sums)
+        self.rows += len(chunk)
+        if len(self._partials) >= self.consolidate_every:
+            self._consolidate()
+
+    def consume(self, chunks):
+        """Fold every chunk of an iterable (e.g. read_transaction_chunks); returns self"""
+        for chunk in chunks:
+            self.add_chunk(chunk)
+        return self
+
+    def monthly_frame(self):
+        """
+        Monthly totals per user
+
+        Returns:
+            DataFrame: Indexed by (user, date = first day of the month), with income,
+                total_expenses, savings and one column per expense category
+        """
+        self._consolidate()
+        if not self._partials:
+            return pd.DataFrame(columns=['income', 'total_expenses', 'savings'] + EXPENSE_CATEGORIES)
+
+        wide = self._partials[0].unstack('category', fill_value=0.0)
+        wide = wide.reindex(columns=range(len(self.categories)), fill_value=0.0).sort_index()
+        wide.columns = self.categories
+
+        total_expenses = 0.0
+        for category in EXPENSE_CATEGORIES:
+            total_expenses = total_expenses + wide[category]
+        frame = pd.DataFrame({
+            'income': wide['income'],
+            'total_expenses': total_expenses,
+            'savings': wide['income'] - total_expenses,
+            **{category: wide[category] for category in EXPENSE_CATEGORIES}
+        })
+
+        months = frame.index.get_level_values('month').to_numpy()
+        dates = pd.to_datetime({'year': months // 12, 'month': months % 12 + 1, 'day': 1})
+        frame.index = pd.MultiIndex.from_arrays([frame.index.get_level_values('user'), dates],
+                                                names=[self.user_col, 'date'])
+        return frame
+
+    def iter_user_records(self):
+        """
+        Yield (user, records) with records in detect_spending_patterns' format
+
+        Each record is {'date', 'income', 'total_expenses', 'savings', <expense categories>},
+        one per month with transactions, in date order.
+        """
+        frame = self.monthly_frame()
+        if frame.empty:
+            return
+        users = frame.index.get_level_values(0)
+        boundaries = np.flatnonzero(users[1:] != users[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(frame)]])
+
+        data = frame.reset_index(level=1)
+        for start, stop in zip(starts, stops):
+            yield users[start], data.iloc[start:stop].to_dict('records')
+
+    def to_long(self):
+        """Monthly totals as (user_id, date, category, amount) rows for detect_spending_patterns_bulk"""
+        frame = self.monthly_frame()[['income'] + EXPENSE_CATEGORIES]
+        if frame.empty:
+            return pd.DataFrame(columns=[self.user_col, 'date', 'category', 'amount'])
+        long = frame.stack().rename('amount').reset_index()
+        return long.rename(columns={long.columns[2]: 'category'})
+
+    def _merchant_codes(self, merchants):
+        if pd.api.types.is_integer_dtype(merchants):
+            values = merchants.to_numpy()
+            in_range = (values >= 0) & (values < len(self._code_lookup))
+            return np.where(in_range, self._code_lookup[np.where(in_range, values, 0)], self._codes['other'])
+        mapped = merchants.map(self.merchant_categories).fillna('other')
+        return mapped.map(self._codes).to_numpy()
+
+    def _consolidate(self):
+        if len(self._partials) > 1:
+            self._partials = [pd.concat(self._partials).groupby(level=[0, 1, 2], sort=False).sum()]
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+
+class XIRREngine:
+    """
+    XIRR over dated cash-flow streams, solved for many folios at once
+
+    Investments are negative amounts, redemptions and the current valuation are
+    positive. For every folio the engine finds the annual rate r with
+
+        sum(amount_k * (1 + r) ** -(days_k / 365)) = 0
+
+    where days_k counts from the folio's first cash flow. All folios iterate
+    together: per-folio sums are np.bincount reductions over the flat flow arrays.
+    Newton's method runs first; folios it cannot settle are retried with bisection
+    on a bracket where the value changes sign, and whatever is still unsolved is
+    reported as not converged.
+    """
+
+    @staticmethod
+    def solve(folio, dates, amounts, guess=0.1, tolerance=1e-9, max_iterations=50,
+              bounds=(-0.9999, 100.0), bisection_iterations=200):
+        """
+        Solve XIRR for every folio
+
+        Args:
+            folio (array-like): Folio identifier per cash flow
+            dates (array-like): Date per cash flow
+            amounts (array-like): Signed amount per cash flow
+            guess (float): Starting annual rate for Newton's method
+            tolerance (float): Convergence tolerance on the rate
+            max_iterations (int): Newton iterations before falling back to bisection
+            bounds (tuple): Annual rate range searched by the bisection fallback
+            bisection_iterations (int): Maximum bisection steps
+
+        Returns:
+            DataFrame: Indexed by folio with 'xirr' (annual %), 'converged' and 'method'
+        """
+        codes, folios = pd.factorize(pd.Series(folio), sort=True)
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+        amounts = np.asarray(amounts, dtype=float)
+        groups = len(folios)
+
+        first_date = np.full(groups, np.datetime64('NaT'), dtype=dates.dtype)
+        order = np.lexsort((dates, codes))
+        starts = order[np.r_[True, codes[order][1:] != codes[order][:-1]]] if len(codes) else order
+        first_date[codes[starts]] = dates[starts]
+        years = (dates - first_date[codes]) / np.timedelta64(1, 'D') / 365.0
+
+        scale = np.bincount(codes, np.abs(amounts), minlength=groups)
+        has_inflow = np.bincount(codes, amounts > 0, minlength=groups) > 0
+        has_outflow = np.bincount(codes, amounts < 0, minlength=groups) > 0
+        solvable = has_inflow & has_outflow
+
+        rate = np.where(solvable, guess, np.nan)
+        converged = np.zeros(groups, dtype=bool)
+        method = np.full(groups, None, dtype=object)
+
+        active = solvable.copy()
+        for _ in range(max_iterations):
+            if not active.any():
+                break
+            flows = np.flatnonzero(active[codes])
+            with np.errstate(over='ignore', invalid='ignore'):
+                value, slope = XIRREngine._npv(rate, codes[flows], years[flows], amounts[flows], groups, True)
+                step = np.divide(value, slope, out=np.full(groups, np.nan), where=active & (slope != 0))
+                updated = rate - step
+
+            diverged = active & (~np.isfinite(updated) | (updated <= -1))
+            done = active & ~diverged & ((np.abs(step) < tolerance) | (np.abs(value) < tolerance * scale))
+            rate = np.where(active & ~diverged, updated, rate)
+            converged |= done
+            active &= ~(done | diverged)
+
+        method[converged] = 'newton'
+
+        retry = solvable & ~converged
+        if retry.any():
+            rate[retry] = np.nan
+            with np.errstate(over='ignore', invalid='ignore'):
+                bisected = XIRREngine._bisect(retry, codes, years, amounts, groups, bounds, tolerance,
+                                              bisection_iterations)
+            rate = np.where(retry, bisected, rate)
+            recovered = retry & np.isfinite(bisected)
+            converged |= recovered
+            method[recovered] = 'bisection'
+
+        return pd.DataFrame({
+            'xirr': np.where(converged, rate * 100, np.nan),
+            'converged': converged,
+            'method': method
+        }, index=pd.Index(folios, name='folio'))
+
+    @staticmethod
+    def non_converged(results):
+        """Folios from a solve() result that have no XIRR"""
+        return results.index[~results['converged']].tolist()
+
+    @staticmethod
+    def _npv(rate, codes, years, amounts, groups, with_slope=False):
+        """Per-folio present value (and its derivative) at the given annual rates"""
+        log_growth = np.log1p(rate)[codes]
+        discounted = amounts * np.exp(-years * log_growth)
+        value = np.bincount(codes, discounted, minlength=groups)
+        if not with_slope:
+            return value
+        slope = np.bincount(codes, -years * discounted, minlength=groups) / (1 + rate)
+        return value, slope
+
+    @staticmethod
+    def _bisect(selected, codes, years, amounts, groups, bounds, tolerance, iterations):
+        """Bisection on [bounds] for the selected folios; NaN where there is no sign change"""
+        flows = np.flatnonzero(selected[codes])
+        codes, years, amounts = codes[flows], years[flows], amounts[flows]
+
+        low = np.where(selected, bounds[0], np.nan)
+        high = np.where(selected, bounds[1], np.nan)
+        low_value = XIRREngine._npv(low, codes, years, amounts, groups)
+        high_value = XIRREngine._npv(high, codes, years, amounts, groups)
+        bracketed = selected & (np.sign(low_value) != np.sign(high_value))
+
+        for _ in range(iterations):
+            if not np.any(high[bracketed] - low[bracketed] > tolerance):
+                break
+            middle = (low + high) / 2
+            middle_value = XIRREngine._npv(middle, codes, years, amounts, groups)
+            same_side = np.sign(middle_value) == np.sign(low_value)
+            low = np.where(same_side, middle, low)
+            low_value = np.where(same_side, middle_value, low_value)
+            high = np.where(same_side, high, middle)
+
+        return np.where(bracketed, (low + high) / 2, np.nan)
+
+    @staticmethod
+    def sip_cash_flows(monthly_investment, start_date, months, step_up_percentage=0, skipped_instalments=(),
+                       redemptions=None, valuation_date=None, current_value=0):
+        """
+        Build the dated cash flows of a SIP history
+
+        Args:
+            monthly_investment (float): Instalment in the first year
+            start_date (str or datetime): Date of the first instalment
+            months (int): Number of scheduled instalments
+            step_up_percentage (float): Increase in the instalment every 12 months
+            skipped_instalments (iterable): 0-based instalment numbers that were missed
+            redemptions (dict): Partial redemption amounts keyed by date
+            valuation_date (str or datetime): Date of the current valuation
+            current_value (float): Current value of the remaining units
+
+        Returns:
+            DataFrame: 'date' and signed 'amount' columns, ready for solve()
+        """
+        instalment = np.arange(months)
+        first = pd.Timestamp(start_date)
+        dates = pd.DatetimeIndex([first + pd.DateOffset(months=int(i)) for i in instalment])
+        amounts = -monthly_investment * (1 + step_up_percentage / 100) ** (instalment // 12)
+
+        keep = ~np.isin(instalment, list(skipped_instalments))
+        flows = pd.DataFrame({'date': dates[keep], 'amount': amounts[keep]})
+
+        extra = [(pd.Timestamp(date), float(amount)) for date, amount in (redemptions or {}).items()]
+        if valuation_date is not None and current_value:
+            extra.append((pd.Timestamp(valuation_date), float(current_value)))
+        if extra:
+            flows = pd.concat([flows, pd.DataFrame(extra, columns=['date', 'amount'])], ignore_index=True)
+
+        return flows.sort_values('date', kind='stable').reset_index(drop=True)